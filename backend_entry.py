@@ -1,6 +1,9 @@
 """
 Entry point PyInstaller pour monteur-backend.exe.
-Lance le backend FastAPI via uvicorn sur 127.0.0.1:8000.
+Lance le backend FastAPI via uvicorn : socket Unix si MONTEUR_BACKEND_SOCKET
+est défini (hors Windows), sinon TCP sur MONTEUR_HOST:MONTEUR_PORT (port libre
+choisi par l'OS si celui-ci est pris). L'adresse effective est écrite dans
+MONTEUR_ENDPOINT_FILE pour le shell Electron.
 """
 import multiprocessing
 import os
@@ -15,8 +18,9 @@ def _setup_logging():
     """
     En mode frozen (PyInstaller console=False), sys.stdout et sys.stderr
     sont None — uvicorn crashe au premier log.
-    On redirige vers un fichier pour que le serveur démarre et que les
-    erreurs soient lisibles.
+    Les logs applicatifs (JSON, rotation par taille) vont dans backend.log via
+    ai_service.core.logging_utils ; ici on ne garde stdout/stderr que pour les
+    tracebacks de crash, dans backend-console.log.
     Le répertoire de log est fourni par MONTEUR_LOG_DIR (injecté par Electron)
     ou par défaut dans %APPDATA%/Monteur IA.
     """
@@ -26,22 +30,33 @@ def _setup_logging():
     log_dir = os.environ.get("MONTEUR_LOG_DIR", "")
     if not log_dir:
         log_dir = str(pathlib.Path(os.environ.get("APPDATA", ".")) / "Monteur IA")
+        os.environ["MONTEUR_LOG_DIR"] = log_dir
 
     pathlib.Path(log_dir).mkdir(parents=True, exist_ok=True)
-    log_path = pathlib.Path(log_dir) / "backend.log"
+    console_path = pathlib.Path(log_dir) / "backend-console.log"
 
-    # line-buffered pour que les logs arrivent en temps réel
-    log_file = open(log_path, "a", encoding="utf-8", buffering=1)
-    sys.stdout = log_file
-    sys.stderr = log_file
+    # line-buffered : faible volume, on veut le traceback même en cas de crash
+    console_file = open(console_path, "a", encoding="utf-8", buffering=1)
+    sys.stdout = console_file
+    sys.stderr = console_file
 
 
 if __name__ == "__main__":
     _setup_logging()
 
-    import uvicorn
-    from ai_service.main import create_fastapi_app
+    from ai_service.core.transport import serve
+    from ai_service.main import create_fastapi_app, settings
 
     app = create_fastapi_app()
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    serve(
+        app,
+        socket_path=settings.backend_socket,
+        host=settings.host,
+        port=settings.port,
+        endpoint_file=settings.endpoint_file,
+        # log_config=None : les loggers uvicorn passent par la file du logger racine.
+        log_config=None,
+        # Plus long que l'inactivité typique entre deux appels du shell (agent keep-alive).
+        timeout_keep_alive=30,
+    )
 
@@ -0,0 +1,302 @@
+"""Standalone benchmark runner for the service hot paths.
+
+    PYTHONPATH=src python benchmarks/run.py --output baseline.json   # on the reference commit
+    PYTHONPATH=src python benchmarks/run.py --baseline baseline.json --tolerance 0.25
+
+Timings depend on the machine, so no baseline is shipped: record one on the
+reference commit, on the machine that will run the comparison. Results are JSON (one entry per case with min/median/mean/p95 in ms, plus
+MB/s for payload cases). With `--baseline`, the median of every case present
+in both files is compared and the process exits with status 1 when one of
+them is slower than `baseline * (1 + tolerance)`.
+
+The `transport.*` cases run the app under uvicorn on both a Unix domain socket
+and loopback TCP (POSIX only) to compare request latency and payload throughput.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import synthetic  # noqa: E402
+
+from ai_service.core.transport import bind_endpoint, unix_sockets_supported  # noqa: E402
+from ai_service.models.schemas import CloudJob  # noqa: E402
+from ai_service.repositories.sqlite_repo import SqliteRepository  # noqa: E402
+from ai_service.services.hooks import HookService  # noqa: E402
+from ai_service.services.silence import SilenceDetectionService  # noqa: E402
+from ai_service.services.viral import ViralScoringService  # noqa: E402
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], object]
+    repeat: int = 10
+    payload_bytes: int = 0
+
+
+def _stats(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "min_ms": round(ordered[0] * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p95_ms": round(p95 * 1000, 4),
+        "rounds": len(ordered),
+    }
+
+
+def measure(case: Case, scale: float) -> dict[str, float]:
+    rounds = max(1, int(case.repeat * scale))
+    case.fn()  # warm-up
+    samples: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        case.fn()
+        samples.append(time.perf_counter() - started)
+    stats = _stats(samples)
+    if case.payload_bytes and stats["median_ms"] > 0:
+        stats["throughput_mb_s"] = round(case.payload_bytes / (stats["median_ms"] / 1000) / 1e6, 2)
+    return stats
+
+
+def service_cases(workdir: Path) -> list[Case]:
+    silence = SilenceDetectionService()
+    scorer = ViralScoringService()
+    transcript = synthetic.long_transcript(5000)
+    peaks, rates = synthetic.peaks_and_rates(len(transcript))
+    durations, amplitudes = synthetic.amplitude_envelope(180_000)  # one hour at 20ms
+    clips = synthetic.candidate_clips(transcript, 300)
+    warm_hooks = HookService(scorer)
+    warm_hooks.generate(transcript, "business", 5, project_id="bench")
+
+    repo = SqliteRepository(str(workdir / "bench.db"))
+    repo.store_events(synthetic.analytics_events(50_000))
+    events = synthetic.analytics_events(1000, seed=23)
+    job = CloudJob(
+        id="bench-job",
+        operation="transcribe",
+        payload={"segments": [seg.__dict__ for seg in transcript]},
+        status="queued",
+    )
+    repo.save_job(job)
+
+    return [
+        Case("silence.detect[180k frames]", lambda: silence.detect(durations, amplitudes, 0.12)),
+        Case("viral.score[5k segments]", lambda: scorer.score(transcript, peaks, rates)),
+        Case("hooks.generate.cold[5k segments]", lambda: HookService(scorer).generate(transcript, "business", 5), 5),
+        Case("hooks.generate.cached[5k segments]", lambda: warm_hooks.generate(transcript, "business", 5, "bench")),
+        Case(
+            "hooks.generate_batch[300 clips]",
+            lambda: warm_hooks.generate_batch(transcript, clips, "podcast", 2, "bench"),
+            5,
+        ),
+        Case("sqlite.store_event[x100]", lambda: [repo.store_event(n, p) for n, p in events[:100]], 5),
+        Case("sqlite.store_events[1k]", lambda: repo.store_events(events)),
+        Case("sqlite.list_events[50k rows]", lambda: repo.list_events(), 5),
+        Case("sqlite.save_job[5k segments]", lambda: repo.save_job(job)),
+        Case("sqlite.get_job[5k segments]", lambda: repo.get_job(job.id)),
+        Case("sqlite.update_job_status[5k segments]", lambda: repo.update_job_status(job.id, "processing")),
+    ]
+
+
+def http_cases() -> list[Case]:
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError:  # fastapi/httpx not installed: skip route benchmarks
+        print("fastapi test client unavailable, skipping HTTP cases", file=sys.stderr)
+        return []
+
+    from ai_service.main import create_fastapi_app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = TestClient(create_fastapi_app())
+    client.__enter__()
+    headers = {"x-api-key": os.environ.get("MONTEUR_API_KEY", "")}
+    transcript = [seg.__dict__ for seg in synthetic.long_transcript(1000)]
+    durations, amplitudes = synthetic.amplitude_envelope(20_000)
+    silence_body = {"durations": durations, "amplitudes": amplitudes}
+
+    def post(path: str, body: dict) -> None:
+        response = client.post(path, json=body, headers=headers)
+        response.raise_for_status()
+
+    def concurrent(path: str, body: dict, requests: int = 64, threads: int = 8) -> None:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: post(path, body), range(requests)))
+
+    return [
+        Case("http.health", lambda: client.get("/health").raise_for_status(), 50),
+        Case("http.score-moments[1k segments]", lambda: post("/score-moments", {"transcript": transcript})),
+        Case("http.generate-hooks[1k segments]", lambda: post("/generate-hooks", {"transcript": transcript})),
+        Case("http.detect-silences[20k frames]", lambda: post("/detect-silences", silence_body)),
+        Case("http.concurrent.detect-silences[64 req x 8]", lambda: concurrent("/detect-silences", silence_body), 3),
+    ]
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def _serve_in_thread(app, sock: socket.socket):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="off", log_config=None, access_log=False))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return server
+
+
+def transport_cases(workdir: Path) -> list[Case]:
+    if not unix_sockets_supported():
+        print("no Unix domain sockets on this platform, skipping transport cases", file=sys.stderr)
+        return []
+    try:
+        import uvicorn  # noqa: F401
+        from starlette.responses import JSONResponse
+    except ImportError:
+        print("fastapi/uvicorn unavailable, skipping transport cases", file=sys.stderr)
+        return []
+
+    from ai_service.main import create_fastapi_app
+
+    app = create_fastapi_app()
+
+    async def echo(request):
+        return JSONResponse({"received": len(await request.body())})
+
+    app.add_route("/_bench/echo", echo, methods=["POST"])
+
+    tcp_sock, tcp = bind_endpoint("", "127.0.0.1", 0)
+    uds_sock, uds = bind_endpoint(str(workdir / "bench.sock"))
+    for sock in (tcp_sock, uds_sock):
+        _serve_in_thread(app, sock)
+
+    headers = {"x-api-key": os.environ.get("MONTEUR_API_KEY", ""), "Content-Type": "application/json"}
+    durations, amplitudes = synthetic.amplitude_envelope(20_000)
+    silences = json.dumps({"durations": durations, "amplitudes": amplitudes}).encode()
+    blob = json.dumps({"blob": "x" * (8 * 1024 * 1024)}).encode()
+    factories = {
+        "tcp": lambda: http.client.HTTPConnection(tcp.host, tcp.port),
+        "uds": lambda: UnixHTTPConnection(uds.path),
+    }
+
+    def call(conn: http.client.HTTPConnection, method: str, path: str, body: bytes | None = None) -> None:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{method} {path}: HTTP {response.status}")
+
+    def fresh(factory, method: str, path: str) -> None:
+        conn = factory()
+        try:
+            call(conn, method, path)
+        finally:
+            conn.close()
+
+    cases: list[Case] = []
+    for name, factory in factories.items():
+        conn = factory()  # kept open: keep-alive, as the desktop shell does
+        cases += [
+            Case(f"transport.{name}.health.keepalive", lambda c=conn: call(c, "GET", "/health"), 200),
+            Case(f"transport.{name}.health.new-connection", lambda f=factory: fresh(f, "GET", "/health"), 200),
+            Case(
+                f"transport.{name}.detect-silences[20k frames]",
+                lambda c=conn: call(c, "POST", "/detect-silences", silences),
+                20,
+                payload_bytes=len(silences),
+            ),
+            Case(f"transport.{name}.echo[8MB]", lambda c=conn: call(c, "POST", "/_bench/echo", blob), 10, len(blob)),
+        ]
+    return cases
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions: list[str] = []
+    for name, result in current["cases"].items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference is None or reference["median_ms"] <= 0:
+            continue
+        ratio = result["median_ms"] / reference["median_ms"]
+        result["baseline_median_ms"] = reference["median_ms"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {reference['median_ms']}ms -> {result['median_ms']}ms (x{ratio:.2f})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="results file to compare against (written earlier with --output)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio (0.25 = +25%%)")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this string")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier on the number of rounds")
+    parser.add_argument("--no-http", action="store_true", help="skip the FastAPI route cases")
+    parser.add_argument("--no-transport", action="store_true", help="skip the Unix socket vs TCP cases")
+    args = parser.parse_args(argv)
+    if args.baseline and not Path(args.baseline).is_file():
+        parser.error(f"baseline {args.baseline} not found; record one first with --output {args.baseline}")
+
+    workdir = Path(tempfile.mkdtemp(prefix="monteur-bench-"))
+    # Must be set before ai_service.main is imported by the HTTP cases.
+    os.environ.setdefault("MONTEUR_SQLITE_PATH", str(workdir / "app.db"))
+    os.environ.setdefault("MONTEUR_RATE_LIMIT_PER_MINUTE", "1000000")
+
+    cases = service_cases(workdir) + ([] if args.no_http else http_cases())
+    cases += [] if args.no_transport else transport_cases(workdir)
+    results: dict = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "cases": {},
+    }
+    for case in cases:
+        if args.filter and args.filter not in case.name:
+            continue
+        results["cases"][case.name] = measure(case, args.scale)
+        stats = results["cases"][case.name]
+        throughput = f"   {stats['throughput_mb_s']:>8.1f} MB/s" if "throughput_mb_s" in stats else ""
+        print(f"{case.name:48s} median {stats['median_ms']:>10.3f} ms   p95 {stats['p95_ms']:>10.3f} ms{throughput}")
+
+    regressions: list[str] = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        results["regressions"] = regressions
+
+    Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
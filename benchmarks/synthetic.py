@@ -0,0 +1,74 @@
+"""Synthetic inputs for the benchmark suite, deterministic for a given seed."""
+from __future__ import annotations
+
+import random
+
+from ai_service.models.schemas import HookClip, TranscriptSegment
+from ai_service.services.viral import EMOTIONAL_WORDS
+
+VOCABULARY = [
+    "aujourd'hui", "vidéo", "montage", "automatisation", "shorts", "client", "semaine", "heures", "outil",
+    "process", "contenu", "audience", "résultat", "méthode", "exemple", "question", "problème", "solution",
+    "chaîne", "format", "rythme", "public", "minute", "système", "première", "dernière", "vraiment",
+    "simple", "rapide", "toujours", "jamais", "ensuite", "parce", "comme", "donc", "alors",
+]
+FILLERS = ["le", "la", "les", "de", "des", "un", "une", "on", "je", "tu", "c'est", "pour", "avec"]
+
+
+def long_transcript(segments: int, seed: int = 7) -> list[TranscriptSegment]:
+    """Roughly 4s per segment, ~12 words each, with a few emotional words sprinkled in."""
+    rng = random.Random(seed)
+    emotional = sorted(EMOTIONAL_WORDS)
+    cursor = 0.0
+    transcript: list[TranscriptSegment] = []
+    for _ in range(segments):
+        words = [rng.choice(VOCABULARY if rng.random() < 0.6 else FILLERS) for _ in range(rng.randint(6, 18))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(emotional))
+        if len(words) > 8:
+            words[len(words) // 2] += ","
+        duration = rng.uniform(2.0, 6.0)
+        gap = rng.choice([0.0, 0.0, 0.05, 0.4])
+        transcript.append(
+            TranscriptSegment(
+                start=round(cursor + gap, 3),
+                end=round(cursor + gap + duration, 3),
+                text=" ".join(words).capitalize() + ".",
+                confidence=round(rng.uniform(0.8, 0.99), 3),
+                speaker="S1",
+            )
+        )
+        cursor += gap + duration
+    return transcript
+
+
+def amplitude_envelope(frames: int, frame_seconds: float = 0.02, seed: int = 11) -> tuple[list[float], list[float]]:
+    """Speech bursts separated by silences of 0.1s to 1.5s."""
+    rng = random.Random(seed)
+    durations = [frame_seconds] * frames
+    amplitudes: list[float] = []
+    while len(amplitudes) < frames:
+        amplitudes.extend(rng.uniform(0.2, 1.0) for _ in range(rng.randint(25, 400)))
+        amplitudes.extend(rng.uniform(0.0, 0.08) for _ in range(rng.randint(5, 75)))
+    return durations, amplitudes[:frames]
+
+
+def peaks_and_rates(segments: int, seed: int = 13) -> tuple[list[float], list[float]]:
+    rng = random.Random(seed)
+    return [rng.random() for _ in range(segments)], [rng.random() for _ in range(segments)]
+
+
+def candidate_clips(transcript: list[TranscriptSegment], count: int, seed: int = 17) -> list[HookClip]:
+    rng = random.Random(seed)
+    total = transcript[-1].end if transcript else 0.0
+    clips: list[HookClip] = []
+    for _ in range(count):
+        start = rng.uniform(0, max(0.0, total - 60))
+        clips.append(HookClip(start=round(start, 3), end=round(start + rng.uniform(15, 60), 3)))
+    return clips
+
+
+def analytics_events(count: int, seed: int = 19) -> list[tuple[str, dict]]:
+    rng = random.Random(seed)
+    names = ["project_created", "transcription_done", "moments_scored", "hooks_generated", "export_prepared"]
+    return [(rng.choice(names), {"count": rng.randint(0, 500), "ratio": "9:16"}) for _ in range(count)]
@@ -1,10 +1,18 @@
 const { app, BrowserWindow, ipcMain, dialog } = require('electron');
 const fs = require('node:fs');
+const http = require('node:http');
 const path = require('node:path');
 const { spawn } = require('node:child_process');
 
-const BACKEND_PORT = 8000;
 let backendProcess = null;
+// Adresse effective du backend (socket Unix ou TCP), lue dans le fichier endpoint.
+let backendEndpoint = null;
+// Connexions réutilisées entre les appels : pas de handshake par requête.
+const backendAgent = new http.Agent({ keepAlive: true, maxSockets: 8 });
+
+function endpointFilePath() {
+  return path.join(app.getPath('userData'), 'backend-endpoint.json');
+}
 
 function configPath() {
   return path.join(app.getPath('userData'), 'monteur-config.json');
@@ -20,6 +28,8 @@ function defaultConfig() {
     MONTEUR_SQLITE_PATH: path.join(app.getPath('userData'), 'monteur.db'),
     MONTEUR_FFMPEG_BIN: 'ffmpeg',
     MONTEUR_WHISPER_BIN: 'whisper',
+    // Socket Unix hors Windows ; vide => TCP (port 8000, ou port libre si occupé).
+    MONTEUR_BACKEND_SOCKET: process.platform === 'win32' ? '' : path.join(app.getPath('userData'), 'backend.sock'),
   };
 }
 
@@ -46,6 +56,8 @@ function backendEnv(config) {
     // Dossier de log injecté dans le backend (utilisé par backend_entry.py
     // pour rediriger stdout/stderr quand frozen avec console=False).
     MONTEUR_LOG_DIR: app.getPath('userData'),
+    // Le backend y écrit l'adresse sur laquelle il écoute une fois le socket ouvert.
+    MONTEUR_ENDPOINT_FILE: endpointFilePath(),
   };
 }
 
@@ -60,25 +72,77 @@ function resolveBackendLaunch() {
   const pythonCmd = process.platform === 'win32' ? 'py' : 'python3';
   return {
     command: pythonCmd,
-    args: [
-      '-c',
-      "from ai_service.main import create_fastapi_app; app=create_fastapi_app(); import uvicorn; uvicorn.run(app, host='127.0.0.1', port=8000)",
-    ],
+    args: [path.resolve(__dirname, '../../backend_entry.py')],
   };
 }
 
+function readEndpoint() {
+  try {
+    return JSON.parse(fs.readFileSync(endpointFilePath(), 'utf-8'));
+  } catch (_err) {
+    return null;
+  }
+}
+
+function endpointLabel(endpoint) {
+  return endpoint ? endpoint.url : 'non démarré';
+}
+
+function backendRequest(method, urlPath, body, headers = {}, retry = true) {
+  const endpoint = backendEndpoint;
+  if (!endpoint) return Promise.reject(new Error('backend_not_ready'));
+  const payload = body === undefined || body === null ? null : Buffer.from(JSON.stringify(body));
+  const target = endpoint.transport === 'unix'
+    ? { socketPath: endpoint.path }
+    : { host: endpoint.host, port: endpoint.port };
+
+  return new Promise((resolve, reject) => {
+    const req = http.request(
+      {
+        ...target,
+        method,
+        path: urlPath,
+        agent: backendAgent,
+        headers: {
+          ...headers,
+          ...(payload ? { 'Content-Type': 'application/json', 'Content-Length': payload.length } : {}),
+        },
+      },
+      (res) => {
+        const chunks = [];
+        res.on('data', (c) => chunks.push(c));
+        res.on('end', () => resolve({ status: res.statusCode, text: Buffer.concat(chunks).toString('utf-8') }));
+        res.on('error', reject);
+      }
+    );
+    req.on('error', (err) => {
+      // Connexion keep-alive fermée côté serveur pendant qu'elle était inactive : un seul nouvel essai.
+      if (retry && req.reusedSocket && err.code === 'ECONNRESET') {
+        resolve(backendRequest(method, urlPath, body, headers, false));
+      } else {
+        reject(err);
+      }
+    });
+    if (payload) req.write(payload);
+    req.end();
+  });
+}
+
 async function waitForBackendReady(timeoutMs = 40000) {
   const start = Date.now();
   while (Date.now() - start < timeoutMs) {
-    try {
-      const res = await fetch(`http://127.0.0.1:${BACKEND_PORT}/health`);
-      if (res.ok) {
-        return true;
+    backendEndpoint = backendEndpoint || readEndpoint();
+    if (backendEndpoint) {
+      try {
+        const res = await backendRequest('GET', '/health');
+        if (res.status === 200) {
+          return true;
+        }
+      } catch (_err) {
+        // retry
       }
-    } catch (_err) {
-      // retry
     }
-    await new Promise((r) => setTimeout(r, 500));
+    await new Promise((r) => setTimeout(r, 250));
   }
   return false;
 }
@@ -87,11 +151,14 @@ async function startBackend() {
   if (backendProcess) return 'already_running';
   const config = loadConfig();
   const launch = resolveBackendLaunch();
+  backendEndpoint = null;
+  fs.rmSync(endpointFilePath(), { force: true });
 
   // Pipe stdout/stderr du backend vers un fichier log dans userData.
   // Cela permet de débugger les crashs silencieux (notamment en mode frozen
   // PyInstaller console=False où sys.stdout est None sans cette redirection).
-  const logPath = path.join(app.getPath('userData'), 'backend.log');
+  // backend.log est écrit (et roté) par le backend lui-même via MONTEUR_LOG_DIR.
+  const logPath = path.join(app.getPath('userData'), 'backend-console.log');
   const logFd = fs.openSync(logPath, 'a');
 
   backendProcess = spawn(launch.command, launch.args, {
@@ -105,6 +172,7 @@ async function startBackend() {
 
   backendProcess.on('exit', (code) => {
     backendProcess = null;
+    backendEndpoint = null;
     // Notifier toutes les fenêtres ouvertes si le backend s'arrête de façon inattendue.
     BrowserWindow.getAllWindows().forEach((w) =>
       w.webContents.send('backend:status', { ok: false, error: `Backend exited (code ${code})` })
@@ -119,6 +187,8 @@ async function stopBackend() {
   if (!backendProcess) return;
   const proc = backendProcess;
   backendProcess = null;
+  backendEndpoint = null;
+  backendAgent.destroy(); // ferme les connexions keep-alive vers l'ancien process
 
   return new Promise((resolve) => {
     // Timeout de sécurité : on ne bloque pas indéfiniment.
@@ -158,6 +228,23 @@ function createWindow() {
 app.whenReady().then(async () => {
   ipcMain.handle('config:get', () => loadConfig());
 
+  // --- Appels backend (socket Unix ou TCP, connexions keep-alive) ---
+  ipcMain.handle('backend:fetch', async (_event, { method, path: urlPath, body }) => {
+    const apiKey = loadConfig().MONTEUR_API_KEY || '';
+    try {
+      const res = await backendRequest(method, urlPath, body, { 'x-api-key': apiKey });
+      let data = null;
+      try {
+        data = JSON.parse(res.text);
+      } catch (_err) {
+        data = { detail: res.text };
+      }
+      return { ok: res.status >= 200 && res.status < 300, status: res.status, data };
+    } catch (err) {
+      return { ok: false, status: 0, data: { detail: String(err.message || err) } };
+    }
+  });
+
   // --- Dialogs fichiers ---
   ipcMain.handle('file:pick-video', async () => {
     const r = await dialog.showOpenDialog({
@@ -203,7 +290,7 @@ app.whenReady().then(async () => {
 
   ipcMain.handle('config:save', async (_event, conf) => {
     saveConfig(conf);
-    await stopBackend(); // attend que le port 8000 soit libéré
+    await stopBackend(); // attend que le socket / port soit libéré
     const result = await startBackend();
     return { ok: result === 'ok', status: result };
   });
@@ -217,6 +304,7 @@ app.whenReady().then(async () => {
       w.webContents.send('backend:status', {
         ok: result === 'ok',
         status: result,
+        endpoint: endpointLabel(backendEndpoint),
         error: result !== 'ok' ? `Backend non disponible (${result})` : null,
       })
     );
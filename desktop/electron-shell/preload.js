@@ -5,6 +5,7 @@ contextBridge.exposeInMainWorld('monteur', {
   getConfig: () => ipcRenderer.invoke('config:get'),
   saveConfig: (conf) => ipcRenderer.invoke('config:save', conf),
   onBackendStatus: (cb) => ipcRenderer.on('backend:status', (_event, data) => cb(data)),
+  backendFetch: (method, path, body) => ipcRenderer.invoke('backend:fetch', { method, path, body }),
 
   // File dialogs
   openVideo: () => ipcRenderer.invoke('file:pick-video'),
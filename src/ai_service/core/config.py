@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from pathlib import Path
 
 
 @dataclass
@@ -13,13 +14,53 @@ class Settings:
     api_key: str = ""
     ffmpeg_bin: str = "ffmpeg"
     whisper_bin: str = "whisper"
+    whisper_model: str = "base"
+    whisper_worker: bool = False
+    whisper_worker_max_rss_mb: int = 4096
     sqlite_path: str = "storage/monteur.db"
+    host: str = "127.0.0.1"
+    port: int = 8000
+    backend_socket: str = ""
+    endpoint_file: str = ""
+    blob_dir: str = ""
+    blob_inline_bytes: int = 16 * 1024
+    feature_dir: str = ""
+    scratch_dir: str = ""
+    scratch_quota_mb: int = 10 * 1024
+    batch_workers: int = 4
+    rate_limit_per_minute: int = 120
+    log_file: str = ""
+    log_level: str = "INFO"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backups: int = 5
+    log_debug_sample_rate: float = 0.01
+    admin_profiler: bool = False
+    job_retention_hours: float = 168.0
+    artifact_retention_hours: float = 720.0
+    maintenance_interval_seconds: float = 3600.0
+    youtube_upload_url: str = "https://www.googleapis.com"
+    youtube_access_token: str = ""
+    tiktok_upload_url: str = "https://open.tiktokapis.com"
+    tiktok_access_token: str = ""
+    upload_chunk_mb: int = 8
+    upload_streams: int = 4
+    upload_pool_size: int = 4
 
     @property
     def is_production(self) -> bool:
         return self.app_env.lower() in {"prod", "production"}
 
 
+def _env_flag(name: str, default: str = "0") -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _default_log_file() -> str:
+    # MONTEUR_LOG_DIR is injected by the Electron shell.
+    log_dir = os.getenv("MONTEUR_LOG_DIR", "")
+    return str(Path(log_dir) / "backend.log") if log_dir else ""
+
+
 def load_settings() -> Settings:
     settings = Settings(
         app_env=os.getenv("MONTEUR_ENV", "dev"),
@@ -29,7 +70,37 @@ def load_settings() -> Settings:
         api_key=os.getenv("MONTEUR_API_KEY", ""),
         ffmpeg_bin=os.getenv("MONTEUR_FFMPEG_BIN", "ffmpeg"),
         whisper_bin=os.getenv("MONTEUR_WHISPER_BIN", "whisper"),
+        whisper_model=os.getenv("MONTEUR_WHISPER_MODEL", "base"),
+        whisper_worker=_env_flag("MONTEUR_WHISPER_WORKER"),
+        whisper_worker_max_rss_mb=int(os.getenv("MONTEUR_WHISPER_WORKER_MAX_RSS_MB", "4096")),
         sqlite_path=os.getenv("MONTEUR_SQLITE_PATH", "storage/monteur.db"),
+        host=os.getenv("MONTEUR_HOST", "127.0.0.1"),
+        port=int(os.getenv("MONTEUR_PORT", "8000")),
+        backend_socket=os.getenv("MONTEUR_BACKEND_SOCKET", ""),
+        endpoint_file=os.getenv("MONTEUR_ENDPOINT_FILE", ""),
+        blob_dir=os.getenv("MONTEUR_BLOB_DIR", ""),
+        blob_inline_bytes=int(os.getenv("MONTEUR_BLOB_INLINE_BYTES", str(16 * 1024))),
+        feature_dir=os.getenv("MONTEUR_FEATURE_DIR", ""),
+        scratch_dir=os.getenv("MONTEUR_SCRATCH_DIR", ""),
+        scratch_quota_mb=int(os.getenv("MONTEUR_SCRATCH_QUOTA_MB", str(10 * 1024))),
+        batch_workers=int(os.getenv("MONTEUR_BATCH_WORKERS", "4")),
+        rate_limit_per_minute=int(os.getenv("MONTEUR_RATE_LIMIT_PER_MINUTE", "120")),
+        log_file=os.getenv("MONTEUR_LOG_FILE", "") or _default_log_file(),
+        log_level=os.getenv("MONTEUR_LOG_LEVEL", "INFO"),
+        log_max_bytes=int(os.getenv("MONTEUR_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        log_backups=int(os.getenv("MONTEUR_LOG_BACKUPS", "5")),
+        log_debug_sample_rate=float(os.getenv("MONTEUR_LOG_DEBUG_SAMPLE_RATE", "0.01")),
+        admin_profiler=_env_flag("MONTEUR_ADMIN_PROFILER"),
+        job_retention_hours=float(os.getenv("MONTEUR_JOB_RETENTION_HOURS", "168")),
+        artifact_retention_hours=float(os.getenv("MONTEUR_ARTIFACT_RETENTION_HOURS", "720")),
+        maintenance_interval_seconds=float(os.getenv("MONTEUR_MAINTENANCE_INTERVAL_SECONDS", "3600")),
+        youtube_upload_url=os.getenv("MONTEUR_YOUTUBE_UPLOAD_URL", "https://www.googleapis.com"),
+        youtube_access_token=os.getenv("MONTEUR_YOUTUBE_ACCESS_TOKEN", ""),
+        tiktok_upload_url=os.getenv("MONTEUR_TIKTOK_UPLOAD_URL", "https://open.tiktokapis.com"),
+        tiktok_access_token=os.getenv("MONTEUR_TIKTOK_ACCESS_TOKEN", ""),
+        upload_chunk_mb=int(os.getenv("MONTEUR_UPLOAD_CHUNK_MB", "8")),
+        upload_streams=int(os.getenv("MONTEUR_UPLOAD_STREAMS", "4")),
+        upload_pool_size=int(os.getenv("MONTEUR_UPLOAD_POOL_SIZE", "4")),
     )
     validate_settings(settings)
     return settings
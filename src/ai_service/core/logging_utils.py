@@ -1,8 +1,27 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import queue
 import sys
+import time
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from ai_service.core.metrics import request_id_var
+
+try:  # optional faster encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _dumps(payload: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode()
+    return json.dumps(payload, ensure_ascii=False, default=str)
 
 
 class JsonFormatter(logging.Formatter):
@@ -12,14 +31,157 @@ class JsonFormatter(logging.Formatter):
             "logger": record.name,
             "message": record.getMessage(),
         }
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
+        if request_id:
+            payload["request_id"] = request_id
         if hasattr(record, "extra_payload"):
             payload.update(getattr(record, "extra_payload"))
-        return json.dumps(payload, ensure_ascii=False)
+        return _dumps(payload)
+
+
+class RequestContextFilter(logging.Filter):
+    """Captures the request id on the caller thread, before the record is queued."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keeps one DEBUG record out of `every` per (logger, message template)."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._seen: defaultdict[tuple[str, str], int] = defaultdict(int)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if not self.every:
+            return False
+        key = (record.name, str(record.msg))
+        count = self._seen[key]
+        self._seen[key] = count + 1
+        return count % self.every == 0
+
+
+class _DeferredFlush:
+    """flush() is a no-op: the listener flushes once per batch instead of once per line."""
+
+    def flush(self) -> None:
+        pass
+
+    def flush_now(self) -> None:
+        try:
+            super().flush()  # type: ignore[misc]
+        except (OSError, ValueError):  # stream closed under us (interpreter exit, test capture)
+            pass
+
+    def close(self) -> None:
+        self.flush_now()
+        super().close()  # type: ignore[misc]
+
+
+class BatchedStreamHandler(_DeferredFlush, logging.StreamHandler):
+    pass
+
+
+class BatchedRotatingFileHandler(_DeferredFlush, RotatingFileHandler):
+    pass
 
 
-def configure_logging() -> None:
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonFormatter())
+class BatchingQueueListener(QueueListener):
+    """Background writer: drains the queue and flushes every `max_batch` records or `flush_interval` seconds."""
+
+    _TICK = logging.makeLogRecord({"msg": "flush_tick"})
+
+    def __init__(
+        self,
+        log_queue: queue.SimpleQueue,
+        *handlers: logging.Handler,
+        flush_interval: float = 0.5,
+        max_batch: int = 256,
+    ) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        try:
+            return self.queue.get(block=block, timeout=self.flush_interval)
+        except queue.Empty:
+            return self._TICK
+
+    def handle(self, record: logging.LogRecord) -> None:
+        if record is not self._TICK:
+            super().handle(record)
+            self._pending += 1
+        due = time.monotonic() - self._last_flush >= self.flush_interval
+        if self._pending and (self._pending >= self.max_batch or due or record.levelno >= logging.ERROR):
+            self.flush()
+
+    def flush(self) -> None:
+        for handler in self.handlers:
+            getattr(handler, "flush_now", handler.flush)()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def stop(self) -> None:
+        super().stop()
+        self.flush()
+
+
+_listener: BatchingQueueListener | None = None
+
+
+def configure_logging(
+    log_file: str = "",
+    level: str = "INFO",
+    max_bytes: int = 10 * 1024 * 1024,
+    backups: int = 5,
+    debug_sample_rate: float = 0.01,
+) -> None:
+    """Route every record through a queue; a background thread encodes and writes them.
+
+    With `log_file`, output goes to a size-rotated file (backend.log in the
+    desktop build), otherwise to stdout.
+    """
+    global _listener
+    shutdown_logging()
+
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        writer: logging.Handler = BatchedRotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+    else:
+        writer = BatchedStreamHandler(sys.stdout)
+    writer.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = QueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(DebugSampler(debug_sample_rate))
+
     root = logging.getLogger()
     root.handlers = [handler]
-    root.setLevel(logging.INFO)
+    root.setLevel(level.upper())
+
+    _listener = BatchingQueueListener(log_queue, writer)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Drain the queue and flush; registered at exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,11 @@
+"""Imports of optional dependencies, resolved when a feature first needs them."""
+from __future__ import annotations
+
+
+def require_numpy(purpose: str):
+    """The numpy module, or RuntimeError naming the feature and the extra that provides it."""
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise RuntimeError(f"numpy is required for {purpose} (pip install .[audio])") from exc
+    return numpy
@@ -0,0 +1,164 @@
+"""Wall-clock sampling profiler for production diagnosis.
+
+Nothing runs until a profile is requested: `SamplingProfiler` starts a thread
+that snapshots `sys._current_frames()` at a fixed interval, and
+`RequestProfiler.armed` is a plain attribute read by the request path.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+FrameKey = tuple[str, str, int]
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, thread_ids: set[int] | None = None) -> None:
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.excluded: set[int] = set()
+        self.samples: Counter[tuple[str, tuple[FrameKey, ...]]] = Counter()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="monteur-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        skip = {threading.get_ident(), *self.excluded}
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in skip or (self.thread_ids is not None and ident not in self.thread_ids):
+                    continue
+                stack: list[FrameKey] = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(names.get(ident, str(ident)), tuple(stack))] += 1
+
+    def profile_for(self, seconds: float) -> None:
+        """Sample every other thread for `seconds`, blocking the caller."""
+        self.excluded.add(threading.get_ident())
+        self.start()
+        time.sleep(seconds)
+        self.stop()
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format, one `thread;outer;...;inner count` line per stack."""
+        lines = []
+        for (thread, stack), count in sorted(self.samples.items(), key=lambda item: -item[1]):
+            frames = ";".join(_frame_label(frame) for frame in stack)
+            lines.append(f"{thread};{frames} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self, name: str = "monteur-ia") -> dict:
+        frames: list[dict] = []
+        frame_index: dict[FrameKey, int] = {}
+        per_thread: dict[str, tuple[list[list[int]], list[float]]] = {}
+        for (thread, stack), count in self.samples.items():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+            samples, weights = per_thread.setdefault(thread, ([], []))
+            samples.append(indexes)
+            weights.append(round(count * self.interval, 6))
+        profiles = [
+            {
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights,
+            }
+            for thread, (samples, weights) in sorted(per_thread.items())
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "monteur-ia",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def render(self, fmt: str, name: str = "monteur-ia") -> dict:
+        if fmt == "speedscope":
+            return self.speedscope(name)
+        return {"format": "collapsed", "duration": round(self.duration, 3), "stacks": self.collapsed()}
+
+
+def _frame_label(frame: FrameKey) -> str:
+    func, filename, line = frame
+    return f"{func} ({os.path.basename(filename)}:{line})"
+
+
+class RequestProfiler:
+    """Profiles the handler thread of the next request whose route matches."""
+
+    def __init__(self) -> None:
+        self.armed = False
+        self.last: dict | None = None
+        self._route = ""
+        self._format = "collapsed"
+        self._interval = 0.002
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def arm(self, route: str, fmt: str = "collapsed", interval: float = 0.002, timeout: float = 300.0) -> None:
+        with self._lock:
+            self._route = route
+            self._format = fmt
+            self._interval = interval
+            self._expires = time.monotonic() + timeout
+            self.armed = True
+
+    def disarm(self) -> None:
+        with self._lock:
+            self.armed = False
+
+    def _claim(self, route: str) -> bool:
+        with self._lock:
+            if not self.armed:
+                return False
+            if time.monotonic() > self._expires:
+                self.armed = False
+                return False
+            if route != self._route:
+                return False
+            self.armed = False
+            return True
+
+    @contextmanager
+    def capture(self, route: str) -> Iterator[None]:
+        if not self._claim(route):
+            yield
+            return
+        profiler = SamplingProfiler(interval=self._interval, thread_ids={threading.get_ident()})
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            self.last = {"route": route, **profiler.render(self._format, name=route)}
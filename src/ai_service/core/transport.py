@@ -0,0 +1,128 @@
+"""Listening socket for the backend: Unix domain socket when available, loopback TCP otherwise.
+
+The shell learns where to connect from an endpoint file written once the
+socket is bound, so the TCP port can be picked by the OS when the preferred
+one is taken.
+"""
+from __future__ import annotations
+
+import errno
+import json
+import os
+import signal
+import socket
+import stat
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+
+@dataclass
+class Endpoint:
+    transport: str  # "unix" | "tcp"
+    host: str = ""
+    port: int = 0
+    path: str = ""
+
+    @property
+    def url(self) -> str:
+        if self.transport == "unix":
+            return f"unix:{self.path}"
+        return f"http://{self.host}:{self.port}"
+
+
+def unix_sockets_supported() -> bool:
+    # AF_UNIX exists on recent Windows builds but neither uvicorn nor Node's
+    # http client treat it as a first-class transport there.
+    return hasattr(socket, "AF_UNIX") and os.name != "nt"
+
+
+def bind_unix(path: str) -> socket.socket:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if stat.S_ISSOCK(target.stat().st_mode):
+            target.unlink()  # stale socket left by a crashed backend
+    except FileNotFoundError:
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(str(target))
+        os.chmod(target, 0o600)  # only the desktop user may talk to the backend
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def bind_tcp(host: str, port: int) -> socket.socket:
+    """Bind `port`, or an OS-assigned port when it is 0 or already in use."""
+    # Explicit IPPROTO_TCP: asyncio only sets TCP_NODELAY on accepted sockets whose proto
+    # says TCP, and without it small keep-alive responses stall on delayed ACKs (~40ms).
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    if os.name != "nt":
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind((host, port))
+    except OSError as exc:
+        if port == 0 or exc.errno not in {errno.EADDRINUSE, errno.EACCES, getattr(errno, "WSAEADDRINUSE", -1)}:
+            sock.close()
+            raise
+        sock.bind((host, 0))
+    return sock
+
+
+def bind_endpoint(socket_path: str = "", host: str = "127.0.0.1", port: int = 8000) -> tuple[socket.socket, Endpoint]:
+    if socket_path and unix_sockets_supported():
+        return bind_unix(socket_path), Endpoint(transport="unix", path=socket_path)
+    sock = bind_tcp(host, port)
+    bound_host, bound_port = sock.getsockname()[:2]
+    return sock, Endpoint(transport="tcp", host=bound_host, port=bound_port)
+
+
+def write_endpoint_file(path: str, endpoint: Endpoint) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(json.dumps({**asdict(endpoint), "url": endpoint.url, "pid": os.getpid()}), encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def cleanup(endpoint: Endpoint, endpoint_file: str = "") -> None:
+    for path in (endpoint.path if endpoint.transport == "unix" else "", endpoint_file):
+        if path:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def serve(
+    app,
+    socket_path: str = "",
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    endpoint_file: str = "",
+    **uvicorn_options,
+) -> None:
+    """Run `app` with uvicorn on the endpoint chosen by `bind_endpoint` until shutdown."""
+    import uvicorn
+
+    if threading.current_thread() is threading.main_thread():
+        # uvicorn re-raises the signal after its graceful shutdown; with the default
+        # SIGTERM disposition the process would die before the cleanup below and
+        # before atexit flushes the log queue.
+        signal.signal(signal.SIGTERM, _exit_on_signal)
+    sock, endpoint = bind_endpoint(socket_path, host, port)
+    if endpoint_file:
+        write_endpoint_file(endpoint_file, endpoint)
+    server = uvicorn.Server(uvicorn.Config(app, **uvicorn_options))
+    try:
+        server.run(sockets=[sock])
+    finally:
+        sock.close()
+        cleanup(endpoint, endpoint_file)
+
+
+def _exit_on_signal(signum: int, _frame) -> None:
+    raise SystemExit(128 + signum)
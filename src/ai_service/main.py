@@ -1,14 +1,32 @@
 from __future__ import annotations
 
+import inspect
+import json
 import logging
 import shutil
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
 from functools import wraps
+from pathlib import Path
 
 from ai_service.core.config import Settings, load_settings
 from ai_service.core.logging_utils import configure_logging
+from ai_service.core.metrics import registry as metrics
+from ai_service.core.metrics import request_id_var, request_started_var
+from ai_service.core.profiler import RequestProfiler, SamplingProfiler
 from ai_service.core.security import AuthService, RateLimiter
 from ai_service.models.schemas import (
+    AnalyticsEvent,
+    AutoEditRequest,
+    AutoEditResponse,
+    BatchItemResult,
+    BatchOperation,
+    BatchRequest,
     CloudJob,
+    CloudJobListResponse,
     CloudJobRequest,
     CloudJobResponse,
     DetectSilencesRequest,
@@ -17,39 +35,115 @@ from ai_service.models.schemas import (
     ExportPlatformResponse,
     ExportRequest,
     ExportResponse,
+    GenerateHooksBatchRequest,
+    GenerateHooksBatchResponse,
     GenerateHooksRequest,
     GenerateHooksResponse,
+    HookClip,
+    JumpCutRequest,
+    JumpCutResponse,
+    MomentCandidate,
+    PlatformUpload,
     ProjectCreateRequest,
     ProjectCreateResponse,
     ScoreMomentsRequest,
     ScoreMomentsResponse,
+    SearchResponse,
+    SilenceSegment,
     TranscriptSegment,
     TranscribeRequest,
     TranscribeResponse,
 )
+from ai_service.repositories.feature_store import FeatureStore
+from ai_service.repositories.scratch_space import ScratchSpace
 from ai_service.repositories.sqlite_repo import SqliteRepository
+from ai_service.services.audio_features import AudioFeatureService
+from ai_service.services.batch import BatchService
 from ai_service.services.cloud import AnalyticsService, CloudJobService, PlatformExportService
-from ai_service.services.ffmpeg_pipeline import FFmpegPipelineService
+from ai_service.services.ffmpeg_pipeline import FFmpegPipelineService, keep_ranges
 from ai_service.services.hooks import HookService
+from ai_service.services.loudness import LoudnessService
+from ai_service.services.maintenance import JobMaintenanceService
+from ai_service.services.platform_upload import TikTokUploadProtocol, UploadError, YouTubeUploadProtocol
+from ai_service.services.pipeline import build_auto_edit_pipeline, source_fingerprint
+from ai_service.services.search import TranscriptSearchService
 from ai_service.services.silence import SilenceDetectionService
 from ai_service.services.transcription import TranscriptionService
 from ai_service.services.viral import ViralScoringService
+from ai_service.services.visual_motion import VisualMotionService
+from ai_service.services.whisper import WhisperService
+from ai_service.services.whisper_worker import WhisperWorkerSupervisor
 
-configure_logging()
+settings: Settings = load_settings()
+configure_logging(
+    log_file=settings.log_file,
+    level=settings.log_level,
+    max_bytes=settings.log_max_bytes,
+    backups=settings.log_backups,
+    debug_sample_rate=settings.log_debug_sample_rate,
+)
 logger = logging.getLogger("ai_service")
 
-settings: Settings = load_settings()
-repository = SqliteRepository(settings.sqlite_path)
-transcription_service = TranscriptionService()
+repository = SqliteRepository(settings.sqlite_path, settings.blob_dir, settings.blob_inline_bytes)
+feature_store = FeatureStore(settings.feature_dir or str(Path(settings.sqlite_path).parent / "features"))
+scratch_space = ScratchSpace(
+    settings.scratch_dir or str(Path(settings.sqlite_path).parent / "scratch"),
+    quota_bytes=settings.scratch_quota_mb * 1024 * 1024,
+)
+whisper_worker = (
+    WhisperWorkerSupervisor(
+        model_name=settings.whisper_model,
+        max_rss_bytes=settings.whisper_worker_max_rss_mb * 1024 * 1024,
+    )
+    if settings.transcribe_mode == "local" and settings.whisper_worker
+    else None
+)
+transcription_service = TranscriptionService(
+    WhisperService(settings.whisper_bin, settings.whisper_model, worker=whisper_worker, scratch=scratch_space)
+)
 silence_service = SilenceDetectionService()
 viral_service = ViralScoringService()
-hook_service = HookService()
+hook_service = HookService(viral_service)
 ffmpeg_service = FFmpegPipelineService(settings.ffmpeg_bin)
+audio_features = AudioFeatureService(settings.ffmpeg_bin)
+visual_motion = VisualMotionService(settings.ffmpeg_bin, repository)
+loudness = LoudnessService(settings.ffmpeg_bin, repository)
 cloud_jobs = CloudJobService(repository)
 analytics = AnalyticsService(repository)
-platform_export = PlatformExportService()
+transcripts = TranscriptSearchService(repository)
+job_maintenance = JobMaintenanceService(
+    repository,
+    retention_seconds=settings.job_retention_hours * 3600,
+    artifact_retention_seconds=settings.artifact_retention_hours * 3600,
+    interval=settings.maintenance_interval_seconds,
+)
+platform_export = PlatformExportService(
+    repository,
+    {
+        "youtube": YouTubeUploadProtocol(settings.youtube_upload_url, settings.youtube_access_token),
+        "tiktok": TikTokUploadProtocol(settings.tiktok_upload_url, settings.tiktok_access_token),
+    },
+    chunk_size=settings.upload_chunk_mb * 1024 * 1024,
+    streams=settings.upload_streams,
+    pool_size=settings.upload_pool_size,
+)
+batch_service = BatchService(analytics, max_workers=settings.batch_workers)
+auto_edit_pipeline = build_auto_edit_pipeline(
+    repository,
+    ffmpeg_service,
+    transcription_service,
+    silence_service,
+    viral_service,
+    hook_service,
+    audio_features,
+    visual_motion,
+    loudness,
+    transcribe_mode=settings.transcribe_mode,
+)
 auth = AuthService(settings.api_key)
-rate_limiter = RateLimiter(max_requests=120, window_seconds=60)
+request_profiler = RequestProfiler()
+_profile_session = threading.Lock()
+rate_limiter = RateLimiter(max_requests=settings.rate_limit_per_minute, window_seconds=60)
 
 
 class AppError(RuntimeError):
@@ -66,58 +160,367 @@ def require_auth_and_quota(client_id: str, api_key: str | None) -> None:
 
 
 def create_project(req: ProjectCreateRequest) -> ProjectCreateResponse:
-    metadata = ffmpeg_service.probe_metadata(req.video_path)
+    with metrics.span("service_call_seconds", service="ffmpeg.probe_metadata"):
+        metadata = ffmpeg_service.probe_metadata(req.video_path)
     analytics.track("project_created", {"project_id": req.project_id, "size_bytes": metadata["size_bytes"]})
     logger.info("project_created", extra={"extra_payload": {"project_id": req.project_id}})
     return ProjectCreateResponse(project_id=req.project_id, metadata=metadata)
 
 
+def _loudnorm_filter(
+    input_path: str, normalize: bool, target: float, ranges: list[tuple[float, float]] | None = None
+) -> str | None:
+    """Single-pass loudnorm for an export, from the source's cached measurements (None: no normalisation)."""
+    if not normalize:
+        return None
+    try:
+        with metrics.span("service_call_seconds", service="loudness.analyze"):
+            stats = loudness.analyze(input_path, source_fingerprint(input_path))
+    except FileNotFoundError as exc:
+        raise AppError("video_not_found", status_code=404) from exc
+    except RuntimeError as exc:
+        logger.warning("loudness_analysis_failed", extra={"extra_payload": {"error": str(exc)}})
+        raise AppError("loudness_analysis_unavailable", status_code=503) from exc
+    return loudness.loudnorm_filter(stats, target, ranges)
+
+
 def prepare_export(req: ExportRequest) -> ExportResponse:
-    command = ffmpeg_service.build_export_command(
-        input_path=req.input_path,
-        output_path=req.output_path,
-        aspect_ratio=req.aspect_ratio,
-        add_subtitles=req.add_subtitles,
-        subtitle_path=req.subtitle_path,
-    )
+    audio_filter = _loudnorm_filter(req.input_path, req.normalize_audio, req.loudness_target)
+    with metrics.span("service_call_seconds", service="ffmpeg.build_export_command"):
+        command = ffmpeg_service.build_export_command(
+            input_path=req.input_path,
+            output_path=req.output_path,
+            aspect_ratio=req.aspect_ratio,
+            add_subtitles=req.add_subtitles,
+            subtitle_path=req.subtitle_path,
+            audio_filter=audio_filter,
+        )
     analytics.track("export_prepared", {"ratio": req.aspect_ratio})
     return ExportResponse(command=command, output_path=req.output_path)
 
 
+def prepare_jump_cut(req: JumpCutRequest) -> JumpCutResponse:
+    if req.duration <= 0:
+        raise AppError("invalid_duration", status_code=400)
+    ranges = keep_ranges(req.silences, req.duration, req.padding, req.min_cut)
+    script_path = str(Path(req.output_path).with_suffix(".filtergraph.txt"))
+    # Measured over the kept ranges only: the silences cut out must not lower the estimate.
+    audio_filter = _loudnorm_filter(
+        req.input_path, req.normalize_audio, req.loudness_target, [(r.start, r.end) for r in ranges]
+    )
+    try:
+        with metrics.span("service_call_seconds", service="ffmpeg.build_jump_cut_command"):
+            command = ffmpeg_service.build_jump_cut_command(
+                input_path=req.input_path,
+                output_path=req.output_path,
+                script_path=script_path,
+                aspect_ratio=req.aspect_ratio,
+                ranges=ranges,
+                add_subtitles=req.add_subtitles,
+                subtitle_path=req.subtitle_path,
+                audio_filter=audio_filter,
+            )
+    except ValueError as exc:
+        raise AppError("nothing_to_keep" if not ranges else "invalid_export", status_code=400) from exc
+    kept = round(sum(r.end - r.start for r in ranges), 3)
+    analytics.track("jump_cut_prepared", {"cuts": max(0, len(ranges) - 1), "kept_seconds": kept})
+    return JumpCutResponse(
+        command=command,
+        output_path=req.output_path,
+        filter_script=script_path,
+        keep_ranges=ranges,
+        kept_seconds=kept,
+    )
+
+
 def transcribe(req: TranscribeRequest) -> TranscribeResponse:
-    segments = transcription_service.transcribe(req.video_path, req.language)
+    with metrics.span("service_call_seconds", service="transcription.transcribe"):
+        segments = transcription_service.transcribe(req.video_path, req.language)
+    if req.project_id:
+        transcripts.save(req.project_id, segments)
     analytics.track("transcription_done", {"segments": len(segments)})
     return TranscribeResponse(segments=segments)
 
 
+def get_transcript(project_id: str) -> TranscribeResponse:
+    segments = transcripts.get(project_id)
+    if not segments:
+        raise AppError("transcript_not_found", status_code=404)
+    return TranscribeResponse(segments=segments)
+
+
+def update_transcript(project_id: str, segments: list[TranscriptSegment]) -> dict:
+    """Replace a project's transcript (manual edits); only changed segments are re-indexed."""
+    with metrics.span("service_call_seconds", service="search.save_transcript"):
+        changed = transcripts.save(project_id, segments)
+    if changed:
+        feature_store.drop(project_id, "segments")
+    return {"project_id": project_id, "segments": len(segments), "changed": changed}
+
+
+def search_transcripts(query: str, project_id: str | None = None, limit: int = 20) -> SearchResponse:
+    if not 1 <= limit <= 200:
+        raise AppError("invalid_limit", status_code=400)
+    with metrics.span("service_call_seconds", service="search.query"):
+        hits = transcripts.search(query, project_id, limit)
+    return SearchResponse(hits=hits)
+
+
 def detect_silences(req: DetectSilencesRequest) -> DetectSilencesResponse:
-    silences = silence_service.detect(req.durations, req.amplitudes, req.silence_threshold)
+    if req.project_id:
+        silences = _detect_stored_silences(req)
+    else:
+        with metrics.span("service_call_seconds", service="silence.detect"):
+            silences = silence_service.detect(req.durations, req.amplitudes, req.silence_threshold)
     analytics.track("silence_detection_done", {"silences": len(silences)})
     return DetectSilencesResponse(silences=silences)
 
 
+def _detect_stored_silences(req: DetectSilencesRequest) -> list[SilenceSegment]:
+    try:
+        if req.durations:
+            columns = {"duration": req.durations, "amplitude": req.amplitudes}
+            with metrics.span("service_call_seconds", service="features.store"):
+                if req.append:
+                    feature_store.append(req.project_id, "envelope", columns)
+                else:
+                    feature_store.write(req.project_id, "envelope", columns)
+        envelope = feature_store.load(req.project_id, "envelope")
+    except ValueError as exc:
+        raise AppError("invalid_envelope", status_code=400) from exc
+    except RuntimeError as exc:
+        raise AppError("feature_store_unavailable", status_code=503) from exc
+    if envelope is None:
+        raise AppError("features_not_found", status_code=404)
+    with metrics.span("service_call_seconds", service="silence.detect"):
+        return silence_service.detect_columns(envelope["duration"], envelope["amplitude"], req.silence_threshold)
+
+
+def _feature_source(video_path: str) -> str:
+    if not video_path:
+        return ""
+    try:
+        return source_fingerprint(video_path)
+    except FileNotFoundError as exc:
+        raise AppError("video_not_found", status_code=404) from exc
+
+
+def _store_segment_features(project_id: str, columns: dict, source: str) -> None:
+    """Best effort: the store only spares later requests from resending or recomputing signals."""
+    try:
+        with metrics.span("service_call_seconds", service="features.store"):
+            feature_store.write(project_id, "segments", columns, source)
+    except (OSError, RuntimeError) as exc:
+        logger.warning("feature_store_write_failed", extra={"extra_payload": {"error": str(exc)}})
+
+
+def _moment_signals(
+    transcript: list[TranscriptSegment],
+    audio_peaks: list[float],
+    speech_rates: list[float],
+    motion: list[float],
+    video_path: str = "",
+) -> tuple[list[float], list[float], list[float]]:
+    """Fill in the signals the client did not send, from the transcript and (with `video_path`) the media.
+
+    Each media signal is measured on its own: one that cannot be (no audio or
+    video stream, undecodable file) stays empty, i.e. neutral for the scorer.
+    503 only when none of the requested media signals could be produced.
+    """
+    if not speech_rates:
+        speech_rates = audio_features.speech_rates(transcript)
+    if not video_path or (audio_peaks and motion):
+        return audio_peaks, speech_rates, motion
+    errors: list[str] = []
+    requested = int(not audio_peaks) + int(not motion)
+    try:
+        if not audio_peaks:
+            try:
+                with metrics.span("service_call_seconds", service="audio.peaks"):
+                    envelope = audio_features.loudness_envelope(video_path)
+                    audio_peaks = audio_features.segment_peaks(envelope, transcript)
+            except RuntimeError as exc:
+                errors.append(str(exc))
+        if not motion:
+            try:
+                with metrics.span("service_call_seconds", service="visual.motion"):
+                    motion = visual_motion.segment_motion(video_path, transcript, source_fingerprint(video_path))
+            except RuntimeError as exc:
+                errors.append(str(exc))
+    except FileNotFoundError as exc:
+        raise AppError("video_not_found", status_code=404) from exc
+    if errors:
+        logger.warning("media_features_failed", extra={"extra_payload": {"errors": errors}})
+        if len(errors) == requested:
+            raise AppError("media_features_unavailable", status_code=503)
+    return audio_peaks, speech_rates, motion
+
+
 def score_moments(req: ScoreMomentsRequest) -> ScoreMomentsResponse:
-    candidates = viral_service.score(req.transcript, req.audio_peaks, req.speech_rates)
+    candidates = _scored_candidates(req)
     analytics.track("moments_scored", {"candidates": len(candidates)})
     return ScoreMomentsResponse(candidates=candidates)
 
 
+def _scored_candidates(req: ScoreMomentsRequest) -> list[MomentCandidate]:
+    if req.project_id and not req.transcript:
+        return _score_stored_moments(req.project_id, req.video_path)
+    audio_peaks, speech_rates, motion = _moment_signals(
+        req.transcript, req.audio_peaks, req.speech_rates, req.visual_motion, req.video_path
+    )
+    with metrics.span("service_call_seconds", service="viral.score"):
+        candidates = viral_service.score(req.transcript, audio_peaks, speech_rates, motion)
+    if req.project_id:
+        columns = viral_service.feature_columns(req.transcript, audio_peaks, speech_rates, motion)
+        _store_segment_features(req.project_id, columns, _feature_source(req.video_path))
+    return candidates
+
+
+def _score_stored_moments(project_id: str, video_path: str = "") -> list[MomentCandidate]:
+    """Score the project's stored signals; rebuilt from its saved transcript when missing or stale."""
+    source = _feature_source(video_path)
+    try:
+        columns = feature_store.load(project_id, "segments", source if video_path else None)
+    except RuntimeError as exc:
+        raise AppError("feature_store_unavailable", status_code=503) from exc
+    if columns is None:
+        transcript = transcripts.get(project_id)
+        if not transcript:
+            raise AppError("features_not_found", status_code=404)
+        audio_peaks, speech_rates, motion = _moment_signals(transcript, [], [], [], video_path)
+        columns = viral_service.feature_columns(transcript, audio_peaks, speech_rates, motion)
+        _store_segment_features(project_id, columns, source)
+    with metrics.span("service_call_seconds", service="viral.score"):
+        return [candidate for _, candidate in viral_service.score_columns(columns)]
+
+
 def generate_hooks(req: GenerateHooksRequest) -> GenerateHooksResponse:
-    hooks = hook_service.generate(req.transcript, req.style, req.limit)
+    with metrics.span("service_call_seconds", service="hooks.generate"):
+        hooks = hook_service.generate(req.transcript, req.style, req.limit, req.project_id)
     analytics.track("hooks_generated", {"count": len(hooks)})
     return GenerateHooksResponse(hooks=hooks)
 
 
+def generate_hooks_batch(req: GenerateHooksBatchRequest) -> GenerateHooksBatchResponse:
+    with metrics.span("service_call_seconds", service="hooks.generate_batch"):
+        hooks = hook_service.generate_batch(req.transcript, req.clips, req.style, req.limit, req.project_id)
+    analytics.track("hooks_batch_generated", {"clips": len(req.clips), "count": sum(len(h) for h in hooks)})
+    return GenerateHooksBatchResponse(hooks=hooks)
+
+
+def auto_edit(req: AutoEditRequest) -> AutoEditResponse:
+    try:
+        fingerprint = source_fingerprint(req.video_path)
+    except FileNotFoundError as exc:
+        raise AppError("video_not_found", status_code=404) from exc
+    # Measured (and cached) up front: a source without audio fails like /export, before any stage runs.
+    _loudnorm_filter(req.video_path, req.normalize_audio, req.loudness_target)
+    with metrics.span("service_call_seconds", service="pipeline.auto_edit"):
+        run = auto_edit_pipeline.run({**req.__dict__, "source_fingerprint": fingerprint})
+    transcript = [TranscriptSegment(**seg) for seg in run.outputs["transcribe"]["segments"]]
+    transcripts.save(req.project_id, transcript)
+    columns = viral_service.feature_columns(
+        transcript,
+        run.outputs["audio_features"]["audio_peaks"],
+        run.outputs["audio_features"]["speech_rates"],
+        run.outputs["visual_motion"]["visual_motion"],
+    )
+    _store_segment_features(req.project_id, columns, fingerprint)
+    analytics.track("auto_edit_done", {"executed": len(run.executed), "cached": len(run.cached)})
+    return AutoEditResponse(
+        project_id=req.project_id,
+        outputs=run.outputs,
+        cached_stages=run.cached,
+        executed_stages=run.executed,
+    )
+
+
+def _batch_score_moments(payload: dict) -> tuple[dict, AnalyticsEvent]:
+    req = ScoreMomentsRequest(
+        transcript=[TranscriptSegment(**t) for t in payload.get("transcript", [])],
+        audio_peaks=payload.get("audio_peaks", []),
+        speech_rates=payload.get("speech_rates", []),
+        visual_motion=payload.get("visual_motion", []),
+        video_path=payload.get("video_path", ""),
+        project_id=payload.get("project_id", ""),
+    )
+    candidates = _scored_candidates(req)
+    event = AnalyticsEvent(name="moments_scored", properties={"candidates": len(candidates)})
+    return {"candidates": [c.__dict__ for c in candidates]}, event
+
+
+def _batch_generate_hooks(payload: dict) -> tuple[dict, AnalyticsEvent]:
+    transcript = [TranscriptSegment(**t) for t in payload.get("transcript", [])]
+    with metrics.span("service_call_seconds", service="hooks.generate"):
+        hooks = hook_service.generate(
+            transcript, payload.get("style", "generic"), payload.get("limit", 3), payload.get("project_id")
+        )
+    return {"hooks": hooks}, AnalyticsEvent(name="hooks_generated", properties={"count": len(hooks)})
+
+
+def _batch_detect_silences(payload: dict) -> tuple[dict, AnalyticsEvent]:
+    req = DetectSilencesRequest(**payload)
+    if req.project_id:
+        silences = _detect_stored_silences(req)
+    else:
+        with metrics.span("service_call_seconds", service="silence.detect"):
+            silences = silence_service.detect(req.durations, req.amplitudes, req.silence_threshold)
+    event = AnalyticsEvent(name="silence_detection_done", properties={"silences": len(silences)})
+    return {"silences": [s.__dict__ for s in silences]}, event
+
+
+BATCH_HANDLERS = {
+    "score-moments": _batch_score_moments,
+    "generate-hooks": _batch_generate_hooks,
+    "detect-silences": _batch_detect_silences,
+}
+
+
+def run_batch(req: BatchRequest) -> Iterator[BatchItemResult]:
+    if len(req.operations) > batch_service.max_items:
+        raise AppError("batch_too_large", status_code=413)
+    return batch_service.run(req.operations, BATCH_HANDLERS)
+
+
 def enqueue_cloud_job(req: CloudJobRequest) -> CloudJobResponse:
-    job = cloud_jobs.enqueue(req.operation, req.payload)
-    return CloudJobResponse(job=job)
+    with metrics.span("service_call_seconds", service="cloud.enqueue"):
+        job, created = cloud_jobs.enqueue(req.operation, req.payload, req.priority)
+    return CloudJobResponse(job=job, deduplicated=not created)
 
 
 def process_cloud_job(job_id: str) -> CloudJobResponse:
-    job = cloud_jobs.process(job_id)
+    with metrics.span("service_call_seconds", service="cloud.process"):
+        job = cloud_jobs.process(job_id)
     return CloudJobResponse(job=job)
 
 
+def process_next_cloud_job() -> CloudJobResponse | None:
+    with metrics.span("service_call_seconds", service="cloud.process_next"):
+        job = cloud_jobs.process_next()
+    return CloudJobResponse(job=job) if job is not None else None
+
+
+async def wait_cloud_job(job_id: str, status: str | None = None, timeout: float = 30.0) -> CloudJob:
+    """Long-poll on the event loop: open waits do not hold threadpool threads needed by sync routes."""
+    if not 0 <= timeout <= 60:
+        raise AppError("invalid_timeout", status_code=400)
+    try:
+        return await cloud_jobs.wait_async(job_id, status, timeout)
+    except KeyError as exc:
+        raise AppError("job_not_found", status_code=404) from exc
+
+
+def list_cloud_jobs(status: str | None = None, limit: int = 50, cursor: str | None = None) -> CloudJobListResponse:
+    if status is not None and status not in {"queued", "processing", "done", "failed"}:
+        raise AppError("invalid_status", status_code=400)
+    if not 1 <= limit <= 500:
+        raise AppError("invalid_limit", status_code=400)
+    try:
+        return cloud_jobs.list(status, limit, cursor)
+    except ValueError as exc:
+        raise AppError("invalid_cursor", status_code=400) from exc
+
+
 def get_cloud_job(job_id: str) -> CloudJob:
     try:
         return cloud_jobs.get(job_id)
@@ -126,30 +529,132 @@ def get_cloud_job(job_id: str) -> CloudJob:
 
 
 def export_to_platform(req: ExportPlatformRequest) -> ExportPlatformResponse:
-    res = platform_export.export(req.platform, req.file_path, req.title)
+    if req.platform not in platform_export.protocols:
+        raise AppError("unsupported_platform", status_code=400)
+    try:
+        with metrics.span("service_call_seconds", service="platform.export"):
+            res = platform_export.export(req.platform, req.file_path, req.title)
+    except UploadError as exc:  # missing credentials: the upload could never succeed
+        raise AppError(str(exc), status_code=503) from exc
+    except FileNotFoundError as exc:
+        raise AppError("file_not_found", status_code=404) from exc
+    except ValueError as exc:
+        raise AppError("empty_file", status_code=400) from exc
     analytics.track("platform_export_queued", {"platform": req.platform})
     return res
 
 
+def get_platform_upload(upload_id: str) -> PlatformUpload:
+    try:
+        return platform_export.get(upload_id)
+    except KeyError as exc:
+        raise AppError("upload_not_found", status_code=404) from exc
+
+
+def resume_platform_upload(upload_id: str) -> PlatformUpload:
+    try:
+        return platform_export.resume(upload_id)
+    except KeyError as exc:
+        raise AppError("upload_not_found", status_code=404) from exc
+
+
 def get_analytics() -> list[dict]:
     return analytics.dump()
 
 
-def runtime_checks() -> dict[str, str | bool]:
+def _require_profiler(fmt: str | None = None) -> None:
+    # Opt-in (prod included, where the API key is mandatory): the sampler sees every thread's stack.
+    if not settings.admin_profiler:
+        raise AppError("profiler_disabled", status_code=403)
+    if fmt is not None and fmt not in {"collapsed", "speedscope"}:
+        raise AppError("invalid_profile_format", status_code=400)
+
+
+def profile_process(seconds: float, fmt: str = "collapsed", interval_ms: float = 5.0) -> dict:
+    """Sample every thread (request pool included) for `seconds`."""
+    _require_profiler(fmt)
+    if not 0 < seconds <= 60 or not 1 <= interval_ms <= 1000:
+        raise AppError("invalid_profile_window", status_code=400)
+    if not _profile_session.acquire(blocking=False):
+        raise AppError("profiler_busy", status_code=409)
+    try:
+        profiler = SamplingProfiler(interval=interval_ms / 1000)
+        profiler.profile_for(seconds)
+    finally:
+        _profile_session.release()
+    return profiler.render(fmt)
+
+
+def arm_request_profile(route: str, fmt: str = "collapsed", interval_ms: float = 2.0, timeout: float = 300.0) -> dict:
+    _require_profiler(fmt)
+    request_profiler.arm(route, fmt, interval=interval_ms / 1000, timeout=timeout)
+    return {"armed": True, "route": route}
+
+
+def last_request_profile() -> dict:
+    _require_profiler()
+    if request_profiler.last is None:
+        raise AppError("profile_not_found", status_code=404)
+    return request_profiler.last
+
+
+def runtime_checks() -> dict:
     return {
         "ffmpeg_available": ffmpeg_service.is_available(),
         "whisper_available": shutil.which(settings.whisper_bin) is not None,
         "transcribe_mode": settings.transcribe_mode,
         "environment": settings.app_env,
+        "whisper_worker": whisper_worker.status() if whisper_worker is not None else None,
+        "scratch": scratch_space.usage(),
     }
 
 
 def create_fastapi_app():
     """Production FastAPI adapter with auth, quota and unified errors."""
     from fastapi import FastAPI, Header, Request
-    from fastapi.responses import JSONResponse
-
-    app = FastAPI(title="Monteur IA Local Service", version="0.3.0")
+    from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        if whisper_worker is not None:
+            # Spawned at boot so the model load overlaps with the UI start-up.
+            whisper_worker.start()
+        job_maintenance.start()
+        platform_export.resume_pending()
+        try:
+            yield
+        finally:
+            platform_export.shutdown()
+            job_maintenance.stop()
+            if whisper_worker is not None:
+                whisper_worker.stop()
+            batch_service.shutdown()
+
+    app = FastAPI(title="Monteur IA Local Service", version="0.3.0", lifespan=lifespan)
+
+    @app.middleware("http")
+    async def request_metrics(request: Request, call_next):
+        request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+        id_token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        started_token = request_started_var.set(started)
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            response.headers["x-request-id"] = request_id
+            return response
+        finally:
+            route = request.scope.get("route")
+            metrics.observe(
+                "http_request_seconds",
+                time.perf_counter() - started,
+                route=getattr(route, "path", "unmatched"),
+                method=request.method,
+                status=str(status),
+            )
+            request_started_var.reset(started_token)
+            request_id_var.reset(id_token)
 
     @app.exception_handler(AppError)
     async def app_error_handler(_: Request, exc: AppError):
@@ -161,20 +666,84 @@ def create_fastapi_app():
         return JSONResponse(status_code=500, content={"error": "internal_server_error"})
 
     def guarded(handler):
-        @wraps(handler)
-        def wrapper(*args, x_api_key: str | None = Header(default=None), request: Request, **kwargs):
+        def check(request: Request, x_api_key: str | None) -> str:
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            started = request_started_var.get()
+            if started is not None:
+                metrics.observe("http_pre_handler_seconds", time.perf_counter() - started, route=route)
             client_id = request.client.host if request.client else "unknown"
             require_auth_and_quota(client_id, x_api_key)
-            return handler(*args, **kwargs)
-
+            return route
+
+        if inspect.iscoroutinefunction(handler):
+            # Async handlers (long-polls) stay on the event loop instead of a threadpool thread.
+            @wraps(handler)
+            async def wrapper(*args, x_api_key: str | None = Header(default=None), request: Request, **kwargs):
+                route = check(request, x_api_key)
+                if request_profiler.armed:
+                    # Samples the event-loop thread, so other coroutines interleaved with this one show up too.
+                    with request_profiler.capture(route):
+                        return await handler(*args, **kwargs)
+                return await handler(*args, **kwargs)
+
+        else:
+
+            @wraps(handler)
+            def wrapper(*args, x_api_key: str | None = Header(default=None), request: Request, **kwargs):
+                route = check(request, x_api_key)
+                if request_profiler.armed:
+                    with request_profiler.capture(route):
+                        return handler(*args, **kwargs)
+                return handler(*args, **kwargs)
+
+        # Expose the handler parameters plus the auth ones, otherwise FastAPI
+        # follows __wrapped__ and never injects `request` / `x_api_key`.
+        params = list(inspect.signature(handler).parameters.values())
+        params += [
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter(
+                "x_api_key",
+                inspect.Parameter.KEYWORD_ONLY,
+                default=Header(default=None),
+                annotation=str | None,
+            ),
+        ]
+        wrapper.__signature__ = inspect.signature(handler).replace(parameters=params)
         return wrapper
 
     @app.get("/health")
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/metrics")
+    @guarded
+    def metrics_http() -> PlainTextResponse:
+        return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    @app.post("/admin/profile")
+    @guarded
+    def profile_http(req: dict) -> dict:
+        return profile_process(
+            float(req.get("seconds", 5)), req.get("format", "collapsed"), float(req.get("interval_ms", 5))
+        )
+
+    @app.post("/admin/profile/next")
+    @guarded
+    def arm_profile_http(req: dict) -> dict:
+        return arm_request_profile(
+            req["route"],
+            req.get("format", "collapsed"),
+            float(req.get("interval_ms", 2)),
+            float(req.get("timeout", 300)),
+        )
+
+    @app.get("/admin/profile/last")
+    @guarded
+    def last_profile_http() -> dict:
+        return last_request_profile()
+
     @app.get("/health/runtime")
-    def health_runtime() -> dict[str, str | bool]:
+    def health_runtime() -> dict:
         return runtime_checks()
 
     @app.post("/project/create")
@@ -189,12 +758,40 @@ def create_fastapi_app():
         response = prepare_export(ExportRequest(**req))
         return {"command": response.command, "output_path": response.output_path}
 
+    @app.post("/pipeline/export/jump-cut")
+    @guarded
+    def prepare_jump_cut_http(req: dict) -> dict:
+        silences = [SilenceSegment(**s) for s in req.pop("silences", [])]
+        response = prepare_jump_cut(JumpCutRequest(**req, silences=silences))
+        return {**response.__dict__, "keep_ranges": [r.__dict__ for r in response.keep_ranges]}
+
+    @app.post("/pipeline/auto-edit")
+    @guarded
+    def auto_edit_http(req: dict) -> dict:
+        return auto_edit(AutoEditRequest(**req)).__dict__
+
     @app.post("/transcribe")
     @guarded
     def transcribe_http(req: dict) -> dict:
         response = transcribe(TranscribeRequest(**req))
         return {"segments": [s.__dict__ for s in response.segments]}
 
+    @app.get("/project/{project_id}/transcript")
+    @guarded
+    def get_transcript_http(project_id: str) -> dict:
+        return {"segments": [s.__dict__ for s in get_transcript(project_id).segments]}
+
+    @app.put("/project/{project_id}/transcript")
+    @guarded
+    def update_transcript_http(project_id: str, req: dict) -> dict:
+        return update_transcript(project_id, [TranscriptSegment(**t) for t in req.get("segments", [])])
+
+    @app.get("/search")
+    @guarded
+    def search_http(q: str, project_id: str | None = None, limit: int = 20) -> dict:
+        response = search_transcripts(q, project_id, limit)
+        return {"hits": [hit.__dict__ for hit in response.hits]}
+
     @app.post("/detect-silences")
     @guarded
     def detect_silences_http(req: dict) -> dict:
@@ -210,6 +807,9 @@ def create_fastapi_app():
                 transcript=transcript,
                 audio_peaks=req.get("audio_peaks", []),
                 speech_rates=req.get("speech_rates", []),
+                visual_motion=req.get("visual_motion", []),
+                video_path=req.get("video_path", ""),
+                project_id=req.get("project_id", ""),
             )
         )
         return {"candidates": [c.__dict__ for c in response.candidates]}
@@ -223,15 +823,51 @@ def create_fastapi_app():
                 transcript=transcript,
                 style=req.get("style", "generic"),
                 limit=req.get("limit", 3),
+                project_id=req.get("project_id"),
+            )
+        )
+        return {"hooks": response.hooks}
+
+    @app.post("/generate-hooks/batch")
+    @guarded
+    def generate_hooks_batch_http(req: dict) -> dict:
+        transcript = [TranscriptSegment(**t) for t in req.get("transcript", [])]
+        response = generate_hooks_batch(
+            GenerateHooksBatchRequest(
+                transcript=transcript,
+                clips=[HookClip(**c) for c in req.get("clips", [])],
+                style=req.get("style", "generic"),
+                limit=req.get("limit", 1),
+                project_id=req.get("project_id"),
             )
         )
         return {"hooks": response.hooks}
 
+    @app.post("/batch")
+    @guarded
+    def batch_http(req: dict) -> StreamingResponse:
+        operations = [BatchOperation(**op) for op in req.get("operations", [])]
+        results = run_batch(BatchRequest(operations=operations))
+        lines = (json.dumps(item.__dict__, ensure_ascii=False) + "\n" for item in results)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
     @app.post("/cloud/jobs")
     @guarded
     def enqueue_cloud_job_http(req: dict) -> dict:
         response = enqueue_cloud_job(CloudJobRequest(**req))
-        return {"job": response.job.__dict__}
+        return {"job": response.job.__dict__, "deduplicated": response.deduplicated}
+
+    @app.get("/cloud/jobs")
+    @guarded
+    def list_cloud_jobs_http(status: str | None = None, limit: int = 50, cursor: str | None = None) -> dict:
+        response = list_cloud_jobs(status, limit, cursor)
+        return {"jobs": [job.__dict__ for job in response.jobs], "next_cursor": response.next_cursor}
+
+    @app.post("/cloud/jobs/claim")
+    @guarded
+    def process_next_cloud_job_http() -> dict:
+        response = process_next_cloud_job()
+        return {"job": response.job.__dict__ if response is not None else None}
 
     @app.post("/cloud/jobs/{job_id}/process")
     @guarded
@@ -239,6 +875,11 @@ def create_fastapi_app():
         response = process_cloud_job(job_id)
         return {"job": response.job.__dict__}
 
+    @app.get("/cloud/jobs/{job_id}/wait")
+    @guarded
+    async def wait_cloud_job_http(job_id: str, status: str | None = None, timeout: float = 30.0) -> dict:
+        return (await wait_cloud_job(job_id, status, timeout)).__dict__
+
     @app.get("/cloud/jobs/{job_id}")
     @guarded
     def get_cloud_job_http(job_id: str) -> dict:
@@ -250,6 +891,16 @@ def create_fastapi_app():
         response = export_to_platform(ExportPlatformRequest(**req))
         return response.__dict__
 
+    @app.get("/platform/uploads/{upload_id}")
+    @guarded
+    def get_platform_upload_http(upload_id: str) -> dict:
+        return get_platform_upload(upload_id).__dict__
+
+    @app.post("/platform/uploads/{upload_id}/resume")
+    @guarded
+    def resume_platform_upload_http(upload_id: str) -> dict:
+        return resume_platform_upload(upload_id).__dict__
+
     @app.get("/analytics/events")
     @guarded
     def analytics_http() -> dict:
@@ -17,6 +17,7 @@ class TranscriptSegment:
 class TranscribeRequest:
     video_path: str
     language: str = "fr"
+    project_id: str | None = None  # when set, the transcript is stored and indexed for /search
 
 
 @dataclass
@@ -29,6 +30,10 @@ class DetectSilencesRequest:
     durations: list[float] = field(default_factory=list)
     amplitudes: list[float] = field(default_factory=list)
     silence_threshold: float = 0.12
+    # With a project, frames are stored in its feature store (appended when `append`)
+    # and silences are detected over everything stored; frames may then be omitted.
+    project_id: str = ""
+    append: bool = False
 
 
 @dataclass
@@ -55,6 +60,30 @@ class ScoreMomentsRequest:
     transcript: list[TranscriptSegment] = field(default_factory=list)
     audio_peaks: list[float] = field(default_factory=list)
     speech_rates: list[float] = field(default_factory=list)
+    visual_motion: list[float] = field(default_factory=list)
+    video_path: str = ""  # when set, missing audio_peaks / visual_motion are measured server-side
+    project_id: str = ""  # stores the signals; without a transcript, scores the stored ones
+
+
+@dataclass
+class AudioFeatures:
+    audio_peaks: list[float]
+    speech_rates: list[float]
+
+
+@dataclass
+class LoudnessStats:
+    """EBU R128 measurements of a whole source plus its loudness every `window` seconds."""
+
+    integrated: float  # LUFS
+    true_peak: float  # dBTP
+    lra: float  # LU
+    threshold: float  # relative gate, LUFS
+    target_offset: float = 0.0
+    window: float = 0.4
+    momentary: list[float] = field(default_factory=list)  # LUFS per window
+    short_term: list[float] = field(default_factory=list)  # LUFS per window (3 s sliding)
+    peaks: list[float] = field(default_factory=list)  # dBTP per window
 
 
 @dataclass
@@ -67,6 +96,7 @@ class GenerateHooksRequest:
     transcript: list[TranscriptSegment]
     style: Literal["business", "podcast", "story", "generic"] = "generic"
     limit: int = 3
+    project_id: str | None = None
 
 
 @dataclass
@@ -74,6 +104,26 @@ class GenerateHooksResponse:
     hooks: list[str]
 
 
+@dataclass
+class HookClip:
+    start: float
+    end: float
+
+
+@dataclass
+class GenerateHooksBatchRequest:
+    transcript: list[TranscriptSegment]
+    clips: list[HookClip]
+    style: Literal["business", "podcast", "story", "generic"] = "generic"
+    limit: int = 1
+    project_id: str | None = None
+
+
+@dataclass
+class GenerateHooksBatchResponse:
+    hooks: list[list[str]]
+
+
 @dataclass
 class ProjectCreateRequest:
     video_path: str
@@ -93,6 +143,8 @@ class ExportRequest:
     aspect_ratio: Literal["9:16", "1:1", "16:9"]
     add_subtitles: bool = False
     subtitle_path: str | None = None
+    normalize_audio: bool = False  # single-pass loudnorm from the cached source measurements
+    loudness_target: float = -14.0  # LUFS
 
 
 @dataclass
@@ -101,6 +153,77 @@ class ExportResponse:
     output_path: str
 
 
+@dataclass
+class SearchHit:
+    project_id: str
+    start_ms: int
+    end_ms: int
+    text: str
+    snippet: str
+    score: float
+
+
+@dataclass
+class SearchResponse:
+    hits: list[SearchHit]
+
+
+@dataclass
+class KeepRange:
+    start: float
+    end: float
+
+
+@dataclass
+class JumpCutRequest:
+    input_path: str
+    output_path: str
+    duration: float
+    silences: list[SilenceSegment] = field(default_factory=list)
+    aspect_ratio: Literal["9:16", "1:1", "16:9"] = "9:16"
+    padding: float = 0.1
+    min_cut: float = 0.3
+    add_subtitles: bool = False
+    subtitle_path: str | None = None
+    normalize_audio: bool = False
+    loudness_target: float = -14.0
+
+
+@dataclass
+class JumpCutResponse:
+    command: list[str]
+    output_path: str
+    filter_script: str
+    keep_ranges: list[KeepRange]
+    kept_seconds: float
+
+
+@dataclass
+class AutoEditRequest:
+    project_id: str
+    video_path: str
+    output_path: str
+    aspect_ratio: Literal["9:16", "1:1", "16:9"] = "9:16"
+    language: str = "fr"
+    durations: list[float] = field(default_factory=list)
+    amplitudes: list[float] = field(default_factory=list)
+    silence_threshold: float = 0.12
+    hook_style: Literal["business", "podcast", "story", "generic"] = "generic"
+    hook_limit: int = 3
+    add_subtitles: bool = False
+    subtitle_path: str | None = None
+    normalize_audio: bool = False
+    loudness_target: float = -14.0
+
+
+@dataclass
+class AutoEditResponse:
+    project_id: str
+    outputs: dict[str, dict]
+    cached_stages: list[str]
+    executed_stages: list[str]
+
+
 @dataclass
 class WhisperApiRequest:
     audio_path: str
@@ -111,6 +234,7 @@ class WhisperApiRequest:
 class CloudJobRequest:
     operation: Literal["viral-score", "hook-generation", "transcribe"]
     payload: dict
+    priority: int = 0
 
 
 @dataclass
@@ -120,11 +244,32 @@ class CloudJob:
     payload: dict
     status: Literal["queued", "processing", "done", "failed"]
     result: dict | None = None
+    priority: int = 0
+    dedup_key: str = ""
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+
+@dataclass
+class CloudJobSummary:
+    id: str
+    operation: str
+    status: str
+    priority: int
+    created_at: float
+    updated_at: float
+
+
+@dataclass
+class CloudJobListResponse:
+    jobs: list[CloudJobSummary]
+    next_cursor: str | None = None
 
 
 @dataclass
 class CloudJobResponse:
     job: CloudJob
+    deduplicated: bool = False
 
 
 @dataclass
@@ -145,3 +290,41 @@ class ExportPlatformResponse:
     platform: str
     status: str
     external_id: str
+    upload_id: str = ""  # poll GET /platform/uploads/{upload_id} for progress
+
+
+@dataclass
+class PlatformUpload:
+    id: str
+    platform: str
+    file_path: str
+    title: str
+    status: str  # queued | uploading | done | failed
+    total_bytes: int
+    bytes_sent: int = 0
+    external_id: str = ""
+    error: str = ""
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+
+@dataclass
+class BatchOperation:
+    id: str
+    operation: Literal["score-moments", "generate-hooks", "detect-silences"]
+    payload: dict = field(default_factory=dict)
+
+
+@dataclass
+class BatchRequest:
+    operations: list[BatchOperation] = field(default_factory=list)
+
+
+@dataclass
+class BatchItemResult:
+    id: str
+    operation: str
+    status: Literal["ok", "error"]
+    result: dict | None = None
+    error: str | None = None
+    elapsed_ms: float = 0.0
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+
+try:  # optional, better ratio and much faster decompression than zlib
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+class BlobStore:
+    """Content-addressed, compressed blobs on disk.
+
+    A reference is `<codec>:<sha256 of the raw bytes>`; identical content is
+    stored once. Files live under `root/<2 hex>/<sha256>.<codec>`.
+    """
+
+    def __init__(self, root: str, level: int = 3, grace: float = 60.0) -> None:
+        self.root = Path(root)
+        self.level = level
+        self.grace = grace
+        self.codec = "zstd" if zstandard is not None else "zlib"
+        # put() and discard() of the same digest are serialised, otherwise discard
+        # could unlink a blob between put()'s existence check and its refresh.
+        self._locks = [threading.Lock() for _ in range(64)]
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        ref = f"{self.codec}:{digest}"
+        path = self._path(ref)
+        with self._lock(digest):
+            try:
+                os.utime(path)  # already stored: refresh so discard() keeps it for `grace` seconds
+                return ref
+            except FileNotFoundError:
+                pass
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(self._compress(data))
+            os.replace(tmp, path)
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        codec = ref.partition(":")[0]
+        try:
+            raw = self._path(ref).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(ref) from None
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("blob compressed with zstd but the zstandard package is not installed")
+            return zstandard.ZstdDecompressor().decompress(raw)
+        return zlib.decompress(raw)
+
+    def discard(self, ref: str) -> bool:
+        """Remove a blob unless it was written or reused within the last `grace` seconds."""
+        path = self._path(ref)
+        with self._lock(ref.partition(":")[2]):
+            try:
+                if time.time() - path.stat().st_mtime < self.grace:
+                    return False
+                path.unlink()
+            except FileNotFoundError:
+                return False
+        return True
+
+    def _lock(self, digest: str) -> threading.Lock:
+        return self._locks[int(digest[:2], 16) % len(self._locks)]
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return zlib.compress(data, min(self.level * 2, 9))
+
+    def _path(self, ref: str) -> Path:
+        codec, _, digest = ref.partition(":")
+        if codec not in {"zstd", "zlib"} or len(digest) != 64 or digest.strip("0123456789abcdef"):
+            raise ValueError(f"invalid blob reference: {ref}")
+        return self.root / digest[:2] / f"{digest}.{codec}"
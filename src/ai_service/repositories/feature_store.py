@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import struct
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from ai_service.core.optional import require_numpy
+
+# Bump when a table's columns or their meaning change: every stored table is then ignored and rebuilt.
+FEATURE_SCHEMA_VERSION = 1
+
+TABLES: dict[str, dict[str, str]] = {
+    # One row per transcript segment; NaN marks a signal that was not measured.
+    "segments": {
+        "start": "<f8",
+        "end": "<f8",
+        "audio_peak": "<f8",
+        "speech_rate": "<f8",
+        "visual_motion": "<f8",
+        "lexical": "<f8",
+    },
+    # One row per amplitude frame sent to /detect-silences.
+    "envelope": {"duration": "<f8", "amplitude": "<f8"},
+}
+
+_HEADER_BYTES = 128  # fixed-size .npy v1.0 header, so appends can rewrite the row count in place
+_SAFE_ID_RE = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}")
+
+
+class FeatureStore:
+    """Per-project columnar signals: one `.npy` file per column, read back memory-mapped.
+
+    Layout: `root/<project>/<table>.<column>.npy` plus `<table>.json`, the
+    manifest holding the schema version, row count and source fingerprint.
+    The manifest is replaced last, so readers never see rows it does not
+    count; a table whose manifest does not match `FEATURE_SCHEMA_VERSION`,
+    `TABLES` or the expected source is treated as absent. Loaded arrays are
+    read-only views of the page cache, shared by every process that opens
+    them. Writers, threads or worker processes, are serialised per project by
+    an OS file lock on `root/<project>.lock`.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def load(self, project_id: str, table: str, source: str | None = None) -> dict | None:
+        """Column name -> read-only array, or None when missing, stale or built from another source."""
+        np = require_numpy("the feature store")
+        manifest = self._manifest(project_id, table)
+        if manifest is None or (source is not None and manifest["source"] != source):
+            return None
+        rows = manifest["rows"]
+        columns = {}
+        for name in TABLES[table]:
+            try:
+                array = np.load(self._column_path(project_id, table, name), mmap_mode="r")
+            except (FileNotFoundError, ValueError):
+                return None
+            if len(array) < rows:
+                return None  # interrupted rewrite
+            columns[name] = array[:rows]
+        return columns
+
+    def write(self, project_id: str, table: str, columns: dict, source: str = "") -> int:
+        """Replace a table. Returns its row count."""
+        arrays = self._arrays(require_numpy("the feature store"), table, columns)
+        with self._writer(project_id):
+            return self._replace(project_id, table, arrays, source)
+
+    def append(self, project_id: str, table: str, columns: dict, source: str = "") -> int:
+        """Add rows at the end of a table (created if missing or stale). Returns the new row count."""
+        arrays = self._arrays(require_numpy("the feature store"), table, columns)
+        added = len(next(iter(arrays.values())))
+        with self._writer(project_id):
+            manifest = self._manifest(project_id, table)
+            if manifest is None or manifest["source"] != source or manifest["rows"] == 0:
+                return self._replace(project_id, table, arrays, source)
+            rows = manifest["rows"]
+            for name, array in arrays.items():
+                with open(self._column_path(project_id, table, name), "r+b") as handle:
+                    # Drop rows a crashed append left past the manifest, then extend.
+                    handle.truncate(_HEADER_BYTES + rows * array.itemsize)
+                    handle.seek(0, os.SEEK_END)
+                    handle.write(array.tobytes())
+                    handle.seek(0)
+                    handle.write(_header(array.dtype.str, rows + added))
+            self._write_manifest(project_id, table, rows + added, source)
+        return rows + added
+
+    def drop(self, project_id: str, table: str | None = None) -> None:
+        """Forget one table (its manifest goes first, the columns are overwritten by the next write) or all."""
+        with self._writer(project_id):
+            if table is None:
+                shutil.rmtree(self._dir(project_id), ignore_errors=True)
+                return
+            self._manifest_path(project_id, table).unlink(missing_ok=True)
+
+    @contextmanager
+    def _writer(self, project_id: str) -> Iterator[None]:
+        # The lock file sits beside the project directory so drop() can remove the latter.
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / f"{self._dir(project_id).name}.lock", "a+b") as handle:
+                _lock_file(handle)
+                try:
+                    yield
+                finally:
+                    _unlock_file(handle)
+
+    def _replace(self, project_id: str, table: str, arrays: dict, source: str) -> int:
+        rows = len(next(iter(arrays.values())))
+        self._dir(project_id).mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            path = self._column_path(project_id, table, name)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as handle:
+                handle.write(_header(array.dtype.str, rows))
+                handle.write(array.tobytes())
+            os.replace(tmp, path)
+        self._write_manifest(project_id, table, rows, source)
+        return rows
+
+    def _arrays(self, np, table: str, columns: dict) -> dict:
+        schema = TABLES[table]
+        missing = set(schema) - set(columns)
+        if missing:
+            raise ValueError(f"missing columns for {table}: {sorted(missing)}")
+        arrays = {name: np.ascontiguousarray(columns[name], dtype=dtype) for name, dtype in schema.items()}
+        if len({len(array) for array in arrays.values()}) > 1:
+            raise ValueError(f"columns of {table} have different lengths")
+        return arrays
+
+    def _manifest(self, project_id: str, table: str) -> dict | None:
+        try:
+            manifest = json.loads(self._manifest_path(project_id, table).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if manifest.get("schema") != FEATURE_SCHEMA_VERSION or manifest.get("columns") != TABLES[table]:
+            return None
+        return manifest
+
+    def _write_manifest(self, project_id: str, table: str, rows: int, source: str) -> None:
+        path = self._manifest_path(project_id, table)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        manifest = {"schema": FEATURE_SCHEMA_VERSION, "rows": rows, "source": source, "columns": TABLES[table]}
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _dir(self, project_id: str) -> Path:
+        if _SAFE_ID_RE.fullmatch(project_id):
+            return self.root / project_id
+        return self.root / hashlib.sha256(project_id.encode()).hexdigest()[:32]
+
+    def _manifest_path(self, project_id: str, table: str) -> Path:
+        return self._dir(project_id) / f"{table}.json"
+
+    def _column_path(self, project_id: str, table: str, column: str) -> Path:
+        return self._dir(project_id) / f"{table}.{column}.npy"
+
+
+def _header(dtype: str, rows: int) -> bytes:
+    """`.npy` v1.0 header padded to `_HEADER_BYTES`, whatever the row count."""
+    text = repr({"descr": dtype, "fortran_order": False, "shape": (rows,)}).encode("latin1")
+    prefix = b"\x93NUMPY\x01\x00" + struct.pack("<H", _HEADER_BYTES - 10)
+    return prefix + text + b" " * (_HEADER_BYTES - len(prefix) - len(text) - 1) + b"\n"
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(handle) -> None:
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)  # gives up after ~10 s
+                return
+            except OSError:
+                continue
+
+    def _unlock_file(handle) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(handle) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(handle) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+NAMESPACES = ("audio", "proxies", "transcripts", "renders")
+
+_STAGING = ".staging"
+_STAGING_MAX_AGE = 3600.0  # leftovers of a crashed writer
+_SAFE_KEY_RE = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}")
+_SUFFIX_RE = re.compile(r"(\.[A-Za-z0-9]{1,10})?")
+
+
+@dataclass
+class _Entry:
+    namespace: str
+    size: int
+    last_used: float
+    pins: int = 0
+
+
+class ScratchSpace:
+    """Intermediate media (audio extracts, proxies, transcripts, renders) under one byte quota.
+
+    Entries live at `root/<namespace>/<key><suffix>`. Writers produce files in
+    a staging directory on the same filesystem and `commit` them with an
+    atomic rename, so an entry is either absent or complete. Committing evicts
+    the least recently used entries until the quota holds again; pinned
+    entries are never evicted, even if that leaves the space over quota.
+    Recency is kept in the files' mtime, so it survives restarts.
+    """
+
+    def __init__(self, root: str, quota_bytes: int) -> None:
+        self.root = Path(root)
+        self.quota_bytes = quota_bytes
+        self.evicted_bytes = 0
+        self._entries: dict[Path, _Entry] | None = None  # scanned on first use
+        self._lock = threading.Lock()
+
+    def path(self, namespace: str, key: str, suffix: str = "") -> Path:
+        if namespace not in NAMESPACES:
+            raise ValueError(f"unknown scratch namespace: {namespace}")
+        if not _SUFFIX_RE.fullmatch(suffix):
+            raise ValueError(f"invalid scratch suffix: {suffix}")
+        if not _SAFE_KEY_RE.fullmatch(key):
+            key = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self.root / namespace / f"{key}{suffix}"
+
+    def lookup(self, namespace: str, key: str, suffix: str = "") -> Path | None:
+        """The entry's path if present, marking it as recently used."""
+        path = self.path(namespace, key, suffix)
+        with self._lock:
+            entry = self._index().get(path)
+            if entry is None:
+                return None
+            if not path.exists():  # removed behind our back
+                del self._entries[path]
+                return None
+            self._touch(path, entry)
+        return path
+
+    @contextmanager
+    def staging(self) -> Iterator[Path]:
+        """A private directory to produce files in before `commit`; removed on exit."""
+        parent = self.root / _STAGING
+        parent.mkdir(parents=True, exist_ok=True)
+        directory = Path(tempfile.mkdtemp(dir=parent))
+        try:
+            yield directory
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def commit(self, namespace: str, key: str, source: str | Path, suffix: str = "") -> Path:
+        """Atomically move a staged file into place (replacing any previous version), then enforce the quota."""
+        path = self.path(namespace, key, suffix)
+        size = Path(source).stat().st_size
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            entries = self._index()
+            os.replace(source, path)
+            previous = entries.get(path)
+            entry = _Entry(namespace, size, time.time(), pins=previous.pins if previous else 0)
+            entries[path] = entry
+            self._evict(self.quota_bytes, keep=path)
+        return path
+
+    def write_bytes(self, namespace: str, key: str, data: bytes, suffix: str = "") -> Path:
+        with self.staging() as directory:
+            staged = directory / f"entry{suffix}"
+            staged.write_bytes(data)
+            return self.commit(namespace, key, staged, suffix)
+
+    @contextmanager
+    def pin(self, namespace: str, key: str, suffix: str = "") -> Iterator[Path]:
+        """Protect an existing entry from eviction while it is in use (reference counted)."""
+        path = self.path(namespace, key, suffix)
+        with self._lock:
+            entry = self._index().get(path)
+            if entry is None:
+                raise KeyError(f"{namespace}/{key}{suffix}")
+            entry.pins += 1
+            self._touch(path, entry)
+        try:
+            yield path
+        finally:
+            with self._lock:
+                entry.pins -= 1
+
+    def remove(self, namespace: str, key: str, suffix: str = "") -> bool:
+        path = self.path(namespace, key, suffix)
+        with self._lock:
+            entry = self._index().get(path)
+            if entry is None or entry.pins:
+                return False
+            del self._entries[path]
+            path.unlink(missing_ok=True)
+        return True
+
+    def evict(self, target_bytes: int | None = None) -> int:
+        """Drop unpinned entries, least recently used first, until at most `target_bytes` are used."""
+        with self._lock:
+            self._index()
+            return self._evict(self.quota_bytes if target_bytes is None else target_bytes)
+
+    def usage(self) -> dict:
+        with self._lock:
+            entries = list(self._index().values())
+        namespaces = {name: {"bytes": 0, "entries": 0} for name in NAMESPACES}
+        for entry in entries:
+            namespaces[entry.namespace]["bytes"] += entry.size
+            namespaces[entry.namespace]["entries"] += 1
+        return {
+            "root": str(self.root),
+            "quota_bytes": self.quota_bytes,
+            "used_bytes": sum(entry.size for entry in entries),
+            "entries": len(entries),
+            "pinned": sum(1 for entry in entries if entry.pins),
+            "evicted_bytes": self.evicted_bytes,
+            "namespaces": namespaces,
+        }
+
+    def _evict(self, target: int, keep: Path | None = None) -> int:
+        used = sum(entry.size for entry in self._entries.values())
+        freed = 0
+        if used <= target:
+            return 0
+        candidates = sorted(
+            (entry.last_used, path) for path, entry in self._entries.items() if not entry.pins and path != keep
+        )
+        for _, path in candidates:
+            if used - freed <= target:
+                break
+            freed += self._entries.pop(path).size
+            path.unlink(missing_ok=True)
+        self.evicted_bytes += freed
+        return freed
+
+    def _touch(self, path: Path, entry: _Entry) -> None:
+        entry.last_used = time.time()
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _index(self) -> dict[Path, _Entry]:
+        """Entries on disk, scanned once; the caller holds the lock."""
+        if self._entries is None:
+            entries: dict[Path, _Entry] = {}
+            for namespace in NAMESPACES:
+                try:
+                    scan = list(os.scandir(self.root / namespace))
+                except FileNotFoundError:
+                    continue
+                for item in scan:
+                    if item.is_file(follow_symlinks=False):
+                        stat = item.stat()
+                        entries[Path(item.path)] = _Entry(namespace, stat.st_size, stat.st_mtime)
+            self._entries = entries
+            self._clear_stale_staging()
+        return self._entries
+
+    def _clear_stale_staging(self) -> None:
+        try:
+            scan = list(os.scandir(self.root / _STAGING))
+        except FileNotFoundError:
+            return
+        cutoff = time.time() - _STAGING_MAX_AGE
+        for item in scan:
+            if item.stat(follow_symlinks=False).st_mtime < cutoff:
+                shutil.rmtree(item.path, ignore_errors=True)
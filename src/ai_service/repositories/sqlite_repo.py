@@ -2,21 +2,60 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
-from ai_service.models.schemas import CloudJob
+from ai_service.core.metrics import registry
+from ai_service.models.schemas import CloudJob, CloudJobSummary, PlatformUpload, TranscriptSegment
+from ai_service.repositories.blob_store import BlobStore
+
+JOB_COLUMNS = (
+    "id, operation, payload, status, result, priority, dedup_key, created_at, updated_at, payload_ref, result_ref"
+)
+UPLOAD_COLUMNS = "id, platform, file_path, title, status, file_size, external_id, error, created_at, updated_at"
+_ARTIFACT_TOUCH_SECONDS = 3600.0  # cache hits write `used_at` back at most this often
 
 
 class SqliteRepository:
-    def __init__(self, db_path: str) -> None:
+    """SQLite persistence; job payloads/results above `inline_limit` bytes of JSON go to a `BlobStore`."""
+
+    def __init__(self, db_path: str, blob_dir: str = "", inline_limit: int = 16 * 1024) -> None:
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.blobs = BlobStore(blob_dir or str(Path(db_path).parent / "blobs"))
+        self.inline_limit = inline_limit
         self._init_schema()
 
     def _connect(self) -> sqlite3.Connection:
         return sqlite3.connect(self.db_path)
 
+    @contextmanager
+    def _immediate(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction taking the lock up front, for read-then-write sequences."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
     def _init_schema(self) -> None:
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            # INCREMENTAL lets the maintenance task give pages back without a full VACUUM.
+            # It applies as is to a new file; an existing one is converted by
+            # `convert_to_incremental_vacuum`, off the start-up path.
+            if not conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        finally:
+            conn.close()
         with self._connect() as conn:
             conn.execute(
                 """
@@ -29,6 +68,123 @@ class SqliteRepository:
                 )
                 """
             )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, ddl in (
+                ("priority", "INTEGER NOT NULL DEFAULT 0"),
+                ("dedup_key", "TEXT"),
+                ("created_at", "REAL NOT NULL DEFAULT 0"),
+                ("updated_at", "REAL NOT NULL DEFAULT 0"),
+                ("payload_ref", "TEXT"),
+                ("result_ref", "TEXT"),
+            ):
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {ddl}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs(dedup_key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, priority DESC, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs(status, updated_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_payload_ref ON jobs(payload_ref) WHERE payload_ref IS NOT NULL"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_result_ref ON jobs(result_ref) WHERE result_ref IS NOT NULL"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS transcript_segments (
+                    id INTEGER PRIMARY KEY,
+                    project_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    start_ms INTEGER NOT NULL,
+                    end_ms INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    speaker TEXT,
+                    UNIQUE(project_id, idx)
+                )
+                """
+            )
+            # External-content FTS5 index kept in sync by triggers, so re-saving a
+            # transcript only re-indexes the rows that changed.
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+                    text,
+                    project_id UNINDEXED,
+                    start_ms UNINDEXED,
+                    end_ms UNINDEXED,
+                    content='transcript_segments',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """
+            )
+            conn.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS transcript_segments_ai AFTER INSERT ON transcript_segments BEGIN
+                    INSERT INTO transcript_fts(rowid, text, project_id, start_ms, end_ms)
+                    VALUES (new.id, new.text, new.project_id, new.start_ms, new.end_ms);
+                END;
+                CREATE TRIGGER IF NOT EXISTS transcript_segments_ad AFTER DELETE ON transcript_segments BEGIN
+                    INSERT INTO transcript_fts(transcript_fts, rowid, text, project_id, start_ms, end_ms)
+                    VALUES ('delete', old.id, old.text, old.project_id, old.start_ms, old.end_ms);
+                END;
+                CREATE TRIGGER IF NOT EXISTS transcript_segments_au AFTER UPDATE ON transcript_segments BEGIN
+                    INSERT INTO transcript_fts(transcript_fts, rowid, text, project_id, start_ms, end_ms)
+                    VALUES ('delete', old.id, old.text, old.project_id, old.start_ms, old.end_ms);
+                    INSERT INTO transcript_fts(rowid, text, project_id, start_ms, end_ms)
+                    VALUES (new.id, new.text, new.project_id, new.start_ms, new.end_ms);
+                END;
+                """
+            )
+            # Resumable platform uploads: one row per byte range, so a restarted
+            # upload only sends the chunks the platform has not acknowledged.
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS platform_uploads (
+                    id TEXT PRIMARY KEY,
+                    platform TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    file_size INTEGER NOT NULL,
+                    chunk_size INTEGER NOT NULL,
+                    session_url TEXT NOT NULL DEFAULT '',
+                    external_id TEXT NOT NULL DEFAULT '',
+                    error TEXT NOT NULL DEFAULT '',
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_platform_uploads_status ON platform_uploads(status)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS platform_upload_chunks (
+                    upload_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    start INTEGER NOT NULL,
+                    end INTEGER NOT NULL,
+                    done INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY(upload_id, idx)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pipeline_artifacts (
+                    key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    output TEXT NOT NULL
+                )
+                """
+            )
+            if "used_at" not in {row[1] for row in conn.execute("PRAGMA table_info(pipeline_artifacts)")}:
+                conn.execute("ALTER TABLE pipeline_artifacts ADD COLUMN used_at REAL NOT NULL DEFAULT 0")
+                # Rows from before the column start a fresh retention window.
+                conn.execute("UPDATE pipeline_artifacts SET used_at=?", (time.time(),))
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_artifacts_used ON pipeline_artifacts(used_at)")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS analytics_events (
@@ -39,42 +195,476 @@ class SqliteRepository:
                 """
             )
 
+    @registry.timed("sqlite_op_seconds", op="save_job")
     def save_job(self, job: CloudJob) -> None:
+        job.updated_at = time.time()
+        if not job.created_at:
+            job.created_at = job.updated_at
         with self._connect() as conn:
             conn.execute(
-                """
-                INSERT INTO jobs(id, operation, payload, status, result)
-                VALUES(?,?,?,?,?)
+                f"""
+                INSERT INTO jobs({JOB_COLUMNS})
+                VALUES(?,?,?,?,?,?,?,?,?,?,?)
                 ON CONFLICT(id) DO UPDATE SET
                   operation=excluded.operation,
                   payload=excluded.payload,
                   status=excluded.status,
-                  result=excluded.result
+                  result=excluded.result,
+                  priority=excluded.priority,
+                  dedup_key=excluded.dedup_key,
+                  updated_at=excluded.updated_at,
+                  payload_ref=excluded.payload_ref,
+                  result_ref=excluded.result_ref
                 """,
-                (
-                    job.id,
-                    job.operation,
-                    json.dumps(job.payload, ensure_ascii=False),
-                    job.status,
-                    json.dumps(job.result, ensure_ascii=False) if job.result is not None else None,
-                ),
+                self._job_row(job),
             )
 
+    @registry.timed("sqlite_op_seconds", op="update_job_status")
+    def update_job_status(self, job_id: str, status: str) -> float:
+        """Status-only change: touches neither the payload nor the result. Returns `updated_at`."""
+        updated_at = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute("UPDATE jobs SET status=?, updated_at=? WHERE id=?", (status, updated_at, job_id))
+        if cursor.rowcount == 0:
+            raise KeyError(job_id)
+        return updated_at
+
+    @registry.timed("sqlite_op_seconds", op="finish_job")
+    def finish_job(self, job_id: str, status: str, result: dict | None) -> float:
+        """Store the outcome of a job without rewriting its payload. Returns `updated_at`."""
+        result_text, result_ref = self._encode(result)
+        updated_at = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status=?, result=?, result_ref=?, updated_at=? WHERE id=?",
+                (status, result_text, result_ref, updated_at, job_id),
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(job_id)
+        return updated_at
+
+    @registry.timed("sqlite_op_seconds", op="get_job")
     def get_job(self, job_id: str) -> CloudJob:
         with self._connect() as conn:
-            row = conn.execute(
-                "SELECT id, operation, payload, status, result FROM jobs WHERE id=?", (job_id,)
-            ).fetchone()
+            row = conn.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id=?", (job_id,)).fetchone()
         if row is None:
             raise KeyError(job_id)
+        return self._job_from_row(row)
+
+    @registry.timed("sqlite_op_seconds", op="enqueue_job")
+    def enqueue_job(self, job: CloudJob) -> tuple[CloudJob, bool]:
+        """Insert `job` unless a live job with the same dedup key exists.
+
+        Returns the stored job and whether it was created. Failed jobs are not
+        reused so that a retry enqueues a fresh attempt.
+        """
+        job.created_at = job.updated_at = time.time()
+        with self._immediate() as conn:
+            if job.dedup_key:
+                row = conn.execute(
+                    f"""
+                    SELECT {JOB_COLUMNS} FROM jobs
+                    WHERE dedup_key=? AND status != 'failed'
+                    ORDER BY created_at DESC LIMIT 1
+                    """,
+                    (job.dedup_key,),
+                ).fetchone()
+                if row is not None:
+                    return self._job_from_row(row), False
+            conn.execute(f"INSERT INTO jobs({JOB_COLUMNS}) VALUES(?,?,?,?,?,?,?,?,?,?,?)", self._job_row(job))
+        return job, True
+
+    @registry.timed("sqlite_op_seconds", op="claim_next_job")
+    def claim_next_job(self) -> CloudJob | None:
+        """Atomically move the highest-priority, oldest queued job to `processing`."""
+        with self._immediate() as conn:
+            row = conn.execute(
+                f"""
+                SELECT {JOB_COLUMNS} FROM jobs
+                WHERE status='queued'
+                ORDER BY priority DESC, created_at ASC LIMIT 1
+                """
+            ).fetchone()
+            if row is None:
+                return None
+            job = self._job_from_row(row)
+            job.status = "processing"
+            job.updated_at = time.time()
+            conn.execute(
+                "UPDATE jobs SET status=?, updated_at=? WHERE id=?", (job.status, job.updated_at, job.id)
+            )
+        return job
+
+    @registry.timed("sqlite_op_seconds", op="list_jobs")
+    def list_jobs(
+        self,
+        status: str | None = None,
+        limit: int = 50,
+        before: tuple[float, str] | None = None,
+    ) -> list[CloudJobSummary]:
+        """Newest first, keyset-paginated on (created_at, id); payloads are not read."""
+        clauses: list[str] = []
+        args: list = []
+        if status:
+            clauses.append("status=?")
+            args.append(status)
+        if before is not None:
+            clauses.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            args.extend([before[0], before[0], before[1]])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT id, operation, status, priority, created_at, updated_at FROM jobs
+                {where}
+                ORDER BY created_at DESC, id DESC LIMIT ?
+                """,
+                (*args, limit),
+            ).fetchall()
+        return [
+            CloudJobSummary(
+                id=row[0], operation=row[1], status=row[2], priority=row[3], created_at=row[4], updated_at=row[5]
+            )
+            for row in rows
+        ]
+
+    @registry.timed("sqlite_op_seconds", op="delete_expired_jobs")
+    def delete_expired_jobs(
+        self,
+        updated_before: float,
+        statuses: tuple[str, ...] = ("done", "failed"),
+        batch_size: int = 500,
+    ) -> int:
+        """Delete finished jobs in small batches so writers are never blocked for long.
+
+        Blobs that no remaining job references are removed afterwards.
+        """
+        marks = ",".join("?" for _ in statuses)
+        deleted = 0
+        refs: set[str] = set()
+        while True:
+            # SELECT then DELETE rather than DELETE ... RETURNING, which needs SQLite 3.35.
+            with self._immediate() as conn:
+                rows = conn.execute(
+                    f"SELECT id, payload_ref, result_ref FROM jobs WHERE status IN ({marks}) AND updated_at < ? LIMIT ?",
+                    (*statuses, updated_before, batch_size),
+                ).fetchall()
+                conn.executemany("DELETE FROM jobs WHERE id=?", [(row[0],) for row in rows])
+            deleted += len(rows)
+            refs.update(ref for row in rows for ref in row[1:] if ref)
+            if len(rows) < batch_size:
+                break
+        self._discard_unreferenced(refs)
+        return deleted
+
+    def _discard_unreferenced(self, refs: set[str]) -> None:
+        with self._connect() as conn:
+            for ref in refs:
+                in_use = conn.execute(
+                    "SELECT 1 FROM jobs WHERE payload_ref=? UNION ALL SELECT 1 FROM jobs WHERE result_ref=? LIMIT 1",
+                    (ref, ref),
+                ).fetchone()
+                if in_use is None:
+                    self.blobs.discard(ref)
+
+    @registry.timed("sqlite_op_seconds", op="convert_incremental_vacuum")
+    def convert_to_incremental_vacuum(self) -> bool:
+        """One full VACUUM switching a database created before incremental mode; False if already done."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+        finally:
+            conn.close()
+
+    @registry.timed("sqlite_op_seconds", op="incremental_vacuum")
+    def incremental_vacuum(self, max_pages: int = 2000) -> int:
+        """Release up to `max_pages` free pages to the filesystem; returns the free pages left."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute(f"PRAGMA incremental_vacuum({int(max_pages)})").fetchall()
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+        finally:
+            conn.close()
+
+    def _encode(self, value: object) -> tuple[str | None, str | None]:
+        """(inline JSON, blob reference): large values leave the row and only their reference stays."""
+        if value is None:
+            return None, None
+        text = json.dumps(value, ensure_ascii=False)
+        if len(text) <= self.inline_limit:
+            return text, None
+        return "", self.blobs.put(text.encode("utf-8"))
+
+    def _decode(self, text: str | None, ref: str | None) -> object:
+        if ref:
+            return json.loads(self.blobs.get(ref))
+        return json.loads(text) if text else None
+
+    def _job_row(self, job: CloudJob) -> tuple:
+        payload, payload_ref = self._encode(job.payload)
+        result, result_ref = self._encode(job.result)
+        return (
+            job.id,
+            job.operation,
+            payload,
+            job.status,
+            result,
+            job.priority,
+            job.dedup_key or None,
+            job.created_at,
+            job.updated_at,
+            payload_ref,
+            result_ref,
+        )
+
+    def _job_from_row(self, row: tuple) -> CloudJob:
         return CloudJob(
             id=row[0],
             operation=row[1],
-            payload=json.loads(row[2]),
+            payload=self._decode(row[2], row[9]),
             status=row[3],
-            result=json.loads(row[4]) if row[4] else None,
+            result=self._decode(row[4], row[10]),
+            priority=row[5],
+            dedup_key=row[6] or "",
+            created_at=row[7],
+            updated_at=row[8],
+        )
+
+    @registry.timed("sqlite_op_seconds", op="save_transcript")
+    def save_transcript(self, project_id: str, segments: list[TranscriptSegment]) -> int:
+        """Store a project's transcript, writing only new, edited or removed segments. Returns rows changed."""
+        rows = [
+            (idx, round(seg.start * 1000), round(seg.end * 1000), seg.text, seg.confidence, seg.speaker)
+            for idx, seg in enumerate(segments)
+        ]
+        with self._immediate() as conn:
+            existing = {
+                row[0]: row
+                for row in conn.execute(
+                    "SELECT idx, start_ms, end_ms, text, confidence, speaker FROM transcript_segments WHERE project_id=?",
+                    (project_id,),
+                )
+            }
+            changed = [row for row in rows if existing.get(row[0]) != row]
+            conn.executemany(
+                """
+                INSERT INTO transcript_segments(project_id, idx, start_ms, end_ms, text, confidence, speaker)
+                VALUES(?,?,?,?,?,?,?)
+                ON CONFLICT(project_id, idx) DO UPDATE SET
+                  start_ms=excluded.start_ms,
+                  end_ms=excluded.end_ms,
+                  text=excluded.text,
+                  confidence=excluded.confidence,
+                  speaker=excluded.speaker
+                """,
+                [(project_id, *row) for row in changed],
+            )
+            removed = conn.execute(
+                "DELETE FROM transcript_segments WHERE project_id=? AND idx>=?", (project_id, len(rows))
+            ).rowcount
+        return len(changed) + removed
+
+    @registry.timed("sqlite_op_seconds", op="get_transcript")
+    def get_transcript(self, project_id: str) -> list[TranscriptSegment]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT start_ms, end_ms, text, confidence, speaker FROM transcript_segments
+                WHERE project_id=? ORDER BY idx
+                """,
+                (project_id,),
+            ).fetchall()
+        return [
+            TranscriptSegment(start=row[0] / 1000, end=row[1] / 1000, text=row[2], confidence=row[3], speaker=row[4])
+            for row in rows
+        ]
+
+    @registry.timed("sqlite_op_seconds", op="search_segments")
+    def search_segments(self, match: str, project_id: str | None = None, limit: int = 20) -> list[tuple]:
+        """(project_id, start_ms, end_ms, text, snippet, bm25) rows, best match first."""
+        where = "transcript_fts MATCH ?"
+        args: list = [match]
+        if project_id:
+            where += " AND project_id=?"
+            args.append(project_id)
+        with self._connect() as conn:
+            return conn.execute(
+                f"""
+                SELECT project_id, start_ms, end_ms, text,
+                       snippet(transcript_fts, 0, '[', ']', '…', 12), bm25(transcript_fts)
+                FROM transcript_fts
+                WHERE {where}
+                ORDER BY bm25(transcript_fts) LIMIT ?
+                """,
+                (*args, limit),
+            ).fetchall()
+
+    @registry.timed("sqlite_op_seconds", op="create_upload")
+    def create_upload(self, upload: PlatformUpload, chunk_size: int, chunks: list[tuple[int, int]]) -> None:
+        """Store a new upload and its [start, end) byte ranges."""
+        upload.created_at = upload.updated_at = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO platform_uploads({UPLOAD_COLUMNS}, chunk_size) VALUES(?,?,?,?,?,?,?,?,?,?,?)",
+                (
+                    upload.id,
+                    upload.platform,
+                    upload.file_path,
+                    upload.title,
+                    upload.status,
+                    upload.total_bytes,
+                    upload.external_id,
+                    upload.error,
+                    upload.created_at,
+                    upload.updated_at,
+                    chunk_size,
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO platform_upload_chunks(upload_id, idx, start, end) VALUES(?,?,?,?)",
+                [(upload.id, idx, start, end) for idx, (start, end) in enumerate(chunks)],
+            )
+
+    @registry.timed("sqlite_op_seconds", op="get_upload")
+    def get_upload(self, upload_id: str) -> PlatformUpload:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT {UPLOAD_COLUMNS},
+                       (SELECT COALESCE(SUM(end - start), 0) FROM platform_upload_chunks
+                        WHERE upload_id=platform_uploads.id AND done=1)
+                FROM platform_uploads WHERE id=?
+                """,
+                (upload_id,),
+            ).fetchone()
+        if row is None:
+            raise KeyError(upload_id)
+        return PlatformUpload(
+            id=row[0],
+            platform=row[1],
+            file_path=row[2],
+            title=row[3],
+            status=row[4],
+            total_bytes=row[5],
+            external_id=row[6],
+            error=row[7],
+            created_at=row[8],
+            updated_at=row[9],
+            bytes_sent=row[10],
         )
 
+    @registry.timed("sqlite_op_seconds", op="get_upload_session")
+    def get_upload_session(self, upload_id: str) -> tuple[str, int]:
+        """(session_url, chunk_size); the session URL is a bearer capability and stays server-side."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT session_url, chunk_size FROM platform_uploads WHERE id=?", (upload_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(upload_id)
+        return row[0], row[1]
+
+    @registry.timed("sqlite_op_seconds", op="set_upload_session")
+    def set_upload_session(self, upload_id: str, session_url: str, external_id: str = "") -> None:
+        """Record a new upload session; every chunk is pending again against it."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE platform_uploads SET session_url=?, external_id=?, updated_at=? WHERE id=?",
+                (session_url, external_id, time.time(), upload_id),
+            )
+            conn.execute("UPDATE platform_upload_chunks SET done=0 WHERE upload_id=?", (upload_id,))
+
+    @registry.timed("sqlite_op_seconds", op="update_upload_status")
+    def update_upload_status(
+        self, upload_id: str, status: str, error: str = "", external_id: str | None = None
+    ) -> float:
+        updated_at = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE platform_uploads SET status=?, error=?, external_id=COALESCE(?, external_id), updated_at=?
+                WHERE id=?
+                """,
+                (status, error, external_id, updated_at, upload_id),
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(upload_id)
+        return updated_at
+
+    @registry.timed("sqlite_op_seconds", op="pending_upload_chunks")
+    def pending_upload_chunks(self, upload_id: str) -> list[tuple[int, int, int]]:
+        """(idx, start, end) of the chunks not yet acknowledged, in file order."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT idx, start, end FROM platform_upload_chunks WHERE upload_id=? AND done=0 ORDER BY idx",
+                (upload_id,),
+            ).fetchall()
+
+    @registry.timed("sqlite_op_seconds", op="mark_upload_chunk")
+    def mark_upload_chunk(self, upload_id: str, idx: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE platform_upload_chunks SET done=1 WHERE upload_id=? AND idx=?", (upload_id, idx)
+            )
+
+    @registry.timed("sqlite_op_seconds", op="sync_upload_offset")
+    def sync_upload_offset(self, upload_id: str, committed: int) -> None:
+        """Align chunk state with a server that reports the first `committed` bytes as received."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE platform_upload_chunks SET done=(end <= ?) WHERE upload_id=?", (committed, upload_id)
+            )
+
+    @registry.timed("sqlite_op_seconds", op="list_upload_ids")
+    def list_upload_ids(self, statuses: tuple[str, ...]) -> list[str]:
+        marks = ",".join("?" * len(statuses))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id FROM platform_uploads WHERE status IN ({marks}) ORDER BY created_at", statuses
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    @registry.timed("sqlite_op_seconds", op="save_artifact")
+    def save_artifact(self, key: str, stage: str, output: object) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pipeline_artifacts(key, stage, output, used_at) VALUES(?,?,?,?)",
+                (key, stage, json.dumps(output, ensure_ascii=False), time.time()),
+            )
+
+    @registry.timed("sqlite_op_seconds", op="get_artifact")
+    def get_artifact(self, key: str) -> object | None:
+        """The stored output, or None. A hit refreshes `used_at` at most once per `_ARTIFACT_TOUCH_SECONDS`."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT output, used_at FROM pipeline_artifacts WHERE key=?", (key,)).fetchone()
+            if row is not None and row[1] < now - _ARTIFACT_TOUCH_SECONDS:
+                conn.execute("UPDATE pipeline_artifacts SET used_at=? WHERE key=?", (now, key))
+        return json.loads(row[0]) if row else None
+
+    @registry.timed("sqlite_op_seconds", op="delete_stale_artifacts")
+    def delete_stale_artifacts(self, used_before: float, batch_size: int = 500) -> int:
+        """Delete artifacts last used before `used_before`, in small batches like `delete_expired_jobs`.
+
+        Keys embed the source fingerprint (path, size, mtime), so a moved or
+        re-encoded file leaves its old rows unreachable; age is what frees them.
+        """
+        deleted = 0
+        while True:
+            with self._immediate() as conn:
+                keys = conn.execute(
+                    "SELECT key FROM pipeline_artifacts WHERE used_at < ? LIMIT ?", (used_before, batch_size)
+                ).fetchall()
+                conn.executemany("DELETE FROM pipeline_artifacts WHERE key=?", keys)
+            deleted += len(keys)
+            if len(keys) < batch_size:
+                return deleted
+
+    @registry.timed("sqlite_op_seconds", op="store_event")
     def store_event(self, name: str, properties: dict) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -82,6 +672,17 @@ class SqliteRepository:
                 (name, json.dumps(properties, ensure_ascii=False)),
             )
 
+    @registry.timed("sqlite_op_seconds", op="store_events")
+    def store_events(self, events: list[tuple[str, dict]]) -> None:
+        if not events:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO analytics_events(name, properties) VALUES(?, ?)",
+                [(name, json.dumps(properties, ensure_ascii=False)) for name, properties in events],
+            )
+
+    @registry.timed("sqlite_op_seconds", op="list_events")
     def list_events(self) -> list[dict]:
         with self._connect() as conn:
             rows = conn.execute("SELECT name, properties FROM analytics_events ORDER BY id ASC").fetchall()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import shutil
+import statistics
+import subprocess
+from pathlib import Path
+
+from ai_service.core.metrics import registry
+from ai_service.core.optional import require_numpy
+from ai_service.models.schemas import AudioFeatures, TranscriptSegment
+
+
+class AudioFeatureService:
+    """Per-segment signals for the viral scorer, computed from the media instead of the client.
+
+    The audio track is decoded once to mono 16-bit PCM on ffmpeg's stdout and
+    reduced on the fly to an RMS envelope of `window` seconds.
+    """
+
+    def __init__(self, ffmpeg_bin: str = "ffmpeg", sample_rate: int = 16000, window: float = 0.05) -> None:
+        self.ffmpeg_bin = ffmpeg_bin
+        self.sample_rate = sample_rate
+        self.window = window
+
+    def is_available(self) -> bool:
+        return shutil.which(self.ffmpeg_bin) is not None
+
+    def extract(self, media_path: str, transcript: list[TranscriptSegment]) -> AudioFeatures:
+        envelope = self.loudness_envelope(media_path)
+        return AudioFeatures(
+            audio_peaks=self.segment_peaks(envelope, transcript),
+            speech_rates=self.speech_rates(transcript),
+        )
+
+    def loudness_envelope(self, media_path: str):
+        """RMS of every `window` of the audio track, as a float32 array."""
+        np = require_numpy("audio feature extraction")
+        if not Path(media_path).exists():
+            raise FileNotFoundError(media_path)
+        if not self.is_available():
+            raise RuntimeError("ffmpeg is not available in PATH")
+
+        cmd = [
+            self.ffmpeg_bin,
+            "-nostdin",
+            "-v",
+            "error",
+            "-i",
+            media_path,
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            str(self.sample_rate),
+            "-f",
+            "s16le",
+            "-",
+        ]
+        frame = max(1, int(self.sample_rate * self.window))
+        chunk_bytes = frame * 2 * 200  # 200 windows per read
+        windows: list = []
+        carry = b""
+        with registry.span("subprocess_seconds", binary="ffmpeg"):
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            assert proc.stdout is not None
+            while True:
+                data = proc.stdout.read(chunk_bytes)
+                if not data:
+                    break
+                data = carry + data
+                usable = len(data) - len(data) % (frame * 2)
+                carry = data[usable:]
+                if usable:
+                    samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+                    windows.append(np.sqrt(np.mean(samples.reshape(-1, frame) ** 2, axis=1)))
+            stderr = proc.stderr.read().decode(errors="replace") if proc.stderr is not None else ""
+            returncode = proc.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg audio decode failed: {stderr.strip()}")
+        if carry:
+            tail = np.frombuffer(carry[: len(carry) - len(carry) % 2], dtype="<i2").astype(np.float32) / 32768.0
+            if tail.size:
+                windows.append(np.array([np.sqrt(np.mean(tail**2))], dtype=np.float32))
+        return np.concatenate(windows) if windows else np.zeros(0, dtype=np.float32)
+
+    def segment_peaks(self, envelope, transcript: list[TranscriptSegment]) -> list[float]:
+        """Loudest window of each segment, scaled to [0, 1] between the 10th and 99th percentile in dB."""
+        np = require_numpy("audio feature extraction")
+        if not transcript:
+            return []
+        if len(envelope) == 0:
+            return [0.0] * len(transcript)
+        db = 20 * np.log10(np.maximum(envelope, 1e-5))
+        starts = np.fromiter((seg.start for seg in transcript), dtype=np.float64, count=len(transcript))
+        ends = np.fromiter((seg.end for seg in transcript), dtype=np.float64, count=len(transcript))
+
+        # Window i covers [i * window, (i + 1) * window): map every segment to a [lo, hi) window range.
+        edges = np.arange(len(db)) * self.window
+        lo = np.clip(np.searchsorted(edges, starts, side="right") - 1, 0, len(db) - 1)
+        hi = np.clip(np.maximum(np.searchsorted(edges, ends, side="left"), lo + 1), 1, len(db))
+        bounds = np.empty(2 * len(transcript), dtype=np.intp)
+        bounds[0::2], bounds[1::2] = lo, hi
+        # reduceat over [lo, hi) pairs; the sentinel makes hi == len(db) a valid index.
+        peak_db = np.maximum.reduceat(np.append(db, db.min()), bounds)[0::2]
+
+        floor, ceiling = np.percentile(db, [10, 99])
+        if ceiling - floor < 1e-6:
+            return [0.5] * len(transcript)
+        return np.round(np.clip((peak_db - floor) / (ceiling - floor), 0.0, 1.0), 3).tolist()
+
+    @staticmethod
+    def speech_rates(transcript: list[TranscriptSegment]) -> list[float]:
+        """Words per second of each segment relative to the median: 0.5 is a typical pace, 1.0 twice as fast."""
+        rates = [len(seg.text.split()) / max(seg.end - seg.start, 0.1) for seg in transcript]
+        typical = statistics.median([rate for rate in rates if rate > 0] or [0.0])
+        if typical <= 0:
+            return [0.5] * len(transcript)
+        return [round(min(1.0, 0.5 * rate / typical), 3) for rate in rates]
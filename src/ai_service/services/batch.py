@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator
+
+from ai_service.models.schemas import AnalyticsEvent, BatchItemResult, BatchOperation
+from ai_service.services.cloud import AnalyticsService
+
+BatchHandler = Callable[[dict], tuple[dict, AnalyticsEvent | None]]
+
+
+class BatchService:
+    """Runs heterogeneous operations on a shared pool, isolating failures per item."""
+
+    def __init__(self, analytics: AnalyticsService, max_workers: int = 4, max_items: int = 500) -> None:
+        self.analytics = analytics
+        self.max_workers = max_workers
+        self.max_items = max_items
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def run(self, operations: list[BatchOperation], handlers: dict[str, BatchHandler]) -> Iterator[BatchItemResult]:
+        """Yield item results in completion order; analytics are written once at the end."""
+        if len(operations) > self.max_items:
+            raise ValueError(f"batch too large: {len(operations)} > {self.max_items}")
+
+        executor = self._pool()
+        futures: list[Future] = [executor.submit(self._run_one, op, handlers) for op in operations]
+        events: list[AnalyticsEvent] = []
+        failed = 0
+        try:
+            for future in as_completed(futures):
+                item, event = future.result()
+                if event is not None:
+                    events.append(event)
+                if item.status == "error":
+                    failed += 1
+                yield item
+        finally:
+            # Client went away mid-stream: drop what has not started yet.
+            for future in futures:
+                future.cancel()
+            events.append(AnalyticsEvent(name="batch_done", properties={"items": len(operations), "failed": failed}))
+            self.analytics.track_many(events)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="monteur-batch")
+            return self._executor
+
+    @staticmethod
+    def _run_one(op: BatchOperation, handlers: dict[str, BatchHandler]) -> tuple[BatchItemResult, AnalyticsEvent | None]:
+        started = time.perf_counter()
+        handler = handlers.get(op.operation)
+        if handler is None:
+            item = BatchItemResult(id=op.id, operation=op.operation, status="error", error="unknown_operation")
+            return item, None
+        try:
+            result, event = handler(op.payload)
+        except Exception as exc:  # isolate: one bad item never fails the batch
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+            item = BatchItemResult(
+                id=op.id,
+                operation=op.operation,
+                status="error",
+                error=f"{type(exc).__name__}: {exc}",
+                elapsed_ms=elapsed_ms,
+            )
+            return item, None
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        return BatchItemResult(id=op.id, operation=op.operation, status="ok", result=result, elapsed_ms=elapsed_ms), event
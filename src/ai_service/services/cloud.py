@@ -1,32 +1,141 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import http.client
+import json
+import logging
+import threading
+import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 
-from ai_service.models.schemas import AnalyticsEvent, CloudJob, ExportPlatformResponse
+from ai_service.core.metrics import registry
+from ai_service.models.schemas import (
+    AnalyticsEvent,
+    CloudJob,
+    CloudJobListResponse,
+    ExportPlatformResponse,
+    PlatformUpload,
+)
 from ai_service.repositories.sqlite_repo import SqliteRepository
+from ai_service.services.platform_upload import ChunkAck, ConnectionPool, SessionExpired, UploadError, UploadProtocol
+
+logger = logging.getLogger("ai_service.cloud")
 
 
 class CloudJobService:
-    def __init__(self, repository: SqliteRepository) -> None:
+    def __init__(self, repository: SqliteRepository, poll_interval: float = 2.0) -> None:
         self.repository = repository
+        self.poll_interval = poll_interval
+        self._changed = threading.Condition()
+        self._async_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
 
-    def enqueue(self, operation: str, payload: dict) -> CloudJob:
-        job = CloudJob(id=str(uuid.uuid4()), operation=operation, payload=payload, status="queued")
-        self.repository.save_job(job)
-        return job
+    @staticmethod
+    def dedup_key(operation: str, payload: dict) -> str:
+        canonical = json.dumps([operation, payload], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def enqueue(self, operation: str, payload: dict, priority: int = 0) -> tuple[CloudJob, bool]:
+        """Return the job and whether it was newly created (False: existing job reused)."""
+        job = CloudJob(
+            id=str(uuid.uuid4()),
+            operation=operation,
+            payload=payload,
+            status="queued",
+            priority=priority,
+            dedup_key=self.dedup_key(operation, payload),
+        )
+        stored, created = self.repository.enqueue_job(job)
+        if created:
+            self._notify()
+        return stored, created
 
     def process(self, job_id: str) -> CloudJob:
         job = self.repository.get_job(job_id)
         job.status = "processing"
-        self.repository.save_job(job)
+        job.updated_at = self.repository.update_job_status(job.id, job.status)
+        self._notify()
+        return self._run(job)
+
+    def process_next(self) -> CloudJob | None:
+        """Claim the highest-priority queued job and run it."""
+        job = self.repository.claim_next_job()
+        if job is None:
+            return None
+        self._notify()
+        return self._run(job)
+
+    def get(self, job_id: str) -> CloudJob:
+        return self.repository.get_job(job_id)
+
+    def list(self, status: str | None = None, limit: int = 50, cursor: str | None = None) -> CloudJobListResponse:
+        before = None
+        if cursor:
+            created_at, _, job_id = cursor.partition("|")
+            before = (float(created_at), job_id)  # ValueError on a forged cursor
+        jobs = self.repository.list_jobs(status=status, limit=limit, before=before)
+        next_cursor = f"{jobs[-1].created_at!r}|{jobs[-1].id}" if len(jobs) == limit else None
+        return CloudJobListResponse(jobs=jobs, next_cursor=next_cursor)
+
+    def wait(self, job_id: str, status: str | None = None, timeout: float = 30.0) -> CloudJob:
+        """Block until the job leaves `status` (default: its current status) or `timeout` elapses.
+
+        Changes made in this process wake waiters immediately; the periodic
+        re-read covers jobs updated by another process sharing the database.
+        """
+        job = self.repository.get_job(job_id)
+        status = status or job.status
+        deadline = time.monotonic() + timeout
+        while job.status == status:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            with self._changed:
+                self._changed.wait(min(remaining, self.poll_interval))
+            job = self.repository.get_job(job_id)
+        return job
+
+    async def wait_async(self, job_id: str, status: str | None = None, timeout: float = 30.0) -> CloudJob:
+        """`wait` for the event loop: no thread is held while waiting, only during the short reads."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            # Registered before the read, so a change right after it still wakes us.
+            waiter = (loop, asyncio.Event())
+            with self._changed:
+                self._async_waiters.add(waiter)
+            try:
+                job = await asyncio.to_thread(self.repository.get_job, job_id)
+                status = status or job.status
+                remaining = deadline - loop.time()
+                if job.status != status or remaining <= 0:
+                    return job
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), min(remaining, self.poll_interval))
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                with self._changed:
+                    self._async_waiters.discard(waiter)
+
+    def _run(self, job: CloudJob) -> CloudJob:
         job.result = {"ok": True, "operation": job.operation, "insights": "processed"}
         job.status = "done"
-        self.repository.save_job(job)
+        job.updated_at = self.repository.finish_job(job.id, job.status, job.result)
+        self._notify()
         return job
 
-    def get(self, job_id: str) -> CloudJob:
-        return self.repository.get_job(job_id)
+    def _notify(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # loop already closed
+                pass
 
 
 class AnalyticsService:
@@ -37,12 +146,277 @@ class AnalyticsService:
         self.repository.store_event(name, properties)
         return AnalyticsEvent(name=name, properties=properties)
 
+    def track_many(self, events: list[AnalyticsEvent]) -> None:
+        """Record several events in a single transaction."""
+        self.repository.store_events([(event.name, event.properties) for event in events])
+
     def dump(self) -> list[dict]:
         return self.repository.list_events()
 
 
+class UploadInterrupted(Exception):
+    """The service is shutting down; the upload stays queued and resumes at the next start."""
+
+
 class PlatformExportService:
+    """Background, resumable uploads of rendered files to the publishing platforms.
+
+    A file is cut into byte ranges recorded in SQLite and each range is marked
+    as soon as the platform acknowledges it, so an upload interrupted by a
+    network failure or a restart resumes where it stopped. Uploads run on
+    `workers` threads; protocols that accept out-of-order chunks get up to
+    `streams` chunks in flight per upload. Every platform has its own pool of
+    `pool_size` keep-alive connections.
+    """
+
+    def __init__(
+        self,
+        repository: SqliteRepository,
+        protocols: dict[str, UploadProtocol],
+        chunk_size: int = 8 * 1024 * 1024,
+        streams: int = 4,
+        pool_size: int = 4,
+        workers: int = 2,
+        retries: int = 3,
+        retry_backoff: float = 1.0,
+    ) -> None:
+        self.repository = repository
+        self.protocols = protocols
+        self.chunk_size = chunk_size
+        self.streams = max(1, streams)
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.workers = workers
+        self.pools = {platform: ConnectionPool(pool_size) for platform in protocols}
+        self._executor: ThreadPoolExecutor | None = None
+        self._running: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
     def export(self, platform: str, file_path: str, title: str) -> ExportPlatformResponse:
-        token = hashlib.sha1(f"{platform}:{file_path}:{title}".encode()).hexdigest()[:12]
-        external_id = f"{platform}_{token}"
-        return ExportPlatformResponse(platform=platform, status="queued", external_id=external_id)
+        """Queue an upload; raises UploadError (platform not configured), FileNotFoundError
+        or ValueError before anything is stored."""
+        protocol = self.protocols[platform]
+        protocol.check_configured()
+        size = Path(file_path).stat().st_size
+        if size == 0:
+            raise ValueError("empty file")
+        chunk_size = protocol.chunk_size(self.chunk_size)
+        upload = PlatformUpload(
+            id=str(uuid.uuid4()),
+            platform=platform,
+            file_path=file_path,
+            title=title,
+            status="queued",
+            total_bytes=size,
+        )
+        self.repository.create_upload(upload, chunk_size, protocol.chunk_layout(size, chunk_size))
+        self._submit(upload.id)
+        return ExportPlatformResponse(platform=platform, status="queued", external_id="", upload_id=upload.id)
+
+    def get(self, upload_id: str) -> PlatformUpload:
+        return self.repository.get_upload(upload_id)
+
+    def resume(self, upload_id: str) -> PlatformUpload:
+        """Restart a failed or interrupted upload from its last acknowledged chunk."""
+        upload = self.repository.get_upload(upload_id)
+        with self._lock:
+            running = upload_id in self._running
+        if upload.status == "done" or running:
+            return upload
+        upload.status, upload.error = "queued", ""
+        upload.updated_at = self.repository.update_upload_status(upload_id, "queued")
+        self._submit(upload_id)
+        return upload
+
+    def resume_pending(self) -> int:
+        """Requeue uploads a previous process left unfinished."""
+        ids = self.repository.list_upload_ids(("queued", "uploading"))
+        return sum(self._submit(upload_id) for upload_id in ids)
+
+    def wait(self, upload_id: str, timeout: float | None = None) -> PlatformUpload:
+        with self._lock:
+            future = self._running.get(upload_id)
+        if future is not None:
+            future.result(timeout)
+        return self.repository.get_upload(upload_id)
+
+    def shutdown(self) -> None:
+        """Stop after the chunks in flight; interrupted uploads stay queued for `resume_pending`."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            self._stopping.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._stopping.clear()
+            with self._lock:
+                self._running.clear()  # cancelled futures never reached _run
+        for pool in self.pools.values():
+            pool.close()
+
+    def _submit(self, upload_id: str) -> bool:
+        with self._lock:
+            if upload_id in self._running:
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="monteur-upload")
+            self._running[upload_id] = self._executor.submit(self._run, upload_id)
+        return True
+
+    def _run(self, upload_id: str) -> None:
+        try:
+            self._run_upload(upload_id)
+        finally:
+            with self._lock:
+                self._running.pop(upload_id, None)
+
+    def _run_upload(self, upload_id: str) -> None:
+        upload = self.repository.get_upload(upload_id)
+        self.repository.update_upload_status(upload_id, "uploading")
+        try:
+            with registry.span("service_call_seconds", service=f"platform.upload.{upload.platform}"):
+                external_id = self._upload(upload)
+        except UploadInterrupted:
+            self.repository.update_upload_status(upload_id, "queued")
+            return
+        except Exception as exc:
+            logger.warning(
+                "platform_upload_failed",
+                extra={"extra_payload": {"upload_id": upload_id, "platform": upload.platform, "error": str(exc)}},
+            )
+            self.repository.update_upload_status(upload_id, "failed", error=str(exc))
+            return
+        self.repository.update_upload_status(upload_id, "done", external_id=external_id)
+
+    def _upload(self, upload: PlatformUpload) -> str:
+        protocol = self.protocols[upload.platform]
+        pool = self.pools[upload.platform]
+        session_url, chunk_size = self.repository.get_upload_session(upload.id)
+        external_id = upload.external_id
+        committed = 0
+        if session_url and not protocol.parallel:
+            # The platform is authoritative for sequential sessions: ask what it holds.
+            try:
+                ack = self._with_retries(lambda: protocol.committed(pool, session_url, upload.total_bytes))
+            except SessionExpired:
+                session_url = ""
+            else:
+                if ack.complete:
+                    return ack.external_id
+                committed = ack.committed
+                self.repository.sync_upload_offset(upload.id, committed)
+        resumed = bool(session_url)
+        if not resumed:
+            session_url, external_id = self._open_session(upload, protocol, pool, chunk_size)
+        try:
+            return self._transfer(upload, protocol, pool, session_url, chunk_size, committed) or external_id
+        except SessionExpired:
+            if not resumed:
+                raise
+        # The stored session went stale while the upload was paused: start over on a new one.
+        session_url, external_id = self._open_session(upload, protocol, pool, chunk_size)
+        return self._transfer(upload, protocol, pool, session_url, chunk_size, 0) or external_id
+
+    def _open_session(
+        self, upload: PlatformUpload, protocol: UploadProtocol, pool: ConnectionPool, chunk_size: int
+    ) -> tuple[str, str]:
+        session_url, external_id = self._with_retries(
+            lambda: protocol.open_session(pool, upload.total_bytes, chunk_size, upload.title)
+        )
+        self.repository.set_upload_session(upload.id, session_url, external_id)
+        return session_url, external_id
+
+    def _transfer(
+        self,
+        upload: PlatformUpload,
+        protocol: UploadProtocol,
+        pool: ConnectionPool,
+        session_url: str,
+        chunk_size: int,
+        committed: int,
+    ) -> str:
+        if protocol.parallel:
+            return self._upload_chunks(upload, protocol, pool, session_url)
+        return self._upload_sequential(upload, protocol, pool, session_url, chunk_size, committed)
+
+    def _upload_sequential(
+        self,
+        upload: PlatformUpload,
+        protocol: UploadProtocol,
+        pool: ConnectionPool,
+        session_url: str,
+        chunk_size: int,
+        offset: int,
+    ) -> str:
+        attempt = 0
+        with open(upload.file_path, "rb") as handle:
+            while True:
+                if self._stopping.is_set():
+                    raise UploadInterrupted
+                end = min(upload.total_bytes, (offset // chunk_size + 1) * chunk_size)
+                handle.seek(offset)
+                data = handle.read(end - offset)
+                try:
+                    with registry.span("upload_chunk_seconds", platform=upload.platform):
+                        ack = protocol.send_chunk(pool, session_url, offset, data, upload.total_bytes)
+                except (OSError, http.client.HTTPException, UploadError) as exc:
+                    if not self._retryable(exc) or attempt >= self.retries:
+                        raise
+                    if self._stopping.wait(self.retry_backoff * 2**attempt):
+                        raise UploadInterrupted from exc
+                    attempt += 1
+                    # The chunk may have been partly stored: continue from the platform's offset.
+                    ack = self._with_retries(lambda: protocol.committed(pool, session_url, upload.total_bytes))
+                else:
+                    attempt = 0
+                self.repository.sync_upload_offset(upload.id, ack.committed)
+                if ack.complete:
+                    return ack.external_id
+                offset = ack.committed
+
+    def _upload_chunks(
+        self, upload: PlatformUpload, protocol: UploadProtocol, pool: ConnectionPool, session_url: str
+    ) -> str:
+        pending = self.repository.pending_upload_chunks(upload.id)
+        # The platform finalises on the chunk that ends the file, so it goes last.
+        final = [chunk for chunk in pending if chunk[2] == upload.total_bytes]
+        others = [chunk for chunk in pending if chunk[2] != upload.total_bytes]
+
+        def send(chunk: tuple[int, int, int]) -> ChunkAck:
+            if self._stopping.is_set():
+                raise UploadInterrupted
+            idx, start, end = chunk
+            with open(upload.file_path, "rb") as handle:
+                handle.seek(start)
+                data = handle.read(end - start)
+            with registry.span("upload_chunk_seconds", platform=upload.platform):
+                ack = self._with_retries(
+                    lambda: protocol.send_chunk(pool, session_url, start, data, upload.total_bytes)
+                )
+            self.repository.mark_upload_chunk(upload.id, idx)
+            return ack
+
+        if others:
+            workers = min(self.streams, len(others))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="monteur-chunk") as streams:
+                list(streams.map(send, others))  # re-raises the first failure
+        ack = ChunkAck(complete=False)
+        for chunk in final:
+            ack = send(chunk)
+        return ack.external_id
+
+    def _with_retries(self, call):
+        for attempt in range(self.retries + 1):
+            try:
+                return call()
+            except (OSError, http.client.HTTPException, UploadError) as exc:
+                if not self._retryable(exc) or attempt >= self.retries:
+                    raise
+                if self._stopping.wait(self.retry_backoff * 2**attempt):
+                    raise UploadInterrupted from exc
+
+    @staticmethod
+    def _retryable(exc: Exception) -> bool:
+        if isinstance(exc, UploadError):
+            return exc.retryable
+        return True  # connection errors and timeouts
@@ -4,6 +4,43 @@ import shutil
 import subprocess
 from pathlib import Path
 
+from ai_service.core.metrics import registry
+from ai_service.models.schemas import KeepRange, SilenceSegment
+
+RATIO_FILTERS = {
+    "9:16": "scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2",
+    "1:1": "scale=1080:1080:force_original_aspect_ratio=decrease,pad=1080:1080:(ow-iw)/2:(oh-ih)/2",
+    "16:9": "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2",
+}
+
+
+def keep_ranges(
+    silences: list[SilenceSegment],
+    duration: float,
+    padding: float = 0.1,
+    min_cut: float = 0.3,
+) -> list[KeepRange]:
+    """Edit decision list: the parts of [0, duration] left after removing silences.
+
+    Each silence is shrunk by `padding` on both sides so speech is not clipped;
+    what remains is only cut if it lasts at least `min_cut` seconds, otherwise
+    the neighbouring keep ranges are merged.
+    """
+    ranges: list[KeepRange] = []
+    cursor = 0.0
+    for silence in sorted(silences, key=lambda s: s.start):
+        # No padding at the edges of the media: leading/trailing silence goes entirely.
+        cut_start = max(silence.start + padding if silence.start > 0 else 0.0, cursor)
+        cut_end = min(silence.end - padding if silence.end < duration else duration, duration)
+        if cut_end - cut_start < min_cut:
+            continue
+        if cut_start > cursor:
+            ranges.append(KeepRange(start=round(cursor, 3), end=round(cut_start, 3)))
+        cursor = cut_end
+    if duration > cursor:
+        ranges.append(KeepRange(start=round(cursor, 3), end=round(duration, 3)))
+    return ranges
+
 
 class FFmpegPipelineService:
     def __init__(self, ffmpeg_bin: str = "ffmpeg") -> None:
@@ -29,16 +66,12 @@ class FFmpegPipelineService:
         aspect_ratio: str,
         add_subtitles: bool = False,
         subtitle_path: str | None = None,
+        audio_filter: str | None = None,
     ) -> list[str]:
-        vf_map = {
-            "9:16": "scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2",
-            "1:1": "scale=1080:1080:force_original_aspect_ratio=decrease,pad=1080:1080:(ow-iw)/2:(oh-ih)/2",
-            "16:9": "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2",
-        }
-        if aspect_ratio not in vf_map:
+        if aspect_ratio not in RATIO_FILTERS:
             raise ValueError(f"Unsupported ratio: {aspect_ratio}")
 
-        filters = [vf_map[aspect_ratio]]
+        filters = [RATIO_FILTERS[aspect_ratio]]
         if add_subtitles and subtitle_path:
             filters.append(f"subtitles={subtitle_path}")
 
@@ -49,6 +82,62 @@ class FFmpegPipelineService:
             input_path,
             "-vf",
             ",".join(filters),
+            *(["-af", audio_filter] if audio_filter else []),
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-c:a",
+            "aac",
+            output_path,
+        ]
+
+    def build_jump_cut_filter(
+        self,
+        ranges: list[KeepRange],
+        aspect_ratio: str,
+        add_subtitles: bool = False,
+        subtitle_path: str | None = None,
+        audio_filter: str | None = None,
+    ) -> str:
+        """One filter graph keeping `ranges` of both streams; timestamps are rebuilt so the cuts are seamless."""
+        if aspect_ratio not in RATIO_FILTERS:
+            raise ValueError(f"Unsupported ratio: {aspect_ratio}")
+        if not ranges:
+            raise ValueError("Nothing left to keep")
+        keep = "+".join(f"between(t,{r.start:.3f},{r.end:.3f})" for r in ranges)
+        # Subtitles are burned before the select so they stay on the source timeline.
+        video = [f"subtitles={subtitle_path}"] if add_subtitles and subtitle_path else []
+        video += [f"select='{keep}'", "setpts=N/FRAME_RATE/TB", RATIO_FILTERS[aspect_ratio]]
+        audio = [f"aselect='{keep}'", "asetpts=N/SR/TB"] + ([audio_filter] if audio_filter else [])
+        return f"[0:v]{','.join(video)}[v];\n[0:a]{','.join(audio)}[a]\n"
+
+    def build_jump_cut_command(
+        self,
+        input_path: str,
+        output_path: str,
+        script_path: str,
+        aspect_ratio: str,
+        ranges: list[KeepRange],
+        add_subtitles: bool = False,
+        subtitle_path: str | None = None,
+        audio_filter: str | None = None,
+    ) -> list[str]:
+        """Single decode/encode jump-cut render; the filter graph goes to `script_path`, not the command line."""
+        script = self.build_jump_cut_filter(ranges, aspect_ratio, add_subtitles, subtitle_path, audio_filter)
+        Path(script_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(script_path).write_text(script, encoding="utf-8")
+        return [
+            self.ffmpeg_bin,
+            "-y",
+            "-i",
+            input_path,
+            "-filter_complex_script",
+            script_path,
+            "-map",
+            "[v]",
+            "-map",
+            "[a]",
             "-c:v",
             "libx264",
             "-preset",
@@ -61,4 +150,5 @@ class FFmpegPipelineService:
     def run_export(self, command: list[str]) -> subprocess.CompletedProcess:
         if not self.is_available():
             raise RuntimeError("ffmpeg is not available in PATH")
-        return subprocess.run(command, capture_output=True, text=True, check=False)
+        with registry.span("subprocess_seconds", binary="ffmpeg"):
+            return subprocess.run(command, capture_output=True, text=True, check=False)
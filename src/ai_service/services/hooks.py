@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from ai_service.models.schemas import TranscriptSegment
+import bisect
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from ai_service.models.schemas import HookClip, TranscriptSegment
+from ai_service.services.viral import ViralScoringService
 
 STYLE_PREFIX = {
     "business": ["Les 3 erreurs", "Ce que personne ne te dit", "Le système qui"],
@@ -9,16 +17,168 @@ STYLE_PREFIX = {
     "generic": ["Tu fais sûrement ça aussi", "Le point clé en 20 secondes", "À ne pas manquer"],
 }
 
+STOPWORDS = {
+    "a", "à", "au", "aux", "avec", "c", "ce", "ces", "cette", "d", "dans", "de", "des", "du", "elle", "en",
+    "est", "et", "il", "j", "je", "l", "la", "le", "les", "leur", "lui", "m", "ma", "mais", "me", "mes",
+    "mon", "n", "ne", "nous", "on", "ou", "où", "par", "pas", "pour", "qu", "que", "qui", "s", "sa", "se",
+    "ses", "son", "sur", "t", "ta", "te", "tes", "ton", "tu", "un", "une", "vous", "y", "ça", "the", "and",
+    "of", "to", "is", "it", "in", "that", "you", "i",
+}
+
+_WORD_RE = re.compile(r"[\w']+", re.UNICODE)
+_CLAUSE_RE = re.compile(r"[,;:.!?]+")
+
+
+def _tokens(text: str) -> list[str]:
+    words: list[str] = []
+    for raw in _WORD_RE.findall(text.lower()):
+        # "l'automatisation" -> "automatisation"
+        word = raw.rsplit("'", 1)[-1]
+        if word and word not in STOPWORDS:
+            words.append(word)
+    return words
+
+
+def _ngrams(words: list[str], max_n: int) -> list[str]:
+    return [" ".join(words[i : i + n]) for n in range(1, max_n + 1) for i in range(len(words) - n + 1)]
+
+
+class TranscriptIndex:
+    """TF-IDF over the n-grams of a transcript, segments being the documents."""
+
+    def __init__(self, transcript: list[TranscriptSegment], max_n: int = 3) -> None:
+        self.max_n = max_n
+        self.segment_terms = [Counter(_ngrams(_tokens(seg.text), max_n)) for seg in transcript]
+        df: Counter[str] = Counter()
+        for terms in self.segment_terms:
+            df.update(terms.keys())
+        total = len(transcript)
+        self.idf = {term: math.log((1 + total) / (1 + count)) + 1.0 for term, count in df.items()}
+        self.clauses = [
+            [c.strip(" .") for c in _CLAUSE_RE.split(seg.text) if c.strip(" .")] for seg in transcript
+        ]
+        self._best_clause: dict[int, str] = {}
+
+    def salient_ngrams(self, idx: int, k: int = 5) -> list[tuple[str, float]]:
+        terms = self.segment_terms[idx]
+        weights = [(term, tf * self.idf[term] * len(term.split())) for term, tf in terms.items()]
+        return sorted(weights, key=lambda w: w[1], reverse=True)[:k]
+
+    def best_clause(self, idx: int) -> str:
+        """Clause of the segment carrying the most salient n-grams."""
+        if idx not in self._best_clause:
+            salient = self.salient_ngrams(idx, k=8)
+            best, best_weight = "", -1.0
+            for clause in self.clauses[idx]:
+                terms = set(_ngrams(_tokens(clause), self.max_n))
+                weight = sum(w for term, w in salient if term in terms)
+                if weight > best_weight:
+                    best, best_weight = clause, weight
+            self._best_clause[idx] = best
+        return self._best_clause[idx]
+
 
 class HookService:
-    def generate(self, transcript: list[TranscriptSegment], style: str, limit: int) -> list[str]:
-        top_phrases = [seg.text for seg in transcript[: max(1, min(len(transcript), limit))]]
-        prefixes = STYLE_PREFIX.get(style, STYLE_PREFIX["generic"])
+    """Hooks built from the best-scored moments, with per-project caches."""
+
+    def __init__(self, scorer: ViralScoringService | None = None, cache_size: int = 128) -> None:
+        self.scorer = scorer or ViralScoringService()
+        self.cache_size = cache_size
+        self._indexes: OrderedDict[tuple[str, str], tuple[TranscriptIndex, list[int]]] = OrderedDict()
+        self._results: OrderedDict[tuple[str, str, str, int], list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generate(
+        self,
+        transcript: list[TranscriptSegment],
+        style: str,
+        limit: int,
+        project_id: str | None = None,
+    ) -> list[str]:
+        if not transcript or limit <= 0:
+            return []
+        fingerprint = self._fingerprint(transcript)
+        key = (project_id or "", fingerprint, style, limit)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return list(cached)
+
+        index, ranking = self._index_for(transcript, project_id, fingerprint)
+        hooks = self._hooks_from(ranking, index, style, limit)
+        with self._lock:
+            self._remember(self._results, key, hooks)
+        return list(hooks)
 
+    def generate_batch(
+        self,
+        transcript: list[TranscriptSegment],
+        clips: list[HookClip],
+        style: str,
+        limit: int,
+        project_id: str | None = None,
+    ) -> list[list[str]]:
+        """Hooks for many candidate clips, sharing one index and one scoring pass."""
+        if not transcript or limit <= 0:
+            return [[] for _ in clips]
+        index, ranking = self._index_for(transcript, project_id, self._fingerprint(transcript))
+        rank_of = {seg_idx: rank for rank, seg_idx in enumerate(ranking)}
+        order = sorted(range(len(transcript)), key=lambda i: transcript[i].start)
+        starts = [transcript[i].start for i in order]
+
+        results: list[list[str]] = []
+        for clip in clips:
+            # Segments starting before the clip end, then keep those overlapping it.
+            upper = bisect.bisect_left(starts, clip.end)
+            inside = [i for i in order[:upper] if transcript[i].end > clip.start]
+            inside.sort(key=rank_of.__getitem__)
+            results.append(self._hooks_from(inside, index, style, limit))
+        return results
+
+    def _index_for(
+        self,
+        transcript: list[TranscriptSegment],
+        project_id: str | None,
+        fingerprint: str,
+    ) -> tuple[TranscriptIndex, list[int]]:
+        key = (project_id or "", fingerprint)
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is not None:
+                self._indexes.move_to_end(key)
+                return entry
+        index = TranscriptIndex(transcript)
+        ranking = [idx for idx, _ in self.scorer.score_indexed(transcript, [], [])]
+        with self._lock:
+            self._remember(self._indexes, key, (index, ranking))
+        return index, ranking
+
+    @staticmethod
+    def _hooks_from(ranking: list[int], index: TranscriptIndex, style: str, limit: int) -> list[str]:
+        prefixes = STYLE_PREFIX.get(style, STYLE_PREFIX["generic"])
         hooks: list[str] = []
-        for idx, phrase in enumerate(top_phrases):
-            base = phrase.split(",")[0].strip(" .")
-            prefix = prefixes[idx % len(prefixes)]
+        seen: set[str] = set()
+        for seg_idx in ranking:
+            if len(hooks) >= limit:
+                break
+            base = index.best_clause(seg_idx)
+            if not base or base.lower() in seen:
+                continue
+            seen.add(base.lower())
+            prefix = prefixes[len(hooks) % len(prefixes)]
             hooks.append(f"{prefix} : {base}")
+        return hooks
+
+    @staticmethod
+    def _fingerprint(transcript: list[TranscriptSegment]) -> str:
+        digest = hashlib.sha1()
+        for seg in transcript:
+            digest.update(f"{seg.start}:{seg.end}:{seg.text}\x1f".encode())
+        return digest.hexdigest()
 
-        return hooks[:limit]
+    def _remember(self, cache: OrderedDict, key: tuple, value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
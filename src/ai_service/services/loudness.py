@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+from ai_service.core.metrics import registry
+from ai_service.models.schemas import LoudnessStats
+from ai_service.repositories.sqlite_repo import SqliteRepository
+
+_FRAME_RE = re.compile(r"\bt:\s*(?P<t>[\d.]+)\s.*?\bM:\s*(?P<m>\S+)\s+S:\s*(?P<s>\S+)")
+_FTPK_RE = re.compile(r"\bFTPK:(?P<peaks>.*?)dBFS")
+ABSOLUTE_GATE = -70.0  # LUFS, ITU-R BS.1770
+
+
+class LoudnessService:
+    """EBU R128 statistics of a source, measured once and reused by every export of it.
+
+    A single ffmpeg pass runs `ebur128` (momentary / short-term loudness and
+    true peak every 100 ms, reduced to `window` seconds) followed by
+    `loudnorm` (whole-file measurements). The result is cached per source
+    fingerprint; `loudnorm_filter` turns it into a one-pass linear `loudnorm`
+    with `measured_*` values, for the whole file or for the ranges an export
+    keeps.
+    """
+
+    def __init__(
+        self,
+        ffmpeg_bin: str = "ffmpeg",
+        repository: SqliteRepository | None = None,
+        true_peak: float = -1.5,
+        lra: float = 11.0,
+        window: float = 0.4,
+    ) -> None:
+        self.ffmpeg_bin = ffmpeg_bin
+        self.repository = repository
+        self.true_peak = true_peak
+        self.lra = lra
+        self.window = window
+
+    def is_available(self) -> bool:
+        return shutil.which(self.ffmpeg_bin) is not None
+
+    def analyze(self, media_path: str, fingerprint: str = "") -> LoudnessStats:
+        cache_key = f"loudness:{self.window}:{fingerprint}"
+        if fingerprint and self.repository is not None:
+            cached = self.repository.get_artifact(cache_key)
+            if cached is not None:
+                return LoudnessStats(**cached)  # type: ignore[arg-type]
+        if not Path(media_path).exists():
+            raise FileNotFoundError(media_path)
+        if not self.is_available():
+            raise RuntimeError("ffmpeg is not available in PATH")
+        stats = self.parse(self._run_analysis(media_path), self.window)
+        if fingerprint and self.repository is not None:
+            self.repository.save_artifact(cache_key, "loudness", stats.__dict__)
+        return stats
+
+    def _run_analysis(self, media_path: str) -> str:
+        cmd = [
+            self.ffmpeg_bin,
+            "-nostdin",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            media_path,
+            "-vn",
+            "-af",
+            "ebur128=peak=true,loudnorm=print_format=json",
+            "-f",
+            "null",
+            "-",
+        ]
+        with registry.span("subprocess_seconds", binary="ffmpeg"):
+            proc = subprocess.run(cmd, capture_output=True, text=True, errors="replace", check=False)
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg loudness analysis failed: {proc.stderr.strip()[-500:]}")
+        return proc.stderr
+
+    @staticmethod
+    def parse(stderr: str, window: float = 0.4) -> LoudnessStats:
+        """Build the stats from ffmpeg's log: ebur128 frame lines, then loudnorm's JSON summary."""
+        start, end = stderr.rfind("{"), stderr.rfind("}")
+        if start < 0 or end < start:
+            raise RuntimeError("loudnorm summary not found in ffmpeg output")
+        summary = json.loads(stderr[start : end + 1])
+
+        energy: dict[int, list[float]] = {}
+        short_term: dict[int, float] = {}
+        peaks: dict[int, float] = {}
+        for line in stderr.splitlines():
+            match = _FRAME_RE.search(line)
+            if not match:
+                continue
+            # Frame t covers the 100 ms ending at t.
+            bucket = max(0, math.ceil(float(match["t"]) / window - 1e-9) - 1)
+            energy.setdefault(bucket, []).append(_power(_lufs(match["m"])))
+            short_term[bucket] = _lufs(match["s"])
+            peak = _FTPK_RE.search(line)
+            if peak:
+                values = [_lufs(value) for value in peak["peaks"].split()]
+                peaks[bucket] = max([peaks.get(bucket, -99.0), *values])
+
+        count = max(energy) + 1 if energy else 0
+        return LoudnessStats(
+            integrated=_lufs(summary["input_i"]),
+            true_peak=_lufs(summary["input_tp"]),
+            lra=max(0.0, float(summary["input_lra"])),
+            threshold=_lufs(summary["input_thresh"]),
+            target_offset=float(summary.get("target_offset", 0.0)),
+            window=window,
+            momentary=[round(_loudness(energy.get(idx, [])), 2) for idx in range(count)],
+            short_term=[round(short_term.get(idx, -99.0), 2) for idx in range(count)],
+            peaks=[round(peaks.get(idx, -99.0), 2) for idx in range(count)],
+        )
+
+    def measurements(self, stats: LoudnessStats, ranges: list[tuple[float, float]] | None = None) -> dict[str, float]:
+        """`measured_*` values for the whole source, or estimated from the windows inside `ranges`.
+
+        Range estimates apply the BS.1770 gates to the per-window momentary
+        loudness (integrated) and the EBU 3342 gates to short-term loudness (LRA).
+        """
+        whole = {
+            "I": stats.integrated,
+            "TP": stats.true_peak,
+            "LRA": stats.lra,
+            "thresh": stats.threshold,
+            "offset": stats.target_offset,
+        }
+        if not ranges or not stats.momentary:
+            return whole
+        picked = sorted(
+            {
+                idx
+                for start, end in ranges
+                for idx in range(int(start / stats.window), math.ceil(end / stats.window))
+                if idx < len(stats.momentary)
+            }
+        )
+        if not picked:
+            return whole
+        gated = [stats.momentary[idx] for idx in picked if stats.momentary[idx] > ABSOLUTE_GATE]
+        if not gated:
+            return {**whole, "I": ABSOLUTE_GATE, "offset": 0.0}
+        threshold = _loudness([_power(value) for value in gated]) - 10.0
+        integrated = _loudness([_power(value) for value in gated if value > threshold])
+        return {
+            "I": round(integrated, 2),
+            "TP": round(max(stats.peaks[idx] for idx in picked), 2),
+            "LRA": round(_loudness_range([stats.short_term[idx] for idx in picked], stats.lra), 2),
+            "thresh": round(threshold, 2),
+            "offset": 0.0,
+        }
+
+    def loudnorm_filter(
+        self,
+        stats: LoudnessStats,
+        target: float = -14.0,
+        ranges: list[tuple[float, float]] | None = None,
+    ) -> str:
+        """Audio filter normalising to `target` LUFS in one linear pass.
+
+        loudnorm only stays linear when the measured LRA fits the target LRA and
+        the gain does not push the true peak over the ceiling, so the LRA target
+        is widened and the loudness target lowered when needed rather than
+        letting it fall back to dynamic compression.
+        """
+        m = self.measurements(stats, ranges)
+        if m["I"] <= ABSOLUTE_GATE:
+            return "anull"  # silence: any gain would only raise the noise floor
+        target = min(target, self.true_peak - (m["TP"] - m["I"]))
+        params = {
+            "I": _clamp(target, -70.0, -5.0),
+            "TP": self.true_peak,
+            "LRA": _clamp(max(self.lra, m["LRA"]), 1.0, 50.0),
+            "measured_I": _clamp(m["I"], -99.0, 0.0),
+            "measured_TP": _clamp(m["TP"], -99.0, 99.0),
+            "measured_LRA": _clamp(m["LRA"], 0.0, 99.0),
+            "measured_thresh": _clamp(m["thresh"], -99.0, 0.0),
+            "offset": _clamp(m["offset"], -99.0, 99.0),
+        }
+        options = ":".join(f"{name}={value:.2f}" for name, value in params.items())
+        # loudnorm resamples to 192 kHz internally.
+        return f"loudnorm={options}:linear=true:print_format=none,aresample=48000"
+
+
+def _lufs(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        return -99.0
+    return max(-99.0, number) if not math.isnan(number) else -99.0
+
+
+def _power(lufs: float) -> float:
+    return 10 ** (lufs / 10)
+
+
+def _loudness(powers: list[float]) -> float:
+    if not powers:
+        return -99.0
+    mean = sum(powers) / len(powers)
+    return 10 * math.log10(mean) if mean > 0 else -99.0
+
+
+def _loudness_range(short_term: list[float], fallback: float) -> float:
+    gated = [value for value in short_term if value > ABSOLUTE_GATE]
+    if len(gated) < 2:
+        return fallback
+    relative = _loudness([_power(value) for value in gated]) - 20.0
+    values = sorted(value for value in gated if value > relative)
+    if len(values) < 2:
+        return fallback
+    low = values[int(0.10 * (len(values) - 1))]
+    high = values[int(0.95 * (len(values) - 1))]
+    return high - low
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return min(high, max(low, value))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from ai_service.repositories.sqlite_repo import SqliteRepository
+
+logger = logging.getLogger("ai_service.maintenance")
+
+
+class JobMaintenanceService:
+    """Expires finished jobs and unused pipeline artifacts, then returns freed pages to disk."""
+
+    def __init__(
+        self,
+        repository: SqliteRepository,
+        retention_seconds: float = 7 * 24 * 3600,
+        artifact_retention_seconds: float = 30 * 24 * 3600,
+        interval: float = 3600.0,
+        vacuum_pages: int = 2000,
+    ) -> None:
+        self.repository = repository
+        self.retention_seconds = retention_seconds
+        self.artifact_retention_seconds = artifact_retention_seconds
+        self.interval = interval
+        self.vacuum_pages = vacuum_pages
+        self._converted = False
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self, now: float | None = None) -> dict[str, int]:
+        if not self._converted:
+            # Databases from before incremental auto_vacuum: converted here, after start-up,
+            # since the VACUUM rewrites the whole file.
+            started = time.monotonic()
+            if self.repository.convert_to_incremental_vacuum():
+                logger.info(
+                    "sqlite_auto_vacuum_converted",
+                    extra={"extra_payload": {"seconds": round(time.monotonic() - started, 3)}},
+                )
+            self._converted = True
+        now = now if now is not None else time.time()
+        deleted = self.repository.delete_expired_jobs(now - self.retention_seconds)
+        artifacts = self.repository.delete_stale_artifacts(now - self.artifact_retention_seconds)
+        free_pages = self.repository.incremental_vacuum(self.vacuum_pages)
+        logger.info(
+            "jobs_maintenance",
+            extra={"extra_payload": {"deleted": deleted, "artifacts_deleted": artifacts, "free_pages": free_pages}},
+        )
+        return {"deleted": deleted, "artifacts_deleted": artifacts, "free_pages": free_pages}
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="monteur-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        # First pass right after boot, then every `interval`.
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("jobs_maintenance_failed")
+            if self._stop_event.wait(self.interval):
+                return
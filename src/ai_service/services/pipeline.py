@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from ai_service.models.schemas import TranscriptSegment
+from ai_service.repositories.sqlite_repo import SqliteRepository
+from ai_service.services.audio_features import AudioFeatureService
+from ai_service.services.ffmpeg_pipeline import FFmpegPipelineService
+from ai_service.services.hooks import HookService
+from ai_service.services.loudness import LoudnessService
+from ai_service.services.silence import SilenceDetectionService
+from ai_service.services.transcription import TranscriptionService
+from ai_service.services.viral import ViralScoringService
+from ai_service.services.visual_motion import VisualMotionService
+
+logger = logging.getLogger("ai_service.pipeline")
+
+
+@dataclass
+class Stage:
+    """One node of the DAG.
+
+    `params` selects the request fields the stage depends on; together with the
+    keys of its dependencies they form the cache key of its output.
+    """
+
+    name: str
+    run: Callable[[dict, dict[str, Any]], Any]
+    params: Callable[[dict], dict]
+    deps: tuple[str, ...] = ()
+    version: str = "1"
+
+
+@dataclass
+class PipelineRun:
+    outputs: dict[str, Any] = field(default_factory=dict)
+    cached: list[str] = field(default_factory=list)
+    executed: list[str] = field(default_factory=list)
+
+
+def source_fingerprint(path: str) -> str:
+    """Cheap identity of a media file: path, size and mtime."""
+    stat = Path(path).stat()
+    return f"{Path(path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class PipelineRunner:
+    def __init__(self, repository: SqliteRepository, stages: list[Stage], max_workers: int = 4) -> None:
+        self.repository = repository
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"stage {stage.name} depends on unknown stages: {missing}")
+
+    def stage_key(self, stage: Stage, params: dict, dep_keys: dict[str, str]) -> str:
+        material = json.dumps(
+            {
+                "stage": stage.name,
+                "version": stage.version,
+                "params": stage.params(params),
+                "deps": {dep: dep_keys[dep] for dep in stage.deps},
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def run(self, params: dict) -> PipelineRun:
+        run = PipelineRun()
+        keys: dict[str, str] = {}
+        pending = dict(self.stages)
+        running: dict[Future, tuple[Stage, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="monteur-pipeline") as pool:
+            while pending or running:
+                progressed = False
+                for name, stage in list(pending.items()):
+                    if not all(dep in run.outputs for dep in stage.deps):
+                        continue
+                    del pending[name]
+                    progressed = True
+                    key = self.stage_key(stage, params, keys)
+                    keys[name] = key
+                    cached = self.repository.get_artifact(key)
+                    if cached is not None:
+                        run.outputs[name] = cached
+                        run.cached.append(name)
+                        continue
+                    inputs = {dep: run.outputs[dep] for dep in stage.deps}
+                    running[pool.submit(stage.run, params, inputs)] = (stage, key)
+
+                if not running:
+                    if pending and not progressed:
+                        raise ValueError(f"pipeline has a dependency cycle: {sorted(pending)}")
+                    # Cache hits may have unblocked more stages: schedule again.
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, key = running.pop(future)
+                    output = future.result()  # a failing stage aborts the run
+                    self.repository.save_artifact(key, stage.name, output)
+                    run.outputs[stage.name] = output
+                    run.executed.append(stage.name)
+
+        logger.info(
+            "pipeline_run",
+            extra={"extra_payload": {"executed": run.executed, "cached": run.cached}},
+        )
+        return run
+
+
+def build_auto_edit_pipeline(
+    repository: SqliteRepository,
+    ffmpeg: FFmpegPipelineService,
+    transcription: TranscriptionService,
+    silences: SilenceDetectionService,
+    scorer: ViralScoringService,
+    hooks: HookService,
+    audio: AudioFeatureService,
+    visual: VisualMotionService,
+    loudness: LoudnessService,
+    transcribe_mode: str = "stub",
+    max_workers: int = 4,
+) -> PipelineRunner:
+    """create_project -> (transcribe || detect_silences) -> (audio_features || visual_motion) -> score_moments,
+    generate_hooks, prepare_export."""
+
+    def transcript_of(inputs: dict) -> list[TranscriptSegment]:
+        return [TranscriptSegment(**seg) for seg in inputs["transcribe"]["segments"]]
+
+    def audio_features(p: dict, inputs: dict) -> dict:
+        transcript = transcript_of(inputs)
+        if audio.is_available():
+            try:
+                return audio.extract(p["video_path"], transcript).__dict__
+            except RuntimeError as exc:  # no audio stream, undecodable source, numpy missing
+                logger.warning("audio_features_failed", extra={"extra_payload": {"error": str(exc)}})
+        # No usable decoder: speech rate only, the scorer keeps its neutral peak.
+        return {"audio_peaks": [], "speech_rates": audio.speech_rates(transcript)}
+
+    def visual_motion(p: dict, inputs: dict) -> dict:
+        if not visual.is_available():
+            return {"visual_motion": []}
+        try:
+            motion = visual.segment_motion(p["video_path"], transcript_of(inputs), p["source_fingerprint"])
+        except RuntimeError as exc:  # audio-only upload, undecodable video: the scorer keeps its neutral motion
+            logger.warning("visual_motion_failed", extra={"extra_payload": {"error": str(exc)}})
+            return {"visual_motion": []}
+        return {"visual_motion": motion}
+
+    def prepare_export(p: dict, _: dict) -> dict:
+        audio_filter = None
+        if p["normalize_audio"]:
+            # Measured once per source (cached by the service), whatever the ratio or target.
+            stats = loudness.analyze(p["video_path"], p["source_fingerprint"])
+            audio_filter = loudness.loudnorm_filter(stats, p["loudness_target"])
+        command = ffmpeg.build_export_command(
+            input_path=p["video_path"],
+            output_path=p["output_path"],
+            aspect_ratio=p["aspect_ratio"],
+            add_subtitles=p["add_subtitles"],
+            subtitle_path=p["subtitle_path"],
+            audio_filter=audio_filter,
+        )
+        return {"command": command, "output_path": p["output_path"]}
+
+    stages = [
+        Stage(
+            name="create_project",
+            run=lambda p, _: ffmpeg.probe_metadata(p["video_path"]),
+            params=lambda p: {"source": p["source_fingerprint"]},
+        ),
+        Stage(
+            name="transcribe",
+            run=lambda p, _: {
+                "segments": [seg.__dict__ for seg in transcription.transcribe(p["video_path"], p["language"])]
+            },
+            params=lambda p: {"source": p["source_fingerprint"], "language": p["language"], "mode": transcribe_mode},
+            deps=("create_project",),
+        ),
+        Stage(
+            name="detect_silences",
+            run=lambda p, _: {
+                "silences": [
+                    s.__dict__ for s in silences.detect(p["durations"], p["amplitudes"], p["silence_threshold"])
+                ]
+            },
+            params=lambda p: {
+                "durations": p["durations"],
+                "amplitudes": p["amplitudes"],
+                "threshold": p["silence_threshold"],
+            },
+            deps=("create_project",),
+        ),
+        Stage(
+            name="audio_features",
+            run=audio_features,
+            params=lambda p: {"source": p["source_fingerprint"], "decoder": audio.is_available()},
+            deps=("transcribe",),
+        ),
+        Stage(
+            name="visual_motion",
+            run=visual_motion,
+            params=lambda p: {"source": p["source_fingerprint"], "decoder": visual.is_available()},
+            deps=("transcribe",),
+        ),
+        Stage(
+            name="score_moments",
+            run=lambda _, inputs: {
+                "candidates": [
+                    c.__dict__
+                    for c in scorer.score(
+                        transcript_of(inputs),
+                        inputs["audio_features"]["audio_peaks"],
+                        inputs["audio_features"]["speech_rates"],
+                        inputs["visual_motion"]["visual_motion"],
+                    )
+                ]
+            },
+            params=lambda _: {},
+            deps=("transcribe", "audio_features", "visual_motion"),
+        ),
+        Stage(
+            name="generate_hooks",
+            run=lambda p, inputs: {
+                "hooks": hooks.generate(transcript_of(inputs), p["hook_style"], p["hook_limit"], p["project_id"])
+            },
+            params=lambda p: {"style": p["hook_style"], "limit": p["hook_limit"]},
+            deps=("transcribe",),
+        ),
+        Stage(
+            name="prepare_export",
+            run=prepare_export,
+            params=lambda p: {
+                "source": p["source_fingerprint"],
+                "output_path": p["output_path"],
+                "aspect_ratio": p["aspect_ratio"],
+                "add_subtitles": p["add_subtitles"],
+                "subtitle_path": p["subtitle_path"],
+                "loudness_target": p["loudness_target"] if p["normalize_audio"] else None,
+            },
+            deps=("create_project",),
+        ),
+    ]
+    return PipelineRunner(repository, stages, max_workers=max_workers)
@@ -0,0 +1,271 @@
+"""HTTP side of platform exports: pooled keep-alive connections and the
+resumable-upload dialects spoken by YouTube and TikTok.
+
+`PlatformExportService` (services/cloud.py) drives these; nothing here
+touches the database.
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import re
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+YOUTUBE_CHUNK_ALIGN = 256 * 1024  # chunks other than the last must be multiples of 256 KiB
+_RANGE_RE = re.compile(r"bytes=(\d+)-(\d+)")
+
+
+class UploadError(RuntimeError):
+    def __init__(self, message: str, retryable: bool = False) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class SessionExpired(UploadError):
+    """The platform no longer knows the upload session; a new one must be opened."""
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: dict[str, str]  # lower-cased names
+    body: bytes
+
+    def json(self) -> dict:
+        try:
+            return json.loads(self.body or b"{}")
+        except ValueError as exc:
+            raise UploadError(f"invalid JSON from platform (HTTP {self.status})", retryable=True) from exc
+
+
+@dataclass
+class ChunkAck:
+    complete: bool
+    committed: int = 0  # bytes the platform holds; only meaningful for sequential protocols
+    external_id: str = ""
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections for one platform, at most `size` requests in flight.
+
+    Idle connections are kept per origin, since upload sessions may live on
+    another host than the API that opened them.
+    """
+
+    def __init__(self, size: int = 4, timeout: float = 60.0) -> None:
+        self.size = size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, body: bytes = b"", headers: dict[str, str] | None = None) -> HttpResponse:
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = {**(headers or {}), "Content-Length": str(len(body))}
+        with self._slots:
+            conn, reused = self._checkout(origin)
+            try:
+                try:
+                    response = self._send(conn, method, target, body, headers)
+                except (ConnectionResetError, BrokenPipeError, http.client.RemoteDisconnected):
+                    # The platform closed an idle keep-alive socket; replay once on a fresh
+                    # one, but never a POST, which would open a second session.
+                    if not reused or method == "POST":
+                        raise
+                    conn.close()
+                    conn = self._connect(origin)
+                    response = self._send(conn, method, target, body, headers)
+            except BaseException:
+                conn.close()
+                raise
+            if conn.sock is not None:  # http.client drops the socket itself on "Connection: close"
+                with self._lock:
+                    self._idle.setdefault(origin, []).append(conn)
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _checkout(self, origin: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            conns = self._idle.get(origin)
+            if conns:
+                return conns.pop(), True
+        return self._connect(origin), False
+
+    def _connect(self, origin: tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = origin
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    @staticmethod
+    def _send(conn, method: str, target: str, body: bytes, headers: dict[str, str]) -> HttpResponse:
+        conn.request(method, target, body=body, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+        return HttpResponse(response.status, {k.lower(): v for k, v in response.getheaders()}, data)
+
+
+class UploadProtocol(ABC):
+    """One platform's resumable-upload dialect.
+
+    `parallel` protocols accept chunks in any order (the final one last) and
+    have no way to report what they hold, so the caller trusts its own
+    record of acknowledged chunks. Sequential protocols report their
+    committed offset and are resumed from it.
+    """
+
+    parallel = False
+
+    def __init__(self, base_url: str, access_token: str = "") -> None:
+        self.base_url = base_url.rstrip("/")
+        self.access_token = access_token
+
+    def chunk_size(self, requested: int) -> int:
+        return max(1, requested)
+
+    def chunk_layout(self, size: int, chunk_size: int) -> list[tuple[int, int]]:
+        return [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)] or [(0, 0)]
+
+    @abstractmethod
+    def open_session(self, pool: ConnectionPool, size: int, chunk_size: int, title: str) -> tuple[str, str]:
+        """(session_url, external_id or "" when the platform only assigns it at the end)."""
+
+    @abstractmethod
+    def committed(self, pool: ConnectionPool, session_url: str, size: int) -> ChunkAck:
+        """What the platform holds of the session (sequential protocols)."""
+
+    @abstractmethod
+    def send_chunk(self, pool: ConnectionPool, session_url: str, start: int, data: bytes, size: int) -> ChunkAck:
+        """PUT the bytes starting at `start`."""
+
+    def check_configured(self) -> None:
+        """Raise before anything is queued when the platform cannot be reached with these settings."""
+        if not self.access_token:
+            raise UploadError(f"{self.name}_access_token_missing")
+
+    def _auth(self) -> dict[str, str]:
+        self.check_configured()
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__.removesuffix("UploadProtocol").lower()
+
+    @staticmethod
+    def _check(response: HttpResponse, *expected: int) -> None:
+        if response.status in expected:
+            return
+        if response.status in {404, 410}:
+            raise SessionExpired(f"upload session expired (HTTP {response.status})")
+        retryable = response.status == 429 or response.status >= 500
+        raise UploadError(f"platform returned HTTP {response.status}: {response.body[:200]!r}", retryable=retryable)
+
+
+class YouTubeUploadProtocol(UploadProtocol):
+    """YouTube Data API v3 resumable uploads: one session URI, strictly sequential Content-Range PUTs."""
+
+    def chunk_size(self, requested: int) -> int:
+        return max(YOUTUBE_CHUNK_ALIGN, requested // YOUTUBE_CHUNK_ALIGN * YOUTUBE_CHUNK_ALIGN)
+
+    def open_session(self, pool: ConnectionPool, size: int, chunk_size: int, title: str) -> tuple[str, str]:
+        metadata = {"snippet": {"title": title}, "status": {"privacyStatus": "private"}}
+        response = pool.request(
+            "POST",
+            f"{self.base_url}/upload/youtube/v3/videos?uploadType=resumable&part=snippet,status",
+            body=json.dumps(metadata).encode(),
+            headers={
+                **self._auth(),
+                "Content-Type": "application/json; charset=UTF-8",
+                "X-Upload-Content-Length": str(size),
+                "X-Upload-Content-Type": "video/*",
+            },
+        )
+        self._check(response, 200, 201)
+        session_url = response.headers.get("location", "")
+        if not session_url:
+            raise UploadError("youtube did not return an upload session", retryable=True)
+        return session_url, ""
+
+    def committed(self, pool: ConnectionPool, session_url: str, size: int) -> ChunkAck:
+        response = pool.request("PUT", session_url, headers={**self._auth(), "Content-Range": f"bytes */{size}"})
+        return self._ack(response, size)
+
+    def send_chunk(self, pool: ConnectionPool, session_url: str, start: int, data: bytes, size: int) -> ChunkAck:
+        response = pool.request(
+            "PUT",
+            session_url,
+            body=data,
+            headers={
+                **self._auth(),
+                "Content-Type": "video/*",
+                "Content-Range": f"bytes {start}-{start + len(data) - 1}/{size}",
+            },
+        )
+        return self._ack(response, size)
+
+    def _ack(self, response: HttpResponse, size: int) -> ChunkAck:
+        if response.status in {200, 201}:
+            return ChunkAck(complete=True, committed=size, external_id=str(response.json().get("id", "")))
+        self._check(response, 308)
+        # "Range: bytes=0-N" lists what the session holds; absent means nothing yet.
+        match = _RANGE_RE.fullmatch(response.headers.get("range", ""))
+        return ChunkAck(complete=False, committed=int(match.group(2)) + 1 if match else 0)
+
+
+class TikTokUploadProtocol(UploadProtocol):
+    """TikTok Content Posting API file uploads: chunk count declared up front, chunks PUT independently."""
+
+    parallel = True
+
+    def chunk_layout(self, size: int, chunk_size: int) -> list[tuple[int, int]]:
+        # The trailing remainder is merged into the last chunk rather than sent on its own.
+        count = max(1, size // chunk_size)
+        return [(idx * chunk_size, size if idx == count - 1 else (idx + 1) * chunk_size) for idx in range(count)]
+
+    def open_session(self, pool: ConnectionPool, size: int, chunk_size: int, title: str) -> tuple[str, str]:
+        source = {
+            "source": "FILE_UPLOAD",
+            "video_size": size,
+            "chunk_size": min(chunk_size, size),
+            "total_chunk_count": len(self.chunk_layout(size, chunk_size)),
+        }
+        response = pool.request(
+            "POST",
+            f"{self.base_url}/v2/post/publish/inbox/video/init/",
+            body=json.dumps({"source_info": source}).encode(),
+            headers={**self._auth(), "Content-Type": "application/json; charset=UTF-8"},
+        )
+        self._check(response, 200)
+        content = response.json()
+        error = content.get("error", {})
+        if error.get("code", "ok") != "ok":
+            raise UploadError(f"tiktok init failed: {error.get('code')}: {error.get('message', '')}")
+        data = content.get("data", {})
+        if not data.get("upload_url"):
+            raise UploadError("tiktok did not return an upload URL", retryable=True)
+        return data["upload_url"], str(data.get("publish_id", ""))
+
+    def committed(self, pool: ConnectionPool, session_url: str, size: int) -> ChunkAck:
+        raise UploadError("tiktok upload sessions cannot be queried")
+
+    def send_chunk(self, pool: ConnectionPool, session_url: str, start: int, data: bytes, size: int) -> ChunkAck:
+        # The upload URL embeds its own credential, so no Authorization header here.
+        response = pool.request(
+            "PUT",
+            session_url,
+            body=data,
+            headers={"Content-Type": "video/mp4", "Content-Range": f"bytes {start}-{start + len(data) - 1}/{size}"},
+        )
+        self._check(response, 201, 206)
+        return ChunkAck(complete=response.status == 201)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import re
+
+from ai_service.models.schemas import SearchHit, TranscriptSegment
+from ai_service.repositories.sqlite_repo import SqliteRepository
+
+_TERM_RE = re.compile(r'[^\s"]+')
+
+
+def fts_query(text: str) -> str:
+    """User text -> FTS5 MATCH expression: every word must appear, `mot*` is a prefix search.
+
+    Words are quoted so punctuation or FTS operators typed by the user are not
+    interpreted as query syntax.
+    """
+    terms = []
+    for term in _TERM_RE.findall(text):
+        prefix = term.endswith("*")
+        word = term.rstrip("*")
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class TranscriptSearchService:
+    def __init__(self, repository: SqliteRepository) -> None:
+        self.repository = repository
+
+    def save(self, project_id: str, segments: list[TranscriptSegment]) -> int:
+        return self.repository.save_transcript(project_id, segments)
+
+    def get(self, project_id: str) -> list[TranscriptSegment]:
+        return self.repository.get_transcript(project_id)
+
+    def search(self, text: str, project_id: str | None = None, limit: int = 20) -> list[SearchHit]:
+        query = fts_query(text)
+        if not query:
+            return []
+        return [
+            SearchHit(
+                project_id=row[0],
+                start_ms=row[1],
+                end_ms=row[2],
+                text=row[3],
+                snippet=row[4],
+                score=round(-row[5], 4),  # bm25() is lower-is-better
+            )
+            for row in self.repository.search_segments(query, project_id, limit)
+        ]
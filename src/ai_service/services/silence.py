@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ai_service.core.optional import require_numpy
 from ai_service.models.schemas import SilenceSegment
 
 
@@ -26,3 +27,20 @@ class SilenceDetectionService:
             silences.append(SilenceSegment(start=active_start, end=cursor))
 
         return [s for s in silences if (s.end - s.start) >= 0.25]
+
+    def detect_columns(self, durations, amplitudes, threshold: float) -> list[SilenceSegment]:
+        """`detect` over feature-store arrays (possibly memory-mapped), without a Python loop per frame."""
+        np = require_numpy("feature-store silence detection")
+        if len(durations) == 0 or len(durations) != len(amplitudes):
+            return []
+        # cumsum adds sequentially, so the cursors match the loop's running sum exactly.
+        cursors = np.concatenate(([0.0], np.cumsum(durations, dtype=np.float64)))
+        silent = np.concatenate(([False], np.asarray(amplitudes) < threshold, [False]))
+        edges = np.diff(silent.astype(np.int8))
+        starts = cursors[np.flatnonzero(edges == 1)]
+        ends = cursors[np.flatnonzero(edges == -1)]
+        keep = (ends - starts) >= 0.25
+        return [
+            SilenceSegment(start=start, end=end)
+            for start, end in zip(starts[keep].tolist(), ends[keep].tolist(), strict=True)
+        ]
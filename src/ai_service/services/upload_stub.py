@@ -0,0 +1,193 @@
+"""Local imitation of the YouTube and TikTok resumable-upload endpoints.
+
+Used by the test-suite and for offline development: point
+MONTEUR_YOUTUBE_UPLOAD_URL / MONTEUR_TIKTOK_UPLOAD_URL at
+`python -m ai_service.services.upload_stub --port 9100`.
+Only the parts of the protocols the upload engine relies on are modelled.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+
+@dataclass
+class StubSession:
+    platform: str
+    size: int
+    title: str = ""
+    data: bytearray = field(default_factory=bytearray)
+    committed: int = 0  # youtube: contiguous bytes held
+    ranges: set[tuple[int, int]] = field(default_factory=set)  # tiktok: chunks held
+    external_id: str = ""
+
+
+class UploadStubServer(ThreadingHTTPServer):
+    """`fail_after`: once that many chunk PUTs succeeded, drop every further one until reset to None."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, access_token: str = "stub-token") -> None:
+        super().__init__((host, port), _StubHandler)
+        self.access_token = access_token
+        self.sessions: dict[str, StubSession] = {}
+        self.completed: dict[str, bytes] = {}  # external_id -> uploaded file
+        self.chunk_requests = 0
+        self.fail_after: int | None = None
+        self.lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> UploadStubServer:
+        self._thread = threading.Thread(target=self.serve_forever, name="upload-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as the real APIs
+    server: UploadStubServer
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        parts = urlsplit(self.path)
+        body = self._body()
+        if not self._authorized():
+            return self._reply(401, {"error": "unauthorized"})
+        session_id = uuid.uuid4().hex
+        if parts.path == "/upload/youtube/v3/videos" and parse_qs(parts.query).get("uploadType") == ["resumable"]:
+            size = int(self.headers.get("X-Upload-Content-Length", "0"))
+            title = json.loads(body or b"{}").get("snippet", {}).get("title", "")
+            with self.server.lock:
+                self.server.sessions[session_id] = StubSession(
+                    "youtube", size, title, external_id=f"yt_{session_id[:11]}"
+                )
+            location = f"{self.server.url}/upload/youtube/v3/videos?uploadType=resumable&upload_id={session_id}"
+            return self._reply(200, headers={"Location": location})
+        if parts.path == "/v2/post/publish/inbox/video/init/":
+            source = json.loads(body or b"{}").get("source_info", {})
+            publish_id = f"v_inbox_file~v2.{session_id[:16]}"
+            with self.server.lock:
+                self.server.sessions[session_id] = StubSession(
+                    "tiktok", int(source.get("video_size", 0)), external_id=publish_id
+                )
+            data = {"publish_id": publish_id, "upload_url": f"{self.server.url}/upload/tiktok/{session_id}"}
+            return self._reply(200, {"data": data, "error": {"code": "ok", "message": ""}})
+        self._reply(404, {"error": "not_found"})
+
+    def do_PUT(self) -> None:  # noqa: N802 - stdlib naming
+        parts = urlsplit(self.path)
+        if parts.path.startswith("/upload/tiktok/"):
+            session_id = parts.path.rsplit("/", 1)[-1]
+        else:
+            session_id = parse_qs(parts.query).get("upload_id", [""])[0]
+        session = self.server.sessions.get(session_id)
+        if session is None:
+            self._body()
+            return self._reply(404, {"error": "session_not_found"})
+        if session.platform == "youtube" and not self._authorized():
+            self._body()
+            return self._reply(401, {"error": "unauthorized"})
+        content_range = self.headers.get("Content-Range", "")
+        if content_range.startswith("bytes */"):
+            self._body()
+            return self._youtube_status(session)
+
+        with self.server.lock:
+            limit = self.server.fail_after
+            dropping = limit is not None and self.server.chunk_requests >= limit
+            if not dropping:
+                self.server.chunk_requests += 1
+        if dropping:
+            # Network loss mid-request: no response, connection gone.
+            self.close_connection = True
+            return
+        body = self._body()
+        match = _CONTENT_RANGE_RE.fullmatch(content_range)
+        if not match or int(match.group(2)) - int(match.group(1)) + 1 != len(body):
+            return self._reply(400, {"error": "bad_content_range"})
+        start, end = int(match.group(1)), int(match.group(2)) + 1
+        with self.server.lock:
+            if len(session.data) < session.size:
+                session.data.extend(bytes(session.size - len(session.data)))
+            session.data[start:end] = body
+            if session.platform == "youtube":
+                if start > session.committed:
+                    return self._youtube_status(session)
+                session.committed = max(session.committed, end)
+            else:
+                session.ranges.add((start, end))
+            complete = self._complete(session)
+        if session.platform == "youtube":
+            return self._youtube_status(session) if not complete else self._reply(200, {"id": session.external_id})
+        self._reply(201 if complete else 206)
+
+    def _complete(self, session: StubSession) -> bool:
+        if session.platform == "youtube":
+            done = session.committed >= session.size
+        else:
+            done = sum(end - start for start, end in session.ranges) >= session.size
+        if done:
+            self.server.completed[session.external_id] = bytes(session.data)
+        return done
+
+    def _youtube_status(self, session: StubSession) -> None:
+        if session.committed >= session.size:
+            return self._reply(200, {"id": session.external_id})
+        headers = {"Range": f"bytes=0-{session.committed - 1}"} if session.committed else {}
+        self._reply(308, headers=headers)
+
+    def _authorized(self) -> bool:
+        return self.headers.get("Authorization") == f"Bearer {self.server.access_token}"
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", "0") or 0))
+
+    def _reply(self, status: int, payload: dict | None = None, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local YouTube/TikTok resumable-upload stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--token", default="stub-token", help="expected bearer token")
+    args = parser.parse_args()
+    server = UploadStubServer(args.host, args.port, args.token)
+    print(f"upload stub listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import math
+
+from ai_service.core.optional import require_numpy
 from ai_service.models.schemas import MomentCandidate, TranscriptSegment
 
 EMOTIONAL_WORDS = {
@@ -23,42 +26,125 @@ class ViralScoringService:
         transcript: list[TranscriptSegment],
         audio_peaks: list[float],
         speech_rates: list[float],
+        visual_motion: list[float] | None = None,
     ) -> list[MomentCandidate]:
-        candidates: list[MomentCandidate] = []
+        return [
+            candidate for _, candidate in self.score_indexed(transcript, audio_peaks, speech_rates, visual_motion)
+        ]
+
+    def score_indexed(
+        self,
+        transcript: list[TranscriptSegment],
+        audio_peaks: list[float],
+        speech_rates: list[float],
+        visual_motion: list[float] | None = None,
+    ) -> list[tuple[int, MomentCandidate]]:
+        """Same as `score` but keeps the transcript index of every candidate."""
+        candidates: list[tuple[int, MomentCandidate]] = []
+        motion_signal = visual_motion or []
 
         for idx, segment in enumerate(transcript):
-            text = segment.text.lower()
-            lexical = min(1.0, sum(1 for w in EMOTIONAL_WORDS if w in text) / 3)
+            lexical = self.lexical_score(segment.text)
             peak = audio_peaks[idx] if idx < len(audio_peaks) else 0.5
             speech_rate_delta = speech_rates[idx] if idx < len(speech_rates) else 0.5
             pause_contrast = 0.7 if idx > 0 and transcript[idx - 1].end < segment.start + 0.1 else 0.3
-            visual_motion = 0.4
+            motion = motion_signal[idx] if idx < len(motion_signal) else 0.4
 
             score = (
                 0.30 * peak
                 + 0.25 * lexical
                 + 0.20 * speech_rate_delta
                 + 0.15 * pause_contrast
-                + 0.10 * visual_motion
+                + 0.10 * motion
             )
 
-            reasons: list[str] = []
-            if peak > 0.7:
-                reasons.append("audio_peak")
-            if lexical > 0.4:
-                reasons.append("emotional_phrase")
-            if speech_rate_delta > 0.7:
-                reasons.append("high_speech_rate")
-            if not reasons:
-                reasons.append("balanced_signal")
-
             candidates.append(
-                MomentCandidate(
-                    start=segment.start,
-                    end=segment.end,
-                    score=round(score, 3),
-                    reasons=reasons,
+                (
+                    idx,
+                    MomentCandidate(
+                        start=segment.start,
+                        end=segment.end,
+                        score=round(score, 3),
+                        reasons=_reasons(peak > 0.7, lexical > 0.4, speech_rate_delta > 0.7, motion > 0.7),
+                    ),
                 )
             )
 
-        return sorted(candidates, key=lambda c: c.score, reverse=True)
+        return sorted(candidates, key=lambda c: c[1].score, reverse=True)
+
+    @staticmethod
+    def lexical_score(text: str) -> float:
+        lowered = text.lower()
+        return min(1.0, sum(1 for w in EMOTIONAL_WORDS if w in lowered) / 3)
+
+    def feature_columns(
+        self,
+        transcript: list[TranscriptSegment],
+        audio_peaks: list[float],
+        speech_rates: list[float],
+        visual_motion: list[float] | None = None,
+    ) -> dict[str, list[float]]:
+        """Rows of the feature store's "segments" table; NaN where a signal is missing."""
+        motion_signal = visual_motion or []
+
+        def column(values: list[float]) -> list[float]:
+            return [values[idx] if idx < len(values) else math.nan for idx in range(len(transcript))]
+
+        return {
+            "start": [segment.start for segment in transcript],
+            "end": [segment.end for segment in transcript],
+            "audio_peak": column(audio_peaks),
+            "speech_rate": column(speech_rates),
+            "visual_motion": column(motion_signal),
+            "lexical": [self.lexical_score(segment.text) for segment in transcript],
+        }
+
+    def score_columns(self, columns: dict, limit: int | None = None) -> list[tuple[int, MomentCandidate]]:
+        """`score_indexed` over feature-store arrays (possibly memory-mapped), best `limit` first.
+
+        The weighting runs vectorised in float64, in the same operation order
+        as the per-segment loop, so both paths give identical scores and order.
+        """
+        np = require_numpy("feature-store scoring")
+        start = np.asarray(columns["start"], dtype=np.float64)
+        end = np.asarray(columns["end"], dtype=np.float64)
+        if len(start) == 0:
+            return []
+        peak = np.nan_to_num(np.asarray(columns["audio_peak"], dtype=np.float64), nan=0.5)
+        rate = np.nan_to_num(np.asarray(columns["speech_rate"], dtype=np.float64), nan=0.5)
+        motion = np.nan_to_num(np.asarray(columns["visual_motion"], dtype=np.float64), nan=0.4)
+        lexical = np.asarray(columns["lexical"], dtype=np.float64)
+        pause = np.full(len(start), 0.3)
+        pause[1:][end[:-1] < start[1:] + 0.1] = 0.7
+
+        score = 0.30 * peak + 0.25 * lexical + 0.20 * rate + 0.15 * pause + 0.10 * motion
+        # Python's round() is correctly rounded, np.round is not: keep the loop's values exactly.
+        rounded = np.array([round(value, 3) for value in score.tolist()])
+        order = np.argsort(-rounded, kind="stable")[:limit]
+        flags = np.stack([peak > 0.7, lexical > 0.4, rate > 0.7, motion > 0.7], axis=1)
+        return [
+            (
+                int(idx),
+                MomentCandidate(
+                    start=float(start[idx]),
+                    end=float(end[idx]),
+                    score=float(rounded[idx]),
+                    reasons=_reasons(*flags[idx].tolist()),
+                ),
+            )
+            for idx in order
+        ]
+
+
+def _reasons(audio_peak: bool, emotional: bool, high_rate: bool, motion: bool) -> list[str]:
+    reasons = [
+        name
+        for name, flag in (
+            ("audio_peak", audio_peak),
+            ("emotional_phrase", emotional),
+            ("high_speech_rate", high_rate),
+            ("visual_motion", motion),
+        )
+        if flag
+    ]
+    return reasons or ["balanced_signal"]
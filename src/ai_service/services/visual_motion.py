@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import math
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ai_service.core.metrics import registry
+from ai_service.core.optional import require_numpy
+from ai_service.models.schemas import TranscriptSegment
+from ai_service.repositories.sqlite_repo import SqliteRepository
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+class VisualMotionService:
+    """Frame-difference and scene-cut signal for the viral scorer.
+
+    Frames are decoded at `fps` as `width`x`height` grayscale rawvideo on
+    ffmpeg's stdout; the video is split into time ranges decoded by parallel
+    ffmpeg processes. The per-frame timeline is cached per source fingerprint.
+    """
+
+    def __init__(
+        self,
+        ffmpeg_bin: str = "ffmpeg",
+        repository: SqliteRepository | None = None,
+        fps: float = 4.0,
+        width: int = 64,
+        height: int = 36,
+        max_workers: int = 4,
+        min_range_seconds: float = 30.0,
+        cut_threshold: float = 0.35,
+    ) -> None:
+        self.ffmpeg_bin = ffmpeg_bin
+        self.repository = repository
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.max_workers = max_workers
+        self.min_range_seconds = min_range_seconds
+        self.cut_threshold = cut_threshold
+
+    def is_available(self) -> bool:
+        return shutil.which(self.ffmpeg_bin) is not None
+
+    def segment_motion(
+        self,
+        media_path: str,
+        transcript: list[TranscriptSegment],
+        fingerprint: str = "",
+    ) -> list[float]:
+        if not transcript:
+            return []
+        timeline = self.timeline(media_path, max(seg.end for seg in transcript), fingerprint)
+        return self.aggregate(timeline, transcript)
+
+    def timeline(self, media_path: str, fallback_duration: float = 0.0, fingerprint: str = "") -> dict:
+        """{"fps", "motion", "cuts"}: one value per decoded frame, frame i at i / fps seconds."""
+        cache_key = f"visual_motion:{self.fps}:{self.width}x{self.height}:{fingerprint}"
+        if fingerprint and self.repository is not None:
+            cached = self.repository.get_artifact(cache_key)
+            if cached is not None:
+                return cached  # type: ignore[return-value]
+
+        np = require_numpy("visual motion analysis")
+        if not Path(media_path).exists():
+            raise FileNotFoundError(media_path)
+        if not self.is_available():
+            raise RuntimeError("ffmpeg is not available in PATH")
+        duration = self.probe_duration(media_path) or fallback_duration
+        count = max(1, min(self.max_workers, math.ceil(duration / self.min_range_seconds)))
+        step = duration / count if duration > 0 else 0.0
+        ranges = [(idx * step, step if idx < count - 1 else 0.0) for idx in range(count)]
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="monteur-visual") as pool:
+            parts = list(pool.map(lambda r: self._decode_range(media_path, *r), ranges))
+
+        timeline = {
+            "fps": self.fps,
+            "motion": np.round(np.concatenate([p[0] for p in parts]), 4).tolist(),
+            "cuts": np.round(np.concatenate([p[1] for p in parts]), 4).tolist(),
+        }
+        if fingerprint and self.repository is not None:
+            self.repository.save_artifact(cache_key, "visual_motion", timeline)
+        return timeline
+
+    def probe_duration(self, media_path: str) -> float:
+        """Container duration from ffmpeg's banner (0.0 when unknown)."""
+        proc = subprocess.run(
+            [self.ffmpeg_bin, "-nostdin", "-hide_banner", "-i", media_path],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        match = _DURATION_RE.search(proc.stderr)
+        if not match:
+            return 0.0
+        hours, minutes, seconds = match.groups()
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    def _decode_range(self, media_path: str, start: float, length: float):
+        """Motion and cut score of every frame in [start, start + length); length 0 reads to the end."""
+        np = require_numpy("visual motion analysis")
+        # Start one frame early so the first frame of the range has a predecessor to diff against.
+        lead = 1.0 / self.fps if start > 0 else 0.0
+        cmd = [self.ffmpeg_bin, "-nostdin", "-v", "error", "-ss", f"{max(0.0, start - lead):.3f}", "-i", media_path]
+        if length > 0:
+            cmd += ["-t", f"{length + lead:.3f}"]
+        cmd += [
+            "-an",
+            "-vf",
+            f"fps={self.fps},scale={self.width}:{self.height},format=gray",
+            "-f",
+            "rawvideo",
+            "-",
+        ]
+        frame_bytes = self.width * self.height
+        motion: list = []
+        cuts: list = []
+        previous = None
+        with registry.span("subprocess_seconds", binary="ffmpeg"):
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            assert proc.stdout is not None
+            while True:
+                data = proc.stdout.read(frame_bytes * 64)
+                if len(data) < frame_bytes:
+                    break
+                usable = len(data) - len(data) % frame_bytes
+                frames = np.frombuffer(data[:usable], dtype=np.uint8).reshape(-1, frame_bytes)
+                if previous is not None:
+                    frames = np.vstack([previous, frames])
+                if len(frames) > 1:
+                    step_motion, step_cuts = self._frame_scores(frames)
+                    motion.append(step_motion)
+                    cuts.append(step_cuts)
+                previous = frames[-1:]
+            stderr = proc.stderr.read().decode(errors="replace") if proc.stderr is not None else ""
+            returncode = proc.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg frame decode failed: {stderr.strip()}")
+        empty = np.zeros(0, dtype=np.float32)
+        motion_arr = np.concatenate(motion) if motion else empty
+        cuts_arr = np.concatenate(cuts) if cuts else empty
+        if start == 0 and previous is not None:
+            # The very first frame has nothing before it.
+            motion_arr = np.concatenate([np.zeros(1, dtype=np.float32), motion_arr])
+            cuts_arr = np.concatenate([np.zeros(1, dtype=np.float32), cuts_arr])
+        return motion_arr, cuts_arr
+
+    @staticmethod
+    def _frame_scores(frames):
+        """For frames[1:]: mean absolute difference and 16-bin histogram distance to the previous frame."""
+        np = require_numpy("visual motion analysis")
+        pixels = frames.astype(np.int16)
+        motion = np.abs(np.diff(pixels, axis=0)).mean(axis=1) / 255.0
+        bins = (frames >> 4).astype(np.intp) + 16 * np.arange(len(frames))[:, None]
+        hist = np.bincount(bins.ravel(), minlength=16 * len(frames)).reshape(len(frames), 16) / frames.shape[1]
+        cuts = 0.5 * np.abs(np.diff(hist, axis=0)).sum(axis=1)
+        return motion.astype(np.float32), cuts.astype(np.float32)
+
+    def aggregate(self, timeline: dict, transcript: list[TranscriptSegment]) -> list[float]:
+        """Per segment: mean motion relative to the 95th percentile, at least 0.8 when a scene cut falls inside."""
+        np = require_numpy("visual motion analysis")
+        motion = np.asarray(timeline["motion"], dtype=np.float64)
+        cuts = np.asarray(timeline["cuts"], dtype=np.float64)
+        if not transcript:
+            return []
+        if motion.size == 0:
+            return [0.0] * len(transcript)
+        fps = float(timeline["fps"])
+        starts = np.fromiter((seg.start for seg in transcript), dtype=np.float64, count=len(transcript))
+        ends = np.fromiter((seg.end for seg in transcript), dtype=np.float64, count=len(transcript))
+        times = np.arange(motion.size) / fps
+        lo = np.clip(np.searchsorted(times, starts, side="left"), 0, motion.size - 1)
+        hi = np.clip(np.maximum(np.searchsorted(times, ends, side="left"), lo + 1), 1, motion.size)
+
+        motion_sum = np.concatenate([[0.0], np.cumsum(motion)])
+        cut_count = np.concatenate([[0], np.cumsum(cuts >= self.cut_threshold)])
+        mean_motion = (motion_sum[hi] - motion_sum[lo]) / (hi - lo)
+        reference = np.percentile(motion, 95)
+        scores = np.clip(mean_motion / reference, 0.0, 1.0) if reference > 0 else np.zeros(len(transcript))
+        has_cut = (cut_count[hi] - cut_count[lo]) > 0
+        return np.round(np.where(has_cut, np.maximum(scores, 0.8), scores), 3).tolist()
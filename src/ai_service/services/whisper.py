@@ -1,23 +1,59 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import subprocess
+import tempfile
 import time
 from pathlib import Path
 from urllib import request
 
+from ai_service.core.metrics import registry
 from ai_service.models.schemas import TranscriptSegment
+from ai_service.repositories.scratch_space import ScratchSpace
+from ai_service.services.whisper_worker import WhisperWorkerSupervisor
 
 
 class WhisperService:
-    def __init__(self, whisper_bin: str = "whisper") -> None:
+    def __init__(
+        self,
+        whisper_bin: str = "whisper",
+        model_name: str = "base",
+        worker: WhisperWorkerSupervisor | None = None,
+        scratch: ScratchSpace | None = None,
+    ) -> None:
         self.whisper_bin = whisper_bin
+        self.model_name = model_name
+        self.worker = worker
+        self.scratch = scratch
 
     def transcribe_local(self, audio_path: str, language: str) -> list[TranscriptSegment]:
         if not Path(audio_path).exists():
             raise FileNotFoundError(audio_path)
 
+        if self.worker is not None:
+            # Resident process: the model is already loaded, only inference is paid.
+            return self.worker.transcribe(audio_path, language)
+
+        if self.scratch is None:
+            with tempfile.TemporaryDirectory() as output_dir:
+                return self._parse_output(self._run_cli(audio_path, language, output_dir))
+
+        # Whisper's JSON lives in the transcripts scratch namespace, keyed by source, model and language.
+        stat = Path(audio_path).stat()
+        identity = f"{Path(audio_path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{self.model_name}:{language}"
+        key = hashlib.sha256(identity.encode()).hexdigest()[:32]
+        if self.scratch.lookup("transcripts", key, ".json") is None:
+            with self.scratch.staging() as output_dir:
+                self.scratch.commit("transcripts", key, self._run_cli(audio_path, language, str(output_dir)), ".json")
+        try:
+            with self.scratch.pin("transcripts", key, ".json") as json_path:
+                return self._parse_output(json_path)
+        except KeyError:  # evicted between commit and pin by a concurrent writer
+            return self.transcribe_local(audio_path, language)
+
+    def _run_cli(self, audio_path: str, language: str, output_dir: str) -> Path:
         cmd = [
             self.whisper_bin,
             audio_path,
@@ -25,18 +61,25 @@ class WhisperService:
             language,
             "--output_format",
             "json",
+            "--output_dir",
+            output_dir,
             "--model",
-            "base",
+            self.model_name,
         ]
-        proc = subprocess.run(cmd, capture_output=True, text=True, check=False, timeout=900)
+        with registry.span("subprocess_seconds", binary="whisper"):
+            proc = subprocess.run(cmd, capture_output=True, text=True, check=False, timeout=900)
         if proc.returncode != 0:
             raise RuntimeError(f"whisper local failed: {proc.stderr.strip()}")
 
-        json_path = Path(audio_path).with_suffix(".json")
+        json_path = Path(output_dir) / f"{Path(audio_path).stem}.json"
         if not json_path.exists():
             raise RuntimeError("Whisper completed but json output was not found")
+        return json_path
 
-        data = json.loads(json_path.read_text())
+    @staticmethod
+    def _parse_output(json_path: Path) -> list[TranscriptSegment]:
+        with registry.span("service_call_seconds", service="whisper.parse_output"):
+            data = json.loads(json_path.read_text())
         return [
             TranscriptSegment(
                 start=float(seg.get("start", 0.0)),
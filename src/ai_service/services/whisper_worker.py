@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from multiprocessing.connection import Connection
+from typing import Callable
+
+from ai_service.core.metrics import registry
+from ai_service.models.schemas import TranscriptSegment
+
+logger = logging.getLogger("ai_service.whisper_worker")
+
+TranscribeFn = Callable[[str, str], dict]
+ModelLoader = Callable[[str], TranscribeFn]
+
+
+def load_whisper_model(model_name: str) -> TranscribeFn:
+    """Default loader: runs inside the worker process only."""
+    import whisper  # openai-whisper, optional dependency
+
+    model = whisper.load_model(model_name)
+
+    def transcribe(audio_path: str, language: str) -> dict:
+        return model.transcribe(audio_path, language=language)
+
+    return transcribe
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows: no cheap portable probe, caps are disabled
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def worker_main(conn: Connection, model_name: str, loader: ModelLoader) -> None:
+    """Worker loop: load the model once, then serve jobs from the pipe."""
+    try:
+        transcribe = loader(model_name)
+    except Exception as exc:  # model missing, import error, OOM...
+        conn.send({"type": "error", "error": f"model load failed: {exc}"})
+        return
+    conn.send({"type": "ready", "rss_bytes": _rss_bytes()})
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        kind = message.get("type")
+        if kind == "stop":
+            return
+        if kind == "ping":
+            conn.send({"type": "pong", "rss_bytes": _rss_bytes()})
+            continue
+        if kind != "transcribe":
+            conn.send({"type": "error", "error": f"unknown message: {kind}", "rss_bytes": _rss_bytes()})
+            continue
+        try:
+            data = transcribe(message["audio_path"], message["language"])
+            segments = [
+                {
+                    "start": float(seg.get("start", 0.0)),
+                    "end": float(seg.get("end", 0.0)),
+                    "text": str(seg.get("text", "")).strip(),
+                }
+                for seg in data.get("segments", [])
+            ]
+            conn.send({"type": "result", "segments": segments, "rss_bytes": _rss_bytes()})
+        except Exception as exc:
+            conn.send({"type": "error", "error": str(exc), "rss_bytes": _rss_bytes()})
+
+
+class WhisperWorkerSupervisor:
+    """Keeps one whisper process warm, restarts it on crash and recycles it on memory cap."""
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        max_rss_bytes: int = 0,
+        max_jobs: int = 0,
+        health_interval: float = 15.0,
+        ready_timeout: float = 600.0,
+        job_timeout: float = 900.0,
+        loader: ModelLoader = load_whisper_model,
+    ) -> None:
+        self.model_name = model_name
+        self.max_rss_bytes = max_rss_bytes
+        self.max_jobs = max_jobs
+        self.health_interval = health_interval
+        self.ready_timeout = ready_timeout
+        self.job_timeout = job_timeout
+        self.loader = loader
+        self.restarts = 0
+        self.jobs_done = 0
+        self.last_rss_bytes = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._ready = False
+        self._jobs_since_spawn = 0
+        self._stop_event = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._process is None:
+                self._spawn()
+        if self._monitor is None and self.health_interval > 0:
+            self._stop_event.clear()
+            self._monitor = threading.Thread(target=self._monitor_loop, name="whisper-worker-monitor", daemon=True)
+            self._monitor.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=5)
+            self._monitor = None
+        with self._lock:
+            self._terminate()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def status(self) -> dict[str, str | int | bool]:
+        return {
+            "alive": self.is_alive(),
+            "ready": self._ready,
+            "model": self.model_name,
+            "pid": self._process.pid if self._process is not None and self._process.pid else 0,
+            "restarts": self.restarts,
+            "jobs_done": self.jobs_done,
+            "rss_bytes": self.last_rss_bytes,
+        }
+
+    def transcribe(self, audio_path: str, language: str) -> list[TranscriptSegment]:
+        with self._lock:
+            if not self.is_alive():
+                self._restart("worker not running")
+            try:
+                self._await_ready(self.ready_timeout)
+                with registry.span("subprocess_seconds", binary="whisper-worker"):
+                    reply = self._request(
+                        {"type": "transcribe", "audio_path": audio_path, "language": language},
+                        self.job_timeout,
+                    )
+            except (EOFError, OSError, TimeoutError) as exc:
+                self._restart(f"job failed: {exc}")
+                raise RuntimeError(f"whisper worker failed: {exc}") from exc
+
+            self.jobs_done += 1
+            self._jobs_since_spawn += 1
+            self.last_rss_bytes = int(reply.get("rss_bytes", 0))
+            self._recycle_if_needed()
+
+        if reply.get("type") != "result":
+            raise RuntimeError(f"whisper worker failed: {reply.get('error', 'unknown error')}")
+        return [
+            TranscriptSegment(start=seg["start"], end=seg["end"], text=seg["text"], confidence=0.9, speaker="S1")
+            for seg in reply["segments"]
+        ]
+
+    def check_health(self) -> bool:
+        """Ping the worker unless a job holds the pipe; restart it if unresponsive."""
+        if not self._lock.acquire(blocking=False):
+            return True  # busy with a job, which is a sign of life
+        try:
+            if self._process is None:
+                return False
+            if not self.is_alive():
+                self._restart("worker exited")
+                return False
+            try:
+                if not self._ready:
+                    self._await_ready(0)
+                    return True
+                reply = self._request({"type": "ping"}, timeout=10.0)
+            except TimeoutError:
+                if not self._ready:
+                    return True  # still loading the model
+                self._restart("health check timed out")
+                return False
+            except (EOFError, OSError, RuntimeError) as exc:
+                self._restart(f"health check failed: {exc}")
+                return False
+            self.last_rss_bytes = int(reply.get("rss_bytes", 0))
+            self._recycle_if_needed()
+            return True
+        finally:
+            self._lock.release()
+
+    def _monitor_loop(self) -> None:
+        while not self._stop_event.wait(self.health_interval):
+            try:
+                self.check_health()
+            except Exception:
+                logger.exception("whisper_worker_monitor_error")
+
+    def _spawn(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=worker_main,
+            args=(child_conn, self.model_name, self.loader),
+            name="monteur-whisper-worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        self._ready = False
+        self._jobs_since_spawn = 0
+        logger.info("whisper_worker_started", extra={"extra_payload": {"pid": process.pid, "model": self.model_name}})
+
+    def _terminate(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.send({"type": "stop"})
+            except (OSError, ValueError):
+                pass
+        if self._process is not None:
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join(timeout=2)
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+        self._ready = False
+
+    def _restart(self, reason: str) -> None:
+        logger.warning("whisper_worker_restart", extra={"extra_payload": {"reason": reason}})
+        self._terminate()
+        self.restarts += 1
+        self._spawn()
+
+    def _recycle_if_needed(self) -> None:
+        if self.max_rss_bytes and self.last_rss_bytes > self.max_rss_bytes:
+            self._restart(f"rss {self.last_rss_bytes} above cap {self.max_rss_bytes}")
+        elif self.max_jobs and self._jobs_since_spawn >= self.max_jobs:
+            self._restart(f"recycled after {self._jobs_since_spawn} jobs")
+
+    def _await_ready(self, timeout: float) -> None:
+        if self._ready:
+            return
+        reply = self._receive(timeout)
+        if reply.get("type") != "ready":
+            raise RuntimeError(reply.get("error", "whisper worker did not start"))
+        self._ready = True
+        self.last_rss_bytes = int(reply.get("rss_bytes", 0))
+
+    def _request(self, message: dict, timeout: float) -> dict:
+        assert self._conn is not None
+        self._conn.send(message)
+        return self._receive(timeout)
+
+    def _receive(self, timeout: float) -> dict:
+        assert self._conn is not None
+        if not self._conn.poll(timeout):
+            raise TimeoutError(f"no reply from whisper worker within {timeout}s")
+        return self._conn.recv()
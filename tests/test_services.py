@@ -1,29 +1,69 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
 from pathlib import Path
 
 import pytest
 
+from ai_service import main as main_module
 from ai_service.core.config import Settings, validate_settings
+from ai_service.core.logging_utils import JsonFormatter, configure_logging, shutdown_logging
+from ai_service.core.metrics import MetricsRegistry, request_id_var
+from ai_service.core.profiler import RequestProfiler
+from ai_service.core.transport import bind_endpoint, unix_sockets_supported, write_endpoint_file
 from ai_service.main import (
+    BATCH_HANDLERS,
+    AppError,
+    arm_request_profile,
+    auto_edit,
+    batch_service,
     create_project,
     enqueue_cloud_job,
     export_to_platform,
     get_analytics,
     get_cloud_job,
+    last_request_profile,
     prepare_export,
+    prepare_jump_cut,
     process_cloud_job,
+    score_moments,
 )
 from ai_service.models.schemas import (
+    AutoEditRequest,
+    BatchOperation,
     CloudJobRequest,
     ExportPlatformRequest,
     ExportRequest,
+    HookClip,
+    JumpCutRequest,
+    KeepRange,
     ProjectCreateRequest,
     ScoreMomentsRequest,
+    SilenceSegment,
     TranscriptSegment,
 )
+from ai_service.repositories import feature_store as feature_store_module
+from ai_service.repositories.feature_store import FeatureStore
+from ai_service.repositories.scratch_space import ScratchSpace
+from ai_service.repositories.sqlite_repo import SqliteRepository
+from ai_service.services.audio_features import AudioFeatureService
+from ai_service.services.cloud import CloudJobService, PlatformExportService
+from ai_service.services.ffmpeg_pipeline import FFmpegPipelineService, keep_ranges
 from ai_service.services.hooks import HookService
+from ai_service.services.loudness import LoudnessService
+from ai_service.services.maintenance import JobMaintenanceService
+from ai_service.services.platform_upload import TikTokUploadProtocol, YouTubeUploadProtocol
+from ai_service.services.search import TranscriptSearchService
 from ai_service.services.silence import SilenceDetectionService
 from ai_service.services.transcription import TranscriptionService
+from ai_service.services.upload_stub import UploadStubServer
 from ai_service.services.viral import ViralScoringService
+from ai_service.services.visual_motion import VisualMotionService
+from ai_service.services.whisper import WhisperService
+from ai_service.services.whisper_worker import WhisperWorkerSupervisor
 
 
 def test_silence_detection_returns_segments():
@@ -59,12 +99,102 @@ def test_hooks_generation_limit():
     assert len(hooks) == 1
 
 
+def test_hooks_pick_top_scored_segment_and_batch():
+    transcript = [
+        TranscriptSegment(start=0, end=2, text="Bonjour à tous, bienvenue.", confidence=0.9),
+        TranscriptSegment(start=2, end=5, text="Alors, le secret important pour gagner du temps.", confidence=0.9),
+        TranscriptSegment(start=5, end=8, text="On passe à la suite.", confidence=0.9),
+    ]
+    service = HookService()
+    hooks = service.generate(transcript, style="generic", limit=1, project_id="p1")
+    assert hooks == ["Tu fais sûrement ça aussi : le secret important pour gagner du temps"]
+    assert service.generate(transcript, style="generic", limit=1, project_id="p1") == hooks
+
+    batch = service.generate_batch(
+        transcript,
+        clips=[HookClip(start=0, end=2), HookClip(start=4, end=8), HookClip(start=20, end=30)],
+        style="generic",
+        limit=1,
+        project_id="p1",
+    )
+    assert batch[0] == ["Tu fais sûrement ça aussi : Bonjour à tous"]
+    assert batch[1] == hooks
+    assert batch[2] == []
+    assert service.generate_batch(
+        transcript, clips=[HookClip(start=0, end=2)], style="generic", limit=0, project_id="p1"
+    ) == [[]]
+
+
+def test_audio_features_align_envelope_and_speech_rate_to_segments():
+    np = pytest.importorskip("numpy")
+    service = AudioFeatureService(window=0.5)
+    envelope = np.array([0.01, 0.01, 0.8, 0.02, 0.01, 0.3], dtype=np.float32)  # 3 seconds
+    transcript = [
+        TranscriptSegment(start=0.0, end=0.9, text="un deux", confidence=0.9),
+        TranscriptSegment(start=1.0, end=1.4, text="trois quatre cinq six", confidence=0.9),
+        TranscriptSegment(start=2.0, end=3.0, text="sept huit", confidence=0.9),
+    ]
+    peaks = service.segment_peaks(envelope, transcript)
+    assert peaks[1] == 1.0
+    assert peaks[0] < peaks[2] < peaks[1]
+    rates = service.speech_rates(transcript)
+    assert rates[0] == 0.5 and rates[1] == 1.0 and rates[2] < 0.5
+
+
+def test_visual_motion_scores_cuts_and_caches_per_fingerprint(tmp_path: Path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"fake")
+    service = VisualMotionService(repository=SqliteRepository(str(tmp_path / "visual.db")), fps=2, width=4, height=2)
+    dark, bright = np.zeros(8, dtype=np.uint8), np.full(8, 240, dtype=np.uint8)
+    frames = np.stack([dark, dark, dark, dark, bright, bright])  # cut between t=1.5 and t=2.0
+    motion, cuts = service._frame_scores(frames)
+    assert cuts.tolist() == [0.0, 0.0, 0.0, 1.0, 0.0]
+
+    decoded: list[tuple[float, float]] = []
+
+    def fake_decode(path: str, start: float, length: float):
+        decoded.append((start, length))
+        return np.concatenate([[0.0], motion]), np.concatenate([[0.0], cuts])
+
+    monkeypatch.setattr(service, "is_available", lambda: True)
+    monkeypatch.setattr(service, "probe_duration", lambda path: 3.0)
+    monkeypatch.setattr(service, "_decode_range", fake_decode)
+    transcript = [
+        TranscriptSegment(start=0.0, end=1.4, text="calme", confidence=0.9),
+        TranscriptSegment(start=1.5, end=3.0, text="changement de plan", confidence=0.9),
+    ]
+    first = service.segment_motion(str(video), transcript, fingerprint="clip-v1")
+    assert first[0] == 0.0 and first[1] >= 0.8
+    assert service.segment_motion(str(video), transcript, fingerprint="clip-v1") == first
+    assert decoded == [(0.0, 0.0)]
+
+    scored = ViralScoringService().score(transcript, [0.5, 0.5], [0.5, 0.5], first)
+    assert scored[0].end == 3.0 and "visual_motion" in scored[0].reasons
+
+
 def test_request_model_defaults():
     req = ScoreMomentsRequest()
     assert req.transcript == []
     assert req.audio_peaks == []
 
 
+def test_score_moments_keeps_audio_peaks_when_motion_fails(tmp_path: Path, monkeypatch):
+    audio = tmp_path / "podcast.m4a"
+    audio.write_bytes(b"fake")
+    transcript = [TranscriptSegment(start=0.0, end=2.0, text="Une erreur", confidence=0.9)]
+    monkeypatch.setattr(main_module.audio_features, "loudness_envelope", lambda path: [0.5])
+    monkeypatch.setattr(main_module.audio_features, "segment_peaks", lambda envelope, segments: [0.9])
+    monkeypatch.setattr(main_module.visual_motion, "segment_motion", _raise_runtime_error)
+    scored = score_moments(ScoreMomentsRequest(transcript=transcript, video_path=str(audio)))
+    assert "audio_peak" in scored.candidates[0].reasons
+
+    monkeypatch.setattr(main_module.audio_features, "loudness_envelope", _raise_runtime_error)
+    with pytest.raises(AppError) as raised:
+        score_moments(ScoreMomentsRequest(transcript=transcript, video_path=str(audio)))
+    assert raised.value.status_code == 503
+
+
 def test_project_create_and_export_command(tmp_path: Path):
     video = tmp_path / "input.mp4"
     video.write_bytes(b"fake")
@@ -86,8 +216,153 @@ def test_project_create_and_export_command(tmp_path: Path):
     assert "subtitles=captions.srt" in export.command[5]
 
 
-def test_cloud_job_and_platform_export():
-    queued = enqueue_cloud_job(CloudJobRequest(operation="viral-score", payload={"clip": "a"}))
+def test_jump_cut_builds_one_filter_script_from_silences(tmp_path: Path):
+    silences = [
+        SilenceSegment(start=2.0, end=4.0),
+        SilenceSegment(start=5.0, end=5.3),  # too short once padded: kept
+        SilenceSegment(start=8.0, end=10.0),
+    ]
+    ranges = keep_ranges(silences, duration=10.0, padding=0.1, min_cut=0.3)
+    assert [(r.start, r.end) for r in ranges] == [(0.0, 2.1), (3.9, 8.1)]
+
+    response = prepare_jump_cut(
+        JumpCutRequest(
+            input_path="in.mp4",
+            output_path=str(tmp_path / "out" / "short.mp4"),
+            duration=10.0,
+            silences=silences,
+            aspect_ratio="1:1",
+        )
+    )
+    assert response.kept_seconds == 6.3
+    assert response.command[response.command.index("-filter_complex_script") + 1] == response.filter_script
+    script = Path(response.filter_script).read_text()
+    assert "select='between(t,0.000,2.100)+between(t,3.900,8.100)'" in script
+    assert "aselect=" in script and "scale=1080:1080" in script
+
+
+def test_loudness_measured_once_and_injected_as_linear_loudnorm(tmp_path: Path, monkeypatch):
+    video = tmp_path / "long.mp4"
+    video.write_bytes(b"fake")
+    lines = []
+    for step in range(1, 21):  # 2 s of ebur128 frames: loud first second, quiet second
+        level = -20.0 if step <= 10 else -40.0
+        lines.append(
+            f"[Parsed_ebur128_0 @ 0x1] t: {step / 10:<10} TARGET:-23 LUFS    M:{level:6.1f} S:{level:6.1f}     "
+            f"I: -23.0 LUFS       LRA:   3.0 LU  FTPK: {level + 8:5.1f} {level + 7:5.1f} dBFS  TPK:  -5.0  -6.0 dBFS"
+        )
+    summary = (
+        '{\n"input_i" : "-22.60",\n"input_tp" : "-12.00",\n"input_lra" : "9.50",\n'
+        '"input_thresh" : "-32.60",\n"target_offset" : "0.40"\n}'
+    )
+    runs: list[str] = []
+    service = LoudnessService(repository=SqliteRepository(str(tmp_path / "loudness.db")))
+    monkeypatch.setattr(service, "is_available", lambda: True)
+    monkeypatch.setattr(service, "_run_analysis", lambda path: runs.append(path) or "\n".join(lines) + "\n" + summary)
+
+    stats = service.analyze(str(video), fingerprint="long-v1")
+    assert service.analyze(str(video), fingerprint="long-v1") == stats
+    assert runs == [str(video)]
+    assert stats.integrated == -22.6 and stats.target_offset == 0.4
+    assert stats.momentary == [-20.0, -20.0, -22.97, -40.0, -40.0]  # 0.4 s windows, energy-averaged
+    assert stats.peaks[0] == -12.0
+
+    whole = service.loudnorm_filter(stats, target=-14.0)
+    assert "measured_I=-22.60" in whole and "offset=0.40" in whole and "linear=true" in whole
+    # The loud part alone: its own loudness, and a target lowered so the peak stays under -1.5 dBTP.
+    clip = service.measurements(stats, [(0.0, 0.8)])
+    assert clip["I"] == -20.0 and clip["TP"] == -12.0
+    assert "I=-14.00:" in service.loudnorm_filter(stats, -14.0, [(0.0, 0.8)])
+    assert "I=-9.50:" in service.loudnorm_filter(stats, -5.0, [(0.0, 0.8)])
+
+    script = FFmpegPipelineService().build_jump_cut_filter([KeepRange(start=0.0, end=0.8)], "9:16", audio_filter=whole)
+    assert script.rstrip().endswith(f"asetpts=N/SR/TB,{whole}[a]")
+
+
+def test_feature_store_appends_memory_maps_and_matches_list_scoring(tmp_path: Path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    store = FeatureStore(str(tmp_path / "features"))
+    durations, amplitudes = [0.1] * 40, [0.9] * 10 + [0.01] * 5 + [0.9] * 5 + [0.02] * 15 + [0.5] * 5
+    store.write("p1", "envelope", {"duration": durations[:25], "amplitude": amplitudes[:25]})
+    assert store.append("p1", "envelope", {"duration": durations[25:], "amplitude": amplitudes[25:]}) == 40
+    envelope = store.load("p1", "envelope")
+    assert isinstance(envelope["amplitude"].base, np.memmap) and len(envelope["amplitude"]) == 40
+    silences = SilenceDetectionService()
+    assert silences.detect_columns(envelope["duration"], envelope["amplitude"], 0.12) == silences.detect(
+        durations, amplitudes, 0.12
+    )
+
+    transcript = [
+        TranscriptSegment(start=0.0, end=2.0, text="Une erreur incroyable", confidence=0.9),
+        TranscriptSegment(start=2.05, end=4.0, text="suite", confidence=0.9),
+        TranscriptSegment(start=5.0, end=7.0, text="Le secret important pour gagner", confidence=0.9),
+        TranscriptSegment(start=7.0, end=9.0, text="fin", confidence=0.9),
+    ]
+    scorer = ViralScoringService()
+    columns = scorer.feature_columns(transcript, [0.9, 0.2], [0.8, 0.4, 0.6], None)
+    store.write("p1", "segments", columns, source="v1")
+    stored = store.load("p1", "segments", source="v1")
+    assert scorer.score_columns(stored) == scorer.score_indexed(transcript, [0.9, 0.2], [0.8, 0.4, 0.6])
+    assert store.load("p1", "segments", source="v2") is None
+
+    # A schema bump invalidates every table without touching the files.
+    monkeypatch.setattr(feature_store_module, "FEATURE_SCHEMA_VERSION", feature_store_module.FEATURE_SCHEMA_VERSION + 1)
+    assert store.load("p1", "segments") is None
+    assert store.append("p1", "envelope", {"duration": [0.1], "amplitude": [0.5]}) == 1
+
+
+def _raise_runtime_error(*args, **kwargs):
+    raise RuntimeError("ffmpeg audio decode failed: no audio stream")
+
+
+def test_auto_edit_reuses_analysis_when_only_ratio_changes(tmp_path: Path, monkeypatch):
+    # Whether or not ffmpeg is installed, decoding fails here: the stages must fall back to neutral signals.
+    monkeypatch.setattr(main_module.audio_features, "is_available", lambda: True)
+    monkeypatch.setattr(main_module.audio_features, "extract", _raise_runtime_error)
+    monkeypatch.setattr(main_module.visual_motion, "is_available", lambda: True)
+    monkeypatch.setattr(main_module.visual_motion, "segment_motion", _raise_runtime_error)
+    video = tmp_path / "long.mp4"
+    video.write_bytes(b"fake")
+    req = AutoEditRequest(
+        project_id="auto-1",
+        video_path=str(video),
+        output_path=str(tmp_path / "short.mp4"),
+        durations=[0.5, 0.5, 0.5],
+        amplitudes=[0.9, 0.01, 0.9],
+    )
+    first = auto_edit(req)
+    assert sorted(first.executed_stages) == [
+        "audio_features",
+        "create_project",
+        "detect_silences",
+        "generate_hooks",
+        "prepare_export",
+        "score_moments",
+        "transcribe",
+        "visual_motion",
+    ]
+    assert first.outputs["detect_silences"]["silences"] == [{"start": 0.5, "end": 1.0}]
+    assert first.outputs["audio_features"]["audio_peaks"] == []
+    assert first.outputs["visual_motion"]["visual_motion"] == []
+
+    req.aspect_ratio = "1:1"
+    second = auto_edit(req)
+    assert second.executed_stages == ["prepare_export"]
+    assert "scale=1080:1080" in second.outputs["prepare_export"]["command"][5]
+    assert second.outputs["generate_hooks"] == first.outputs["generate_hooks"]
+
+    # No audio track: the same 503 as /pipeline/export/prepare, before any stage runs.
+    monkeypatch.setattr(main_module.loudness, "is_available", lambda: True)
+    monkeypatch.setattr(main_module.loudness, "_run_analysis", _raise_runtime_error)
+    req.normalize_audio = True
+    with pytest.raises(AppError) as raised:
+        auto_edit(req)
+    assert raised.value.status_code == 503 and str(raised.value) == "loudness_analysis_unavailable"
+
+
+def test_cloud_job_and_platform_export(tmp_path: Path, monkeypatch):
+    # Identical payloads are deduplicated, so make this one unique per run.
+    queued = enqueue_cloud_job(CloudJobRequest(operation="viral-score", payload={"clip": str(uuid.uuid4())}))
     assert queued.job.status == "queued"
 
     done = process_cloud_job(queued.job.id)
@@ -97,16 +372,361 @@ def test_cloud_job_and_platform_export():
     retrieved = get_cloud_job(queued.job.id)
     assert retrieved.status == "done"
 
-    export = export_to_platform(
-        ExportPlatformRequest(platform="youtube", file_path="/tmp/x.mp4", title="Test")
-    )
-    assert export.platform == "youtube"
-    assert export.status == "queued"
+    video = tmp_path / "x.mp4"
+    video.write_bytes(b"\0" * 1024)
+    youtube = main_module.platform_export.protocols["youtube"]
+    monkeypatch.setattr(youtube, "access_token", "")
+    with pytest.raises(AppError) as raised:
+        export_to_platform(ExportPlatformRequest(platform="youtube", file_path=str(video), title="Test"))
+    assert raised.value.status_code == 503 and str(raised.value) == "youtube_access_token_missing"
+
+    stub = UploadStubServer().start()
+    try:
+        monkeypatch.setattr(youtube, "base_url", stub.url)
+        monkeypatch.setattr(youtube, "access_token", stub.access_token)
+        export = export_to_platform(ExportPlatformRequest(platform="youtube", file_path=str(video), title="Test"))
+        assert export.platform == "youtube"
+        assert export.status == "queued"
+        assert export.upload_id
+        assert main_module.platform_export.wait(export.upload_id, timeout=10).status == "done"
+    finally:
+        stub.stop()
 
     events = get_analytics()
     assert len(events) >= 1
 
 
+def test_batch_isolates_errors_and_records_analytics_once():
+    before = len(get_analytics())
+    results = list(
+        batch_service.run(
+            [
+                BatchOperation(id="s", operation="detect-silences", payload={"durations": [1, 1], "amplitudes": [0, 0]}),
+                BatchOperation(id="h", operation="generate-hooks", payload={"transcript": [{"start": 0}]}),
+            ],
+            BATCH_HANDLERS,
+        )
+    )
+    by_id = {item.id: item for item in results}
+    assert by_id["s"].status == "ok"
+    assert by_id["s"].result == {"silences": [{"start": 0.0, "end": 2.0}]}
+    assert by_id["h"].status == "error"
+    assert [e["name"] for e in get_analytics()[before:]] == ["silence_detection_done", "batch_done"]
+
+
+def test_metrics_histograms_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.describe("sqlite_op_seconds", "SQLite latency")
+    registry.observe("sqlite_op_seconds", 0.003, op="save_job")
+    with registry.span("sqlite_op_seconds", op="save_job"):
+        pass
+    text = registry.render_prometheus()
+    assert "# TYPE sqlite_op_seconds histogram" in text
+    assert 'sqlite_op_seconds_bucket{op="save_job",le="0.005"} 2' in text
+    assert 'sqlite_op_seconds_bucket{op="save_job",le="+Inf"} 2' in text
+    assert 'sqlite_op_seconds_count{op="save_job"} 2' in text
+
+
+def test_json_log_lines_carry_request_id():
+    token = request_id_var.set("req-42")
+    try:
+        record = logging.LogRecord("ai_service", logging.INFO, __file__, 1, "hello", None, None)
+        assert json.loads(JsonFormatter().format(record))["request_id"] == "req-42"
+    finally:
+        request_id_var.reset(token)
+
+
+def test_queued_logging_rotates_file_and_samples_debug(tmp_path: Path):
+    log_file = tmp_path / "backend.log"
+    configure_logging(log_file=str(log_file), level="DEBUG", max_bytes=2000, backups=2, debug_sample_rate=0.1)
+    try:
+        log = logging.getLogger("ai_service.test")
+        for _ in range(20):
+            log.debug("frame_decoded")
+        for idx in range(40):
+            log.info("segment_scored", extra={"extra_payload": {"idx": idx}})
+    finally:
+        shutdown_logging()
+    lines = [json.loads(line) for path in sorted(tmp_path.glob("backend.log*")) for line in path.read_text().splitlines()]
+    assert sum(1 for line in lines if line["message"] == "frame_decoded") == 2
+    assert (tmp_path / "backend.log.1").exists()
+    assert any(line.get("idx") == 39 for line in lines)
+    configure_logging()
+
+
+def _busy_loop(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(200))
+
+
+def test_request_profiler_samples_only_the_next_matching_request():
+    profiler = RequestProfiler()
+    with profiler.capture("/score-moments"):
+        pass
+    assert profiler.last is None
+
+    profiler.arm("/score-moments", fmt="speedscope", interval=0.001)
+    with profiler.capture("/generate-hooks"):
+        pass
+    assert profiler.armed is True
+    with profiler.capture("/score-moments"):
+        _busy_loop(0.05)
+    assert profiler.armed is False
+
+    profile = profiler.last
+    assert profile["route"] == "/score-moments"
+    assert len(profile["profiles"]) == 1
+    names = {profile["shared"]["frames"][i]["name"] for sample in profile["profiles"][0]["samples"] for i in sample}
+    assert "_busy_loop" in names
+
+
+def test_profiler_endpoints_need_the_opt_in_flag_even_in_prod(monkeypatch):
+    monkeypatch.setattr(main_module, "request_profiler", RequestProfiler())
+    monkeypatch.setattr(main_module, "settings", Settings(app_env="prod", api_key="k"))
+    with pytest.raises(AppError) as exc:
+        last_request_profile()
+    assert exc.value.status_code == 403
+
+    monkeypatch.setattr(main_module, "settings", Settings(app_env="prod", api_key="k", admin_profiler=True))
+    assert arm_request_profile("/score-moments")["armed"] is True
+    with pytest.raises(AppError) as exc:
+        last_request_profile()
+    assert exc.value.status_code == 404
+
+
+def test_armed_profile_fires_for_an_async_route(monkeypatch, tmp_path: Path):
+    testclient = pytest.importorskip("fastapi.testclient")
+    cloud_jobs = CloudJobService(SqliteRepository(str(tmp_path / "jobs.db")), poll_interval=0.05)
+    job, _ = cloud_jobs.enqueue("viral-score", {"clip": "a"})
+    monkeypatch.setattr(main_module, "cloud_jobs", cloud_jobs)
+    monkeypatch.setattr(main_module, "request_profiler", RequestProfiler())
+    monkeypatch.setattr(main_module, "settings", Settings(admin_profiler=True))
+
+    client = testclient.TestClient(main_module.create_fastapi_app())
+    armed = client.post("/admin/profile/next", json={"route": "/cloud/jobs/{job_id}/wait"})
+    assert armed.status_code == 200
+    response = client.get(f"/cloud/jobs/{job.id}/wait", params={"status": "queued", "timeout": 1})
+    assert response.status_code == 200
+    assert main_module.request_profiler.armed is False
+    assert client.get("/admin/profile/last").json()["route"] == "/cloud/jobs/{job_id}/wait"
+
+
+def test_cloud_jobs_dedup_priority_and_wait(tmp_path: Path):
+    service = CloudJobService(SqliteRepository(str(tmp_path / "jobs.db")), poll_interval=0.05)
+    low, created = service.enqueue("viral-score", {"clip": "a", "n": 1})
+    assert created is True
+    again, created = service.enqueue("viral-score", {"n": 1, "clip": "a"})
+    assert created is False
+    assert again.id == low.id
+    high, _ = service.enqueue("transcribe", {"clip": "b"}, priority=5)
+
+    waited = service.wait(low.id, timeout=0.05)
+    assert waited.status == "queued"
+
+    claimed = service.process_next()
+    assert claimed is not None and claimed.id == high.id
+
+    worker = threading.Thread(target=lambda: (time.sleep(0.1), service.process_next()))
+    worker.start()
+    started = time.monotonic()
+    done = service.wait(low.id, status="queued", timeout=5)
+    worker.join()
+    assert done.status in {"processing", "done"}
+    assert time.monotonic() - started < 2
+
+    # The event-loop variant is woken by the same notifications, not by its (here slow) poll.
+    service.poll_interval = 30.0
+    other, _ = service.enqueue("transcribe", {"clip": "c"})
+    worker = threading.Thread(target=lambda: (time.sleep(0.1), service.process(other.id)))
+    worker.start()
+    started = time.monotonic()
+    done = asyncio.run(service.wait_async(other.id, timeout=5))
+    worker.join()
+    assert done.status in {"processing", "done"}
+    assert time.monotonic() - started < 2
+
+    cached, created = service.enqueue("viral-score", {"clip": "a", "n": 1})
+    assert created is False
+    assert service.get(cached.id).result["ok"] is True
+
+
+def test_cloud_jobs_listing_pages_and_expires(tmp_path: Path):
+    repo = SqliteRepository(str(tmp_path / "jobs.db"))
+    service = CloudJobService(repo)
+    ids = [service.enqueue("viral-score", {"n": n})[0].id for n in range(5)]
+    service.process(ids[0])
+
+    first = service.list(limit=2)
+    second = service.list(limit=2, cursor=first.next_cursor)
+    last = service.list(limit=2, cursor=second.next_cursor)
+    pages = [job.id for page in (first, second, last) for job in page.jobs]
+    assert sorted(pages) == sorted(ids)
+    assert last.next_cursor is None
+    assert [job.id for job in service.list(status="done").jobs] == [ids[0]]
+
+    maintenance = JobMaintenanceService(repo, retention_seconds=60, interval=0)
+    assert maintenance.run_once()["deleted"] == 0
+    assert repo.convert_to_incremental_vacuum() is False  # new files start in incremental mode
+    assert maintenance.run_once(now=time.time() + 120)["deleted"] == 1
+    with pytest.raises(KeyError):
+        repo.get_job(ids[0])
+    assert len(service.list(limit=10).jobs) == 4
+
+
+def test_maintenance_prunes_pipeline_artifacts_not_used_within_retention(tmp_path: Path):
+    repo = SqliteRepository(str(tmp_path / "jobs.db"))
+    repo.save_artifact("visual_motion:2:4x2:/old/clip.mp4:10:1", "visual_motion", [0.5])
+    repo.save_artifact("loudness:0.4:/new/clip.mp4:10:2", "loudness", {"integrated": -14.0})
+
+    maintenance = JobMaintenanceService(repo, artifact_retention_seconds=60, interval=0)
+    assert maintenance.run_once()["artifacts_deleted"] == 0
+    assert maintenance.run_once(now=time.time() + 120)["artifacts_deleted"] == 2
+    assert repo.get_artifact("loudness:0.4:/new/clip.mp4:10:2") is None
+
+
+def test_large_job_payloads_are_stored_out_of_line(tmp_path: Path):
+    repo = SqliteRepository(str(tmp_path / "jobs.db"), inline_limit=1024)
+    service = CloudJobService(repo)
+    segments = [{"start": n, "end": n + 1, "text": f"segment {n}"} for n in range(500)]
+    job, _ = service.enqueue("transcribe", {"segments": segments})
+    blobs = list((tmp_path / "blobs").rglob("*.z*"))
+    assert len(blobs) == 1
+    assert blobs[0].stat().st_size < len(json.dumps(segments)) / 3
+
+    service.process(job.id)
+    stored = repo.get_job(job.id)
+    assert stored.status == "done"
+    assert stored.payload["segments"] == segments
+
+    repo.blobs.grace = 0
+    assert repo.delete_expired_jobs(time.time() + 1) == 1
+    assert not list((tmp_path / "blobs").rglob("*.z*"))
+
+    # Re-storing content whose file vanished (concurrent discard) writes it again.
+    ref = repo.blobs.put(b"payload")
+    repo.blobs.discard(ref)
+    assert repo.blobs.put(b"payload") == ref and repo.blobs.get(ref) == b"payload"
+
+
+def test_platform_uploads_resume_after_connection_loss(tmp_path: Path):
+    stub = UploadStubServer().start()
+    service = PlatformExportService(
+        SqliteRepository(str(tmp_path / "monteur.db")),
+        {
+            "youtube": YouTubeUploadProtocol(stub.url, "stub-token"),
+            "tiktok": TikTokUploadProtocol(stub.url, "stub-token"),
+        },
+        chunk_size=256 * 1024,
+        streams=3,
+        retries=0,
+    )
+    video = tmp_path / "clip.mp4"
+    data = bytes(range(256)) * 5500  # 1.4 MB: 6 YouTube chunks, 5 TikTok chunks (remainder merged)
+    video.write_bytes(data)
+    try:
+        for platform, total_chunks in (("youtube", 6), ("tiktok", 5)):
+            stub.fail_after = stub.chunk_requests + 2
+            queued = service.export(platform, str(video), "Clip")
+            failed = service.wait(queued.upload_id, timeout=10)
+            assert failed.status == "failed"
+            assert failed.bytes_sent == 2 * 256 * 1024
+
+            stub.fail_after = None
+            sent_before = stub.chunk_requests
+            service.resume(queued.upload_id)
+            done = service.wait(queued.upload_id, timeout=10)
+            assert done.status == "done" and done.bytes_sent == len(data)
+            assert stub.chunk_requests - sent_before == total_chunks - 2  # acknowledged chunks are not resent
+            assert stub.completed[done.external_id] == data
+    finally:
+        service.shutdown()
+        stub.stop()
+
+
+def test_transcript_search_ranks_hits_and_reindexes_edits(tmp_path: Path):
+    search = TranscriptSearchService(SqliteRepository(str(tmp_path / "search.db")))
+    segments = [
+        TranscriptSegment(start=0.0, end=2.5, text="Bienvenue dans ce podcast", confidence=0.9),
+        TranscriptSegment(start=2.5, end=6.25, text="L'automatisation du montage, c'est le levier", confidence=0.9),
+        TranscriptSegment(start=6.25, end=9.0, text="On parle d'automatisation et encore d'automatisation", confidence=0.9),
+    ]
+    assert search.save("p1", segments) == 3
+    assert search.save("p2", segments[:1]) == 1
+    assert search.save("p1", segments) == 0
+
+    hits = search.search("automatisation")
+    assert [(hit.start_ms, hit.end_ms) for hit in hits] == [(6250, 9000), (2500, 6250)]
+    assert "[automatisation]" in hits[0].snippet.lower()
+    assert [hit.project_id for hit in search.search("bienvenu*", project_id="p2")] == ["p2"]
+    assert search.search('levier"(') and not search.search("   ")  # operators typed by the user are inert
+
+    edited = [segments[0], TranscriptSegment(start=2.5, end=6.25, text="Le montage vidéo", confidence=0.9)]
+    assert search.save("p1", edited) == 2  # one rewritten, one removed
+    assert search.search("automatisation") == []
+    assert search.search("video")[0].start_ms == 2500
+    assert [seg.text for seg in search.get("p1")] == ["Bienvenue dans ce podcast", "Le montage vidéo"]
+
+
+def test_backend_endpoint_prefers_unix_socket_and_falls_back_to_free_port(tmp_path: Path):
+    busy, taken = bind_endpoint("", "127.0.0.1", 0)
+    busy.listen()
+    sock, endpoint = bind_endpoint("", "127.0.0.1", taken.port)
+    sock.close()
+    busy.close()
+    assert endpoint.transport == "tcp" and endpoint.port not in {0, taken.port}
+
+    if unix_sockets_supported():
+        stale = tmp_path / "run" / "backend.sock"
+        for _ in range(2):  # second bind replaces the socket file left behind
+            sock, endpoint = bind_endpoint(str(stale))
+            sock.close()
+        assert endpoint.url == f"unix:{stale}"
+        write_endpoint_file(str(tmp_path / "endpoint.json"), endpoint)
+        assert json.loads((tmp_path / "endpoint.json").read_text())["path"] == str(stale)
+
+
+def test_scratch_space_evicts_least_recently_used_unpinned_entries(tmp_path: Path):
+    scratch = ScratchSpace(str(tmp_path / "scratch"), quota_bytes=250)
+    scratch.write_bytes("audio", "a", b"a" * 100, ".wav")
+    scratch.write_bytes("proxies", "b", b"b" * 100, ".mp4")
+    assert scratch.lookup("audio", "a", ".wav") is not None  # "b" is now the least recently used
+    with scratch.pin("proxies", "b", ".mp4"):
+        scratch.write_bytes("renders", "c", b"c" * 100, ".mp4")
+        # "b" is pinned, so the older-but-free "a" goes instead.
+        assert scratch.lookup("audio", "a", ".wav") is None
+        assert scratch.lookup("proxies", "b", ".mp4") is not None
+    scratch.write_bytes("renders", "d", b"d" * 100, ".mp4")  # unpinned again, but "c" is older now
+    usage = scratch.usage()
+    assert usage["used_bytes"] == 200 and usage["pinned"] == 0 and usage["evicted_bytes"] == 200
+    assert scratch.lookup("renders", "c", ".mp4") is None
+    assert usage["namespaces"]["proxies"] == usage["namespaces"]["renders"] == {"bytes": 100, "entries": 1}
+    assert not list((tmp_path / "scratch" / ".staging").iterdir())
+    # A fresh instance rebuilds the index, recency included, from disk.
+    assert ScratchSpace(str(tmp_path / "scratch"), quota_bytes=250).usage()["entries"] == 2
+
+    video = tmp_path / "media" / "talk.mp4"
+    video.parent.mkdir()
+    video.write_bytes(b"fake")
+    calls = tmp_path / "calls.txt"
+    fake_whisper = tmp_path / "whisper"
+    fake_whisper.write_text(
+        "#!/usr/bin/env python3\n"
+        "import json, pathlib, sys\n"
+        f"open({str(calls)!r}, 'a').write('run\\n')\n"
+        "args = sys.argv[1:]\n"
+        "out = pathlib.Path(args[args.index('--output_dir') + 1]) / (pathlib.Path(args[0]).stem + '.json')\n"
+        "out.write_text(json.dumps({'segments': [{'start': 0, 'end': 1.5, 'text': ' Bonjour '}]}))\n"
+    )
+    fake_whisper.chmod(0o755)
+    whisper = WhisperService(str(fake_whisper), "tiny", scratch=scratch)
+    segments = whisper.transcribe_local(str(video), "fr")
+    assert whisper.transcribe_local(str(video), "fr") == segments and segments[0].text == "Bonjour"
+    assert calls.read_text() == "run\n"
+    assert sorted(p.name for p in video.parent.iterdir()) == ["talk.mp4"]
+    assert scratch.usage()["namespaces"]["transcripts"]["entries"] == 1
+
+
 def test_validate_settings_forbid_stub_in_prod():
     with pytest.raises(RuntimeError):
         validate_settings(Settings(app_env="prod", transcribe_mode="stub", api_key="k"))
@@ -123,3 +743,32 @@ def test_transcription_stub_mode(monkeypatch):
     segs = service.transcribe("/tmp/does-not-matter.mp4", "fr")
     assert len(segs) == 3
     monkeypatch.delenv("MONTEUR_TRANSCRIBE_MODE", raising=False)
+
+
+def _fake_whisper_loader(model_name: str):
+    def transcribe(audio_path: str, language: str) -> dict:
+        return {"segments": [{"start": 0.0, "end": 1.5, "text": f" {model_name}:{language} "}]}
+
+    return transcribe
+
+
+def test_whisper_worker_restarts_after_crash_and_recycles():
+    worker = WhisperWorkerSupervisor(model_name="tiny", max_jobs=2, health_interval=0, loader=_fake_whisper_loader)
+    worker.start()
+    try:
+        segs = worker.transcribe("/tmp/a.wav", "fr")
+        assert segs[0].text == "tiny:fr"
+        assert worker.check_health() is True
+
+        first_pid = worker.status()["pid"]
+        worker._process.kill()
+        worker._process.join()
+        assert worker.transcribe("/tmp/a.wav", "en")[0].text == "tiny:en"
+        assert worker.restarts == 1
+        assert worker.status()["pid"] != first_pid
+
+        worker.transcribe("/tmp/a.wav", "en")
+        assert worker.restarts == 2  # recycled after max_jobs on the new process
+    finally:
+        worker.stop()
+    assert worker.is_alive() is False